@@ -1,6 +1,6 @@
 # FastAPI Server for Looklyy Trending Content
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from typing import List, Optional
@@ -28,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Logging setup
@@ -52,12 +53,27 @@ async def root():
         "timestamp": datetime.now().isoformat()
     }
 
+async def get_trends_page(filters: TrendingFilters, response: Response) -> List[TrendingLookResponse]:
+    """One keyset page of looks; the next page's cursor goes in the X-Next-Cursor header"""
+    try:
+        looks = await db_manager.get_trending_looks(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    next_cursor = db_manager.next_cursor(filters, looks)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [TrendingLookResponse.from_orm(look) for look in looks]
+
 @app.get("/trends/latest", response_model=List[TrendingLookResponse])
 async def get_latest_trends(
+    response: Response,
     limit: int = Query(50, ge=1, le=100),
     category: Optional[str] = Query(None),
     season: Optional[str] = Query(None),
-    min_score: Optional[float] = Query(0.0, ge=0.0, le=1.0)
+    min_score: Optional[float] = Query(0.0, ge=0.0, le=1.0),
+    sort_by: str = Query('trend_score', pattern='^(trend_score|crawled_at)$'),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
     """Get latest trending looks"""
     try:
@@ -66,13 +82,15 @@ async def get_latest_trends(
             season=season,
             min_trend_score=min_score,
             limit=limit,
-            sort_by='trend_score',
-            sort_order='desc'
+            sort_by=sort_by,
+            sort_order='desc',
+            cursor=cursor
         )
         
-        looks = await db_manager.get_trending_looks(filters)
-        return [TrendingLookResponse.from_orm(look) for look in looks]
+        return await get_trends_page(filters, response)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting latest trends: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch trending looks")
@@ -90,34 +108,34 @@ async def get_featured_looks(limit: int = Query(25, ge=1, le=50)):
 
 @app.get("/trends/search", response_model=List[TrendingLookResponse])
 async def search_trends(
+    response: Response,
     q: str = Query(..., min_length=2),
     category: Optional[str] = Query(None),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
     """Search trending looks by keyword"""
     try:
-        # This would implement full-text search in a real database
-        # For now, simple filtering
+        # Ranked full-text match on title, tags, summary and description
         filters = TrendingFilters(
             category=category,
             limit=limit,
-            sort_by='trend_score',
-            sort_order='desc'
+            sort_by='relevance',
+            cursor=cursor
         )
         
-        all_looks = await db_manager.get_trending_looks(filters)
-        
-        # Simple keyword filtering (would use proper search in production)
-        search_results = []
-        q_lower = q.lower()
-        for look in all_looks:
-            if (q_lower in look.title.lower() or 
-                q_lower in (look.description or '').lower() or
-                any(q_lower in tag for tag in look.tags)):
-                search_results.append(look)
+        try:
+            looks = await db_manager.search_trending_looks(q, filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        return [TrendingLookResponse.from_orm(look) for look in search_results]
+        next_cursor = db_manager.next_cursor(filters, looks)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return [TrendingLookResponse.from_orm(look) for look in looks]
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching trends: {e}")
         raise HTTPException(status_code=500, detail="Search failed")
@@ -162,34 +180,28 @@ async def trigger_crawl(
         logger.error(f"Error triggering crawl: {e}")
         raise HTTPException(status_code=500, detail="Failed to trigger crawl")
 
-@app.get("/trends/by-source/{source_site}")
+@app.get("/trends/by-source/{source_site}", response_model=List[TrendingLookResponse])
 async def get_trends_by_source(
     source_site: str,
-    limit: int = Query(20, ge=1, le=100)
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    sort_by: str = Query('trend_score', pattern='^(trend_score|crawled_at)$'),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
     """Get trends from specific source site"""
     try:
         filters = TrendingFilters(
+            source_site=source_site,
             limit=limit,
-            sort_by='trend_score',
-            sort_order='desc'
+            sort_by=sort_by,
+            sort_order='desc',
+            cursor=cursor
         )
         
-        # Filter by source site
-        async with db_manager.get_async_session() as session:
-            looks = await session.execute(
-                select(TrendingLook)
-                .where(and_(
-                    TrendingLook.source_site == source_site,
-                    TrendingLook.is_active == True
-                ))
-                .order_by(desc(TrendingLook.trend_score))
-                .limit(limit)
-            )
-            
-            results = looks.scalars().all()
-            return [TrendingLookResponse.from_orm(look) for look in results]
-            
+        return await get_trends_page(filters, response)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting trends by source: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch trends by source")
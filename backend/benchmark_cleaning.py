@@ -0,0 +1,116 @@
+# Text Cleaning Benchmark
+#
+# Times the boilerplate cleaner on real article bodies taken from a recorded
+# replay archive (python -m backend.benchmark_crawl --scratch-db <db> --record):
+# the original per-call re.sub loop, the precompiled clean_text, and batched
+# clean_many.
+# Every cleaned text is also compared with the original loop's output.
+#
+#   python -m backend.benchmark_cleaning
+#   python -m backend.benchmark_cleaning --archive cache/replay --batch 64
+
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+def reference_clean_text(text: str) -> str:
+    """FashionContentProcessor.clean_text before the patterns were precompiled"""
+    if not text:
+        return ""
+
+    patterns_to_remove = [
+        r'\bAdvertisement\b',
+        r'\bSponsor.*?\b',
+        r'\bRead More\b',
+        r'\bSubscribe\b',
+        r'\bSign Up\b',
+        r'Photo:.*?Getty Images',
+        r'Image:.*?Courtesy',
+    ]
+
+    cleaned = text
+    for pattern in patterns_to_remove:
+        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+
+    return re.sub(r'\s+', ' ', cleaned).strip()
+
+def article_texts(archive_dir: str) -> List[str]:
+    """Title, description and body text of every archived HTML page"""
+    from bs4 import BeautifulSoup
+
+    texts = []
+    for path in sorted(glob.glob(os.path.join(archive_dir, 'http', '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            page = json.load(f)
+        body = page.get('body') or ''
+        if '<html' not in body[:2000].lower():
+            continue
+        soup = BeautifulSoup(body, 'lxml')
+        title = soup.select_one('h1') or soup.select_one('title')
+        description = soup.select_one('meta[name="description"]')
+        texts.append(title.get_text() if title else '')
+        texts.append(description.get('content', '') if description else '')
+        texts.append('\n'.join(p.get_text() for p in soup.select('p')))
+    return texts
+
+def time_runs(run: Callable[[], List[str]], repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - started)
+    return {'median_ms': round(statistics.median(samples) * 1000, 2), 'min_ms': round(min(samples) * 1000, 2)}
+
+def batched_clean(texts: List[str], batch: int) -> List[str]:
+    from .processors.text_cleaner import clean_many
+
+    cleaned = []
+    for start in range(0, len(texts), batch):
+        cleaned.extend(clean_many(texts[start:start + batch]))
+    return cleaned
+
+def run_benchmark(texts: List[str], batch: int, repeats: int) -> Dict[str, Any]:
+    """Time the three cleaners and count texts that differ from the original output"""
+    from .processors.text_cleaner import clean_text
+
+    expected = [reference_clean_text(text) for text in texts]
+    mismatches = {
+        'clean_text': sum(clean_text(text) != want for text, want in zip(texts, expected)),
+        'clean_many': sum(got != want for got, want in zip(batched_clean(texts, batch), expected))
+    }
+    return {
+        'texts': len(texts),
+        'characters': sum(len(text) for text in texts),
+        'mismatches': mismatches,
+        'reference_loop': time_runs(lambda: [reference_clean_text(text) for text in texts], repeats),
+        'clean_text': time_runs(lambda: [clean_text(text) for text in texts], repeats),
+        f'clean_many_batch_{batch}': time_runs(lambda: batched_clean(texts, batch), repeats)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark boilerplate cleaning on recorded article bodies")
+    parser.add_argument('--archive', default=os.getenv('CRAWLER_REPLAY_DIR', 'cache/replay'))
+    parser.add_argument('--batch', type=int, default=64, help="texts per clean_many call")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    texts = article_texts(args.archive)
+    if not texts:
+        sys.exit(f"No recorded pages under {args.archive}; record one with python -m backend.benchmark_crawl --scratch-db <db> --record")
+
+    report = run_benchmark(texts, args.batch, args.repeats)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if any(report['mismatches'].values()) else 0)
+
+if __name__ == "__main__":
+    main()
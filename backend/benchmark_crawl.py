@@ -0,0 +1,116 @@
+# Offline Crawl Benchmark
+#
+# Records the live magazines once, then replays the archive through the full
+# crawl (crawl_all_sites: fetch, parse, dedup, LLM stage, database) with the
+# local LLM stand-in, reporting throughput, parse cost and peak memory.
+#
+#   python -m backend.benchmark_crawl --scratch-db looklyy_bench --record   # capture an archive from the live sites
+#   python -m backend.benchmark_crawl --scratch-db looklyy_bench            # replay it offline and report
+#
+# The crawl saves looks, re-scores the table and stores the local model's
+# placeholder enhancements, so it only runs against an explicitly named
+# scratch database (on the DB_* server), never the one DB_NAME points at.
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+def configure_environment(mode: str, archive_dir: str, scratch_dir: str, scratch_db: str):
+    """Set the env-driven config before the crawler modules read it"""
+    os.environ['CRAWLER_REPLAY_MODE'] = mode
+    os.environ['CRAWLER_REPLAY_DIR'] = archive_dir
+    os.environ['DB_NAME'] = scratch_db
+    os.environ.setdefault('CRAWL_MODE', 'all')  # crawl every archived article, not just new ones
+    os.environ['LLM_CLIENT'] = 'local'  # offline and deterministic, even with an API key set
+    # Cold caches so every run does the same work
+    os.environ['CRAWLER_HTTP_CACHE_DIR'] = os.path.join(scratch_dir, 'http')
+    os.environ['CRAWLER_FRONTIER_DIR'] = os.path.join(scratch_dir, 'frontier')
+    os.environ['CRAWLER_RENDER_STRATEGY_DIR'] = os.path.join(scratch_dir, 'render_strategy')
+    os.environ['LLM_CACHE_PATH'] = os.path.join(scratch_dir, 'llm_results.json')
+
+def peak_rss_mb() -> Dict[str, float]:
+    """Peak resident set size of this process and of finished parse workers"""
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KiB on Linux
+    return {
+        'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)
+    }
+
+async def run_benchmark(record: bool) -> Dict[str, Any]:
+    """Run one crawl and collect its performance figures"""
+    from .config import get_config
+    from .crawlers.crawler_manager import FashionCrawlerManager
+    from .crawlers.replay import ArchiveServer, ResponseArchive
+    from .database.db_manager import db_manager
+
+    config = get_config()
+    db_manager.create_tables()
+    replay_config = config.REPLAY_CONFIG
+    server = None
+    if not record:
+        server = ArchiveServer(
+            ResponseArchive(replay_config['archive_dir']),
+            replay_config['server_host'],
+            replay_config['server_port']
+        )
+        await server.start()
+
+    manager = FashionCrawlerManager()
+    try:
+        started = time.perf_counter()
+        crawl_results = await manager.crawl_all_sites()
+        duration = time.perf_counter() - started
+    finally:
+        if server:
+            await server.stop()
+
+    parsed_pages = sum(crawler.parse_stats['pages'] for crawler in manager.crawlers.values())
+    parse_seconds = sum(crawler.parse_stats['seconds'] for crawler in manager.crawlers.values())
+    fetched_pages = server.stats['http'] + server.stats['js'] if server else parsed_pages
+
+    return {
+        'mode': 'record' if record else 'replay',
+        'duration_s': round(duration, 3),
+        'pages_fetched': fetched_pages,
+        'pages_per_sec': round(fetched_pages / duration, 2) if duration else 0.0,
+        'pages_parsed': parsed_pages,
+        'parse_ms_per_page': round(parse_seconds / parsed_pages * 1000, 2) if parsed_pages else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        'archive_server': server.stats if server else None,
+        'looks_found': crawl_results['total_looks_crawled'],
+        'near_duplicates': crawl_results['near_duplicates'],
+        'duplicate_images': crawl_results['duplicate_images'],
+        'errors': crawl_results['errors']
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crawl pipeline against a recorded archive")
+    parser.add_argument('--record', action='store_true', help="crawl the live sites and record an archive")
+    parser.add_argument('--scratch-db', default=os.getenv('BENCHMARK_DB_NAME'),
+                        help="database the crawl writes to (on the DB_* server); required")
+    parser.add_argument('--archive-dir', default=os.getenv('CRAWLER_REPLAY_DIR', 'cache/replay'))
+    parser.add_argument('--output', help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    if not args.scratch_db:
+        parser.error("name a scratch database with --scratch-db (or BENCHMARK_DB_NAME)")
+    if args.scratch_db == os.getenv('DB_NAME', 'looklyy_trends'):
+        parser.error(f"{args.scratch_db} is the application database (DB_NAME); use a scratch one")
+
+    with tempfile.TemporaryDirectory(prefix='looklyy-bench-') as scratch_dir:
+        configure_environment('record' if args.record else 'replay', args.archive_dir, scratch_dir, args.scratch_db)
+        report = asyncio.run(run_benchmark(args.record))
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# Link and Image Extraction Benchmark
+#
+# Times the single-pass SelectorEngine against the per-selector soup.select
+# loops it replaced, on the saved listing and article pages of each site in
+# backend/tests/fixtures/<site>/. Every page's URLs are also compared with the
+# old loops' output; as sets, since the old loops deduplicated with set().
+#
+#   python -m backend.benchmark_extraction
+#   python -m backend.benchmark_extraction --fixtures backend/tests/fixtures --repeats 200
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+from urllib.parse import urljoin
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'tests', 'fixtures')
+SITE_CRAWLERS = {
+    'harpers_bazaar': ('.crawlers.harpers_bazaar_crawler', 'HarpersBazaarCrawler'),
+    'elle': ('.crawlers.elle_crawler', 'ElleCrawler'),
+    'vogue': ('.crawlers.vogue_crawler', 'VogueCrawler'),
+}
+
+def reference_article_links(crawler, soup, base_url: str) -> List[str]:
+    """extract_article_links before SelectorEngine: one soup.select per selector, then set()"""
+    links = []
+    for selector in crawler.ARTICLE_LINK_SELECTORS:
+        for link_elem in soup.select(selector):
+            href = link_elem.get('href')
+            if not href:
+                continue
+            if crawler.site_name == 'harpers_bazaar':
+                # Harper's Bazaar resolved the URL first and skipped non-HTTP links
+                if href.startswith('/'):
+                    full_url = base_url + href
+                elif href.startswith('http'):
+                    full_url = href
+                else:
+                    continue
+                if crawler.is_fashion_content(full_url):
+                    links.append(full_url)
+            elif crawler.is_fashion_content(href):
+                links.append(base_url + href if href.startswith('/') else href)
+    return list(set(links))
+
+def reference_images(crawler, soup, base_url: str) -> List[str]:
+    """extract_high_quality_images before SelectorEngine: one soup.select per selector, then set()"""
+    images = []
+    for selector in crawler.IMAGE_SELECTORS:
+        for img in soup.select(selector):
+            img_url = img.get('src') or img.get('data-src')
+            if img_url:
+                if img_url.startswith('//'):
+                    img_url = 'https:' + img_url
+                elif img_url.startswith('/'):
+                    img_url = urljoin(base_url, img_url)
+                if crawler.is_magazine_quality_image(img_url, img):
+                    images.append(img_url)
+    return list(set(images))
+
+def site_crawler(site: str):
+    """The site's crawler, or None when its dependencies aren't installed"""
+    from .config import get_config
+
+    module, name = SITE_CRAWLERS[site]
+    try:
+        crawler_class = getattr(importlib.import_module(module, __package__), name)
+    except ImportError:
+        return None
+    return crawler_class(get_config().FASHION_SITES[site])
+
+def fixture_page(fixtures_dir: str, site: str, page: str) -> str:
+    with open(os.path.join(fixtures_dir, site, f'{page}.html'), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def extraction_paths(crawler, fixtures_dir: str) -> Dict[str, Dict[str, Callable[[], List[str]]]]:
+    """{'links'/'images': {'reference'/'engine': run}} over the site's parsed listing and article pages"""
+    listing = crawler.parse_html(fixture_page(fixtures_dir, crawler.site_name, 'listing'), crawler.base_url)
+    article = crawler.parse_html(fixture_page(fixtures_dir, crawler.site_name, 'article'), crawler.base_url)
+    return {
+        'links': {
+            'reference': lambda: reference_article_links(crawler, listing, crawler.base_url),
+            'engine': lambda: crawler.link_engine.extract_urls(
+                listing, crawler.base_url, accept=lambda url, _: crawler.is_fashion_content(url)
+            )
+        },
+        'images': {
+            'reference': lambda: reference_images(crawler, article, crawler.base_url),
+            'engine': lambda: crawler.extract_high_quality_images(article, crawler.base_url)
+        }
+    }
+
+def time_runs(run: Callable[[], List[str]], repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - started)
+    return {'median_ms': round(statistics.median(samples) * 1000, 3), 'min_ms': round(min(samples) * 1000, 3)}
+
+def run_benchmark(fixtures_dir: str, repeats: int) -> Dict[str, Any]:
+    """Time both extraction paths per site and flag pages where their URLs differ"""
+    report = {}
+    for site in SITE_CRAWLERS:
+        crawler = site_crawler(site)
+        if crawler is None:
+            report[site] = {'skipped': "crawler dependencies not installed"}
+            continue
+        report[site] = {}
+        for kind, paths in extraction_paths(crawler, fixtures_dir).items():
+            reference, engine = paths['reference'](), paths['engine']()
+            report[site][kind] = {
+                'urls': len(engine),
+                'mismatch': sorted(reference) != sorted(engine),
+                'reference_loop': time_runs(paths['reference'], repeats),
+                'selector_engine': time_runs(paths['engine'], repeats)
+            }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark link and image extraction on saved site pages")
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--output', help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.fixtures, args.repeats)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    mismatched = any(result.get('mismatch') for site in report.values() for result in site.values()
+                     if isinstance(result, dict))
+    sys.exit(1 if mismatched else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# Full-Text Search Benchmark
+#
+# Fills trending_looks with synthetic looks (1M by default), then times
+# /trends/search's query path: the first page and a deep page reached by
+# following cursors, against the pre-index approach of a substring scan.
+#
+#   python -m backend.benchmark_search                 # 1M rows, removed afterwards
+#   python -m backend.benchmark_search --rows 200000 --keep
+#
+# Rows are inserted into the database from DB_* settings with
+# source_site='benchmark'; point it at a scratch database.
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+
+BENCHMARK_SITE = 'benchmark'
+WORDS = [
+    'minimalist', 'oversized', 'blazer', 'denim', 'leather', 'trench', 'knit', 'silk', 'satin', 'tailored',
+    'bohemian', 'vintage', 'streetwear', 'sneakers', 'loafers', 'boots', 'midi', 'maxi', 'pleated', 'cropped',
+    'burgundy', 'camel', 'olive', 'ivory', 'cobalt', 'blush', 'charcoal', 'emerald', 'runway', 'couture',
+    'sustainable', 'layering', 'monochrome', 'tweed', 'cashmere', 'linen', 'sequin', 'velvet', 'utility', 'cargo'
+]
+QUERIES = ['leather dress', 'oversized blazer', 'sustainable linen', '"velvet midi"', 'cobalt']
+
+# One SQL statement generating `rows` looks with pseudo-random word mixes
+FILL_SQL = """
+INSERT INTO trending_looks (
+    source_site, source_url, title, description, summary, primary_image_url,
+    category, tags, trend_score, engagement_score, crawled_at, is_active, is_featured
+)
+SELECT
+    :site,
+    'https://benchmark.local/look/' || g,
+    initcap(w[1 + g % 40] || ' ' || w[1 + (g / 40) % 40] || ' ' || w[1 + (g * 7) % 40]),
+    w[1 + (g * 3) % 40] || ' ' || w[1 + (g * 11) % 40] || ' looks from ' || w[1 + (g * 13) % 40] || ' collections, '
+        || w[1 + (g * 17) % 40] || ' ' || w[1 + (g * 19) % 40] || ' and ' || w[1 + (g * 23) % 40] || ' dress details',
+    'A ' || w[1 + (g * 29) % 40] || ' take on ' || w[1 + (g * 31) % 40] || ' ' || w[1 + (g * 37) % 40] || ' style',
+    'https://benchmark.local/img/' || g || '.jpg',
+    (ARRAY['runway_fashion', 'street_style', 'celebrity_style', 'trend_reports'])[1 + g % 4],
+    jsonb_build_array(w[1 + (g * 41) % 40], w[1 + (g * 43) % 40]),
+    random(), random(), now() - (g % 90) * interval '1 day', true, false
+FROM generate_series(1, :rows) AS g, (SELECT CAST(:words AS text[]) AS w) AS vocabulary
+ON CONFLICT (source_url) DO NOTHING
+"""
+
+def time_ms(samples: List[float]) -> Dict[str, float]:
+    return {
+        'median_ms': round(statistics.median(samples) * 1000, 2),
+        'max_ms': round(max(samples) * 1000, 2)
+    }
+
+def fill_table(db, rows: int):
+    """Insert the synthetic looks (the search trigger builds their vectors)"""
+    with db.engine.begin() as connection:
+        connection.execute(text(FILL_SQL), {'site': BENCHMARK_SITE, 'rows': rows, 'words': WORDS})
+        connection.execute(text("ANALYZE trending_looks"))
+
+def remove_rows(db):
+    with db.engine.begin() as connection:
+        connection.execute(text("DELETE FROM trending_looks WHERE source_site = :site"), {'site': BENCHMARK_SITE})
+
+async def substring_scan(db, q: str, limit: int) -> int:
+    """The previous approach done right: scan every active row for the substring"""
+    pattern = f"%{q}%"
+    async with db.get_async_session() as session:
+        result = await session.execute(text(
+            "SELECT id FROM trending_looks WHERE is_active "
+            "AND (title ILIKE :p OR description ILIKE :p OR tags::text ILIKE :p) "
+            "ORDER BY trend_score DESC LIMIT :limit"
+        ), {'p': pattern, 'limit': limit})
+        return len(result.all())
+
+async def run_benchmark(limit: int, depth: int, repeats: int) -> Dict[str, Any]:
+    """Time each query's first page, page `depth` via cursors, and the substring scan"""
+    from .database.db_manager import db_manager
+    from .models.trend_model import TrendingFilters
+
+    report = {}
+    for q in QUERIES:
+        first, deep, scan = [], [], []
+        for _ in range(repeats):
+            filters = TrendingFilters(limit=limit, sort_by='relevance')
+            started = time.perf_counter()
+            looks = await db_manager.search_trending_looks(q, filters)
+            first.append(time.perf_counter() - started)
+
+            for _ in range(depth - 1):
+                filters.cursor = db_manager.next_cursor(filters, looks)
+                if not filters.cursor:
+                    break  # fewer matches than `depth` pages
+                started = time.perf_counter()
+                looks = await db_manager.search_trending_looks(q, filters)
+                elapsed = time.perf_counter() - started
+            else:
+                deep.append(elapsed if depth > 1 else first[-1])
+
+            started = time.perf_counter()
+            await substring_scan(db_manager, q.strip('"'), limit)
+            scan.append(time.perf_counter() - started)
+
+        report[q] = {
+            'first_page': time_ms(first),
+            f'page_{depth}': time_ms(deep) if deep else None,
+            'substring_scan': time_ms(scan)
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /trends/search on a synthetic table")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=20, help="page size")
+    parser.add_argument('--depth', type=int, default=10, help="page reached by following cursors")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--keep', action='store_true', help="leave the synthetic rows in place")
+    parser.add_argument('--output', help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    from .database.db_manager import db_manager
+
+    db_manager.create_tables()  # applies the search migration
+    started = time.perf_counter()
+    fill_table(db_manager, args.rows)
+    fill_seconds = time.perf_counter() - started
+
+    try:
+        report = {
+            'rows': args.rows,
+            'fill_s': round(fill_seconds, 1),
+            'queries': asyncio.run(run_benchmark(args.limit, args.depth, args.repeats))
+        }
+    finally:
+        if not args.keep:
+            remove_rows(db_manager)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# Feed Query Plan Check
+#
+# EXPLAINs the query shapes the trending API sends (built by the same
+# db_manager methods the endpoints call) and fails if any of them reads
+# trending_looks with a sequential scan or doesn't use the index from
+# database/migrations built for it, i.e. if an index stops matching its query.
+#
+#   python -m backend.check_query_plans
+#   TREND_DECAY_MODE=lazy python -m backend.check_query_plans
+#
+# Sequential scans are disabled for the session so the result doesn't depend
+# on table size: on a small table the planner would rightly prefer them. That
+# alone would let any index pass, hence the expected index per shape, and the
+# shapes that must read rows in index order (no Sort node, so a keyset page
+# is one range scan). Expectations depend on TREND_DECAY_CONFIG mode: in
+# 'lazy' mode the decayed score depends on the current time, so no index can
+# hold its order; feeds sorted by it read every active row matching their
+# filters and sort them, and only the crawled_at / engagement feeds keep
+# index order. backend/tests/test_query_plans.py runs this check in both modes.
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) around a SELECT, keeping its typed bind parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(Explain)
+def compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+# Btree indexes partial on is_active: any of them finds every active row
+ACTIVE_INDEXES = (
+    'ix_trending_looks_active_trend_score',
+    'ix_trending_looks_active_crawled_at',
+    'ix_trending_looks_active_engagement_score',
+)
+
+# Index each query shape must use (database/migrations) per TREND_DECAY_CONFIG
+# mode; a tuple accepts any of its indexes
+EXPECTED_INDEXES = {
+    'stored': {
+        'latest': 'ix_trending_looks_active_trend_score',
+        'by_category': 'ix_trending_looks_category_trend_score',
+        'by_season': 'ix_trending_looks_season_trend_score',
+        'by_tags': 'ix_trending_looks_tags',
+        'min_score': 'ix_trending_looks_active_trend_score',
+        'newest': 'ix_trending_looks_active_crawled_at',
+        'most_engaged': 'ix_trending_looks_active_engagement_score',
+        'latest_page_n': 'ix_trending_looks_active_trend_score',
+        'newest_page_n': 'ix_trending_looks_active_crawled_at',
+        'by_source': 'ix_trending_looks_source_trend_score',
+        'by_source_page_n': 'ix_trending_looks_source_crawled_at',
+        'featured': 'ix_trending_looks_featured_trend_score',
+        'search': 'ix_trending_looks_search_vector'
+    }
+}
+EXPECTED_INDEXES['lazy'] = {
+    **EXPECTED_INDEXES['stored'],
+    # Ordered by the decayed score: every active row is read, then sorted
+    'latest': ACTIVE_INDEXES,
+    'latest_page_n': ACTIVE_INDEXES,
+    # min_score and featured also bound the stored score, which decay never raises
+}
+
+# Shapes whose rows must come out of the index already in feed order
+INDEX_ORDERED = {
+    'stored': {
+        'latest', 'by_category', 'by_season', 'min_score', 'newest', 'most_engaged', 'latest_page_n',
+        'newest_page_n', 'by_source', 'by_source_page_n', 'featured'
+    },
+    'lazy': {'newest', 'most_engaged', 'newest_page_n', 'by_source_page_n'}
+}
+
+def feed_query_shapes(db) -> Dict[str, Any]:
+    """Named SELECTs matching the API endpoints"""
+    from .database.db_manager import encode_cursor
+    from .models.trend_model import TrendingFilters
+
+    score_cursor = encode_cursor('trend_score', 0.5, 1000)
+    date_cursor = encode_cursor('crawled_at', datetime(2025, 1, 1), 1000)
+    return {
+        'latest': db.trending_looks_query(TrendingFilters(sort_by='trend_score', sort_order='desc')),
+        'by_category': db.trending_looks_query(TrendingFilters(category='street_style')),
+        'by_season': db.trending_looks_query(TrendingFilters(season='fall2025')),
+        'by_tags': db.trending_looks_query(TrendingFilters(tags=['minimalist', 'sustainable'])),
+        'min_score': db.trending_looks_query(TrendingFilters(min_trend_score=0.8)),
+        'newest': db.trending_looks_query(TrendingFilters(sort_by='crawled_at')),
+        'most_engaged': db.trending_looks_query(TrendingFilters(sort_by='engagement_score')),
+        'latest_page_n': db.trending_looks_query(TrendingFilters(cursor=score_cursor)),
+        'newest_page_n': db.trending_looks_query(TrendingFilters(sort_by='crawled_at', cursor=date_cursor)),
+        'by_source': db.trending_looks_query(TrendingFilters(source_site='vogue', limit=20)),
+        'by_source_page_n': db.trending_looks_query(
+            TrendingFilters(source_site='vogue', limit=20, sort_by='crawled_at', cursor=date_cursor)
+        ),
+        'featured': db.featured_looks_query(25),
+        'search': db.search_looks_query('oversized blazer', TrendingFilters(limit=20, sort_by='relevance'))
+    }
+
+def scanned_tables(plan: Dict[str, Any]) -> List[str]:
+    """'Node Type relation using index' for every scan in an EXPLAIN (FORMAT JSON) plan tree"""
+    scans = []
+    if 'Relation Name' in plan or 'Index Name' in plan:
+        scan = ' '.join(filter(None, [plan['Node Type'], plan.get('Relation Name')]))
+        if 'Index Name' in plan:
+            scan += f" using {plan['Index Name']}"
+        scans.append(scan)
+    for child in plan.get('Plans', []):
+        scans.extend(scanned_tables(child))
+    return scans
+
+def sorts_rows(plan: Dict[str, Any]) -> bool:
+    """Whether an EXPLAIN (FORMAT JSON) plan tree sorts rows itself instead of reading them in index order"""
+    if plan['Node Type'] in ('Sort', 'Incremental Sort'):
+        return True
+    return any(sorts_rows(child) for child in plan.get('Plans', []))
+
+def plan_problems(name: str, scans: List[str], sorted_rows: bool, mode: str = 'stored') -> List[str]:
+    """Why a shape's plan fails the check in a decay mode (empty if it passes)"""
+    problems = [scan for scan in scans if scan.startswith('Seq Scan')]
+    expected = EXPECTED_INDEXES[mode].get(name)
+    if isinstance(expected, str):
+        expected = (expected,)
+    if expected and not any(scan.endswith(f" using {index}") for scan in scans for index in expected):
+        problems.append(f"{' or '.join(expected)} not used")
+    if sorted_rows and name in INDEX_ORDERED[mode]:
+        problems.append("rows sorted instead of read in index order")
+    return problems
+
+async def check_plans() -> Dict[str, Dict[str, Any]]:
+    """Scans used by each query shape, and whether it sorts its rows"""
+    from .database.db_manager import db_manager
+
+    plans = {}
+    async with db_manager.get_async_session() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, query in feed_query_shapes(db_manager).items():
+            result = await session.execute(Explain(query))
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            plans[name] = {'scans': scanned_tables(plan[0]['Plan']), 'sorted': sorts_rows(plan[0]['Plan'])}
+    return plans
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the feed queries' plans use their indexes")
+    parser.add_argument('--migrate', action='store_true',
+                        help="create the tables and apply migrations first (for a scratch database)")
+    parser.add_argument('--json', action='store_true', help="print the plans as JSON instead of checking them")
+    args = parser.parse_args()
+
+    from .config import get_config
+    from .database.db_manager import db_manager
+
+    if args.migrate:
+        db_manager.create_tables()
+    plans = asyncio.run(check_plans())
+    if args.json:
+        print(json.dumps(plans))
+        return
+
+    mode = get_config().TREND_DECAY_CONFIG['mode']
+    failures = 0
+    for name, plan in plans.items():
+        problems = plan_problems(name, plan['scans'], plan['sorted'], mode)
+        failures += bool(problems)
+        line = f"{'FAIL' if problems else 'ok  '} {name}: {', '.join(plan['scans'])}{' + Sort' if plan['sorted'] else ''}"
+        print(f"{line} ({'; '.join(problems)})" if problems else line)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
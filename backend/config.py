@@ -17,6 +17,7 @@ class CrawlerConfig:
             'celebrity_path': '/celebrity/style/',
             'crawl_depth': 3,
             'delay': 2.0,  # seconds between requests
+            'parser': 'beautifulsoup',  # 'beautifulsoup', 'lxml' or 'selectolax'
         },
         'elle': {
             'base_url': 'https://www.elle.com',
@@ -25,6 +26,7 @@ class CrawlerConfig:
             'celebrity_path': '/fashion/celebrity-style/',
             'crawl_depth': 3,
             'delay': 2.5,
+            'parser': 'beautifulsoup',
         },
         'vogue': {
             'base_url': 'https://www.vogue.com',
@@ -33,6 +35,7 @@ class CrawlerConfig:
             'celebrity_path': '/fashion/celebrity-style/',
             'crawl_depth': 2,
             'delay': 3.0,  # Vogue might be more strict
+            'parser': 'beautifulsoup',
         }
     }
     
@@ -65,7 +68,8 @@ class CrawlerConfig:
             'database': os.getenv('DB_NAME', 'looklyy_trends'),
             'user': os.getenv('DB_USER', 'looklyy'),
             'password': os.getenv('DB_PASSWORD', '')
-        }
+        },
+        'bulk_copy_threshold': 5000  # looks per bulk save before switching to COPY
     }
     
     # API Configuration
@@ -81,7 +85,24 @@ class CrawlerConfig:
         'openai_api_key': os.getenv('OPENAI_API_KEY'),
         'model': 'gpt-4',
         'max_tokens': 500,
-        'temperature': 0.3
+        'temperature': 0.3,
+        'batch_size': 5,  # articles per chat completion; 1 disables batching
+        'max_in_flight': 4,  # concurrent LLM requests
+        'requests_per_minute': 60,
+        'tokens_per_minute': 40000,
+        'cache_path': os.getenv('LLM_CACHE_PATH', 'cache/llm_results.json'),
+        'cache_max_entries': 5000,
+        'cache_ttl': 7 * 24 * 3600,  # re-ask the LLM about unchanged articles weekly
+        'client': os.getenv('LLM_CLIENT', 'openai')  # 'local' answers from the local classifier offline
+    }
+    
+    # Local Pre-Screen Classifier (runs before the LLM)
+    LOCAL_MODEL_CONFIG = {
+        'enabled': os.getenv('LOCAL_MODEL_ENABLED', 'true').lower() == 'true',
+        'training_rows': 5000,  # most recent labelled looks used for training
+        'min_training_rows': 50,
+        'min_confidence': 0.6,  # below this the LLM is asked instead
+        'duplicate_similarity': 0.95
     }
     
     # Ethical Crawling Rules
@@ -93,6 +114,117 @@ class CrawlerConfig:
         'retry_attempts': 3,
         'backoff_factor': 2.0
     }
+    
+    # Crawler Cache Storage
+    CACHE_CONFIG = {
+        'http_cache_dir': os.getenv('CRAWLER_HTTP_CACHE_DIR', 'cache/http'),
+        'frontier_dir': os.getenv('CRAWLER_FRONTIER_DIR', 'cache/frontier'),
+        'render_strategy_dir': os.getenv('CRAWLER_RENDER_STRATEGY_DIR', 'cache/render_strategy'),
+        'http_cache_max_age_days': 30  # cached pages untouched this long are deleted
+    }
+    
+    # HTML Parsing
+    PARSE_CONFIG = {
+        'use_process_pool': os.getenv('CRAWLER_PARSE_IN_PROCESSES', 'false').lower() == 'true',
+        'max_workers': None  # defaults to the number of CPU cores
+    }
+    
+    # Incremental Crawling
+    FRONTIER_CONFIG = {
+        'mode': os.getenv('CRAWL_MODE', 'new_only'),  # 'new_only', 'refresh_stale', 'all'
+        'refresh_after_hours': 24,  # used by 'refresh_stale'
+        'max_listing_pages': 3,  # page deeper into listings until known articles appear
+        'retention_days': 180  # forget URLs not crawled for this long (stored looks are re-seeded from the DB)
+    }
+    
+    # Trend Score Decay
+    TREND_DECAY_CONFIG = {
+        'mode': os.getenv('TREND_DECAY_MODE', 'stored'),  # 'stored': hourly UPDATE; 'lazy': applied when reading
+        'daily_rate': 0.02,  # 2% decay per day
+        'min_factor': 0.1,
+        'featured_min_score': 0.3,  # looks below this stop being featured
+        'batch_size': None  # rows per UPDATE batch on huge tables; None updates in one statement
+    }
+    
+    # Streaming Crawl Pipeline (fetch -> parse -> clean -> enhance -> save)
+    PIPELINE_CONFIG = {
+        'queue_size': 10,  # finished items buffered between stages before upstream pauses
+        'save_batch_size': 25,  # looks per bulk upsert
+        'save_concurrency': 4  # concurrent bulk upserts
+    }
+    
+    # Record / Replay of Crawled Responses
+    REPLAY_CONFIG = {
+        'mode': os.getenv('CRAWLER_REPLAY_MODE', 'off'),  # 'off', 'record' or 'replay'
+        'archive_dir': os.getenv('CRAWLER_REPLAY_DIR', 'cache/replay'),
+        'server_host': '127.0.0.1',  # local archive server used in replay mode
+        'server_port': int(os.getenv('CRAWLER_REPLAY_PORT', 8765))
+    }
+    
+    # Near-Duplicate Detection (syndicated / re-headlined articles)
+    DEDUP_CONFIG = {
+        'enabled': True,
+        'threshold': 0.6,  # estimated Jaccard similarity of word shingles
+        'shingle_size': 2,  # words per shingle
+        'num_perm': 64,  # MinHash signature length
+        'bands': 16,  # LSH bands; more bands catch lower similarities with more candidates
+        'action': 'skip'  # 'skip' drops the copy, 'merge' folds its tags and images into the stored look
+    }
+    
+    # Perceptual Image Dedup (same photo under different CDN URLs and sizes)
+    IMAGE_DEDUP_CONFIG = {
+        'enabled': True,
+        'hash_size': 8,  # dHash grid; 8 gives 64-bit hashes, the most the image_phash column holds
+        'max_distance': 4,  # differing bits still counted as the same photo
+        'action': 'skip'  # 'skip' or 'merge', as in DEDUP_CONFIG
+    }
+    
+    # Keyword Vocabulary (matched in one pass; ordered groups are checked first to last)
+    KEYWORD_CONFIG = {
+        'vocabulary_path': os.getenv('KEYWORD_VOCABULARY_PATH'),  # optional JSON overriding groups below
+        'colors': [
+            'black', 'white', 'red', 'blue', 'green', 'yellow', 'purple', 'pink',
+            'orange', 'brown', 'gray', 'grey', 'navy', 'burgundy', 'emerald',
+            'coral', 'mint', 'lavender', 'gold', 'silver', 'rose', 'cream',
+            'beige', 'tan', 'olive', 'maroon', 'teal', 'turquoise'
+        ],
+        'price': {
+            'luxury': ['designer', 'couture', 'luxury', 'high-end', 'premium'],
+            'budget': ['affordable', 'budget', 'under', 'cheap', 'sale']
+        },
+        'complexity': {
+            'complex': ['layering', 'statement', 'bold', 'dramatic', 'avant-garde'],
+            'simple': ['minimal', 'clean', 'simple', 'basic', 'effortless']
+        },
+        'versatility': {
+            'versatile': ['versatile', 'day-to-night', 'office', 'casual', 'dress-up', 'mix-match'],
+            'specific': ['formal', 'evening', 'gala', 'red-carpet', 'wedding']
+        },
+        'seasons': {
+            'fall': ['fall', 'autumn', 'september', 'october', 'november', 'cozy', 'layers'],
+            'winter': ['winter', 'december', 'january', 'february', 'coat', 'warm'],
+            'spring': ['spring', 'march', 'april', 'may', 'fresh', 'light'],
+            'summer': ['summer', 'june', 'july', 'august', 'beach', 'vacation']
+        },
+        'season_suffix': '2025',
+        'tags': [
+            'fall2025', 'spring2025', 'summer2025', 'winter2025',
+            'designer', 'luxury', 'affordable', 'trendy', 'classic',
+            'bohemian', 'gothic', 'preppy', 'casual', 'formal',
+            'blazer', 'dress', 'pants', 'skirt', 'jacket', 'shoes',
+            'accessories', 'jewelry', 'handbag', 'sunglasses'
+        ],
+        'categories': {
+            'runway_fashion': {'url': ['runway'], 'text': ['fashion-week']},
+            'celebrity_style': {'url': ['celebrity'], 'text': ['red-carpet']},
+            'street_style': {'url': ['street-style'], 'text': ['street style']},
+            'sustainable_fashion': {'text': ['sustainable', 'eco-fashion']},
+            'vintage_revival': {'text': ['vintage', 'retro']},
+            'minimalist_chic': {'text': ['minimalist', 'minimal']},
+            'power_dressing': {'text': ['business', 'work']}
+        },
+        'default_category': 'seasonal_trends'
+    }
 
 # Environment-specific configurations
 class DevelopmentConfig(CrawlerConfig):
@@ -2,16 +2,29 @@
 
 import asyncio
 import aiohttp
+import json
+import os
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
-from urllib.robotparser import RobotFileParser
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional, Any
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from datetime import datetime
 
+from .rate_limiter import HostRateLimiter
+from .robots_cache import RobotsTxtCache
+from .http_cache import HttpCache
+from .frontier import CrawlFrontier
+from .selector_engine import SelectorEngine
+from .parser_backends import get_parser_backend
+from .pipeline import stage
+from .replay import CrawlReplay
+from ..config import get_config
+from ..processors.keyword_engine import get_keyword_engine
+
 @dataclass
 class CrawledContent:
     """Standardized content structure from any fashion site"""
@@ -27,23 +40,87 @@ class CrawledContent:
     author: Optional[str] = None
     trend_score: float = 0.0
 
+@dataclass
+class ArticleMetadata:
+    """Article fields read from JSON-LD / OpenGraph in the page <head>"""
+    title: Optional[str] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    image_width: Optional[str] = None
+    image_height: Optional[str] = None
+    author: Optional[str] = None
+    published_date: Optional[datetime] = None
+    
+    def get(self, key: str, default=None):
+        """Tag-like access so hero dimensions work with is_magazine_quality_image"""
+        return {'width': self.image_width, 'height': self.image_height}.get(key) or default
+
+ARTICLE_LD_TYPES = {'Article', 'NewsArticle', 'BlogPosting', 'ReportageNewsArticle', 'WebPage'}
+
 class BaseFashionCrawler(ABC):
     """Abstract base class for all fashion website crawlers"""
     
+    # Look for common fashion image patterns
+    IMAGE_SELECTORS = [
+        'img[src*="fashion"]',
+        'img[src*="runway"]',
+        'img[src*="style"]',
+        'img[alt*="fashion"]',
+        'img[alt*="style"]',
+        '.hero-image img',
+        '.featured-image img',
+        '.gallery img',
+        'article img',
+        '.content img'
+    ]
+    image_engine = SelectorEngine(IMAGE_SELECTORS, attributes=('src', 'data-src'))
+    
     def __init__(self, site_config: Dict[str, Any]):
         self.site_config = site_config
         self.base_url = site_config['base_url']
         self.delay = site_config.get('delay', 2.0)
         self.crawl_depth = site_config.get('crawl_depth', 3)
+        self.parser_backend = get_parser_backend(site_config.get('parser', 'beautifulsoup'))
+        self.keywords = get_keyword_engine()
+        self.config = config = get_config()
+        self.ethical_rules = config.ETHICAL_RULES
+        self.robots_cache = RobotsTxtCache(self.ethical_rules['cache_duration'], self.ethical_rules['user_agent'])
+        self.http_cache = HttpCache(
+            config.CACHE_CONFIG['http_cache_dir'],
+            self.ethical_rules['cache_duration']
+        )
+        frontier_config = config.FRONTIER_CONFIG
+        self.frontier = CrawlFrontier(
+            os.path.join(config.CACHE_CONFIG['frontier_dir'], f"{urlparse(self.base_url).netloc}.json"),
+            mode=frontier_config['mode'],
+            refresh_after_hours=frontier_config['refresh_after_hours'],
+            retention_days=frontier_config['retention_days']
+        )
+        self.max_listing_pages = site_config.get('max_listing_pages', frontier_config['max_listing_pages'])
+        self.pipeline_config = config.PIPELINE_CONFIG
+        self.replay = CrawlReplay.from_config(config.REPLAY_CONFIG)
+        self.parse_stats = {'pages': 0, 'seconds': 0.0}
+        self.parse_executor = None  # Optional ParseExecutor set by the manager
         self.session = None
+        self.rate_limiter = None
+        self.request_semaphore = None
         self.logger = logging.getLogger(f"crawler.{self.__class__.__name__}")
         
     async def __aenter__(self):
         """Async context manager entry"""
         self.session = aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=30),
-            headers={'User-Agent': 'LooklyyCrawler/1.0 (+https://looklyy.com/about)'}
+            headers={'User-Agent': self.ethical_rules['user_agent']}
         )
+        # Created per crawl so they bind to the running event loop;
+        # replayed crawls hit the local archive server, so they aren't paced
+        delay = 0 if self.replay.replaying else self.delay
+        self.rate_limiter = HostRateLimiter(delay, self.site_config.get('burst', 1.0))
+        self.request_semaphore = asyncio.Semaphore(self.ethical_rules['max_concurrent_requests'])
+        self.http_cache.reset_stats()
+        self.parse_stats = {'pages': 0, 'seconds': 0.0}
+        await asyncio.to_thread(self.frontier.load)
+        await asyncio.to_thread(self.http_cache.prune, self.config.CACHE_CONFIG['http_cache_max_age_days'] * 86400)
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -51,76 +128,248 @@ class BaseFashionCrawler(ABC):
         if self.session:
             await self.session.close()
     
-    async def check_robots_txt(self) -> bool:
-        """Check if crawling is allowed by robots.txt"""
+    async def check_robots_txt(self, url: Optional[str] = None) -> bool:
+        """Check if crawling is allowed by robots.txt (defaults to base_url)"""
+        if not self.ethical_rules['respect_robots_txt'] or self.replay.replaying:
+            return True  # archives are recorded under robots.txt
+        
+        return await self.robots_cache.can_fetch(self.session, url or self.base_url)
+    
+    @asynccontextmanager
+    async def throttle(self, url: str):
+        """Hold a concurrency slot and wait for the host's token bucket"""
+        async with self.request_semaphore:
+            await self.rate_limiter.acquire(url)
+            yield
+    
+    async def fetch_page(self, url: str, only_if_modified: bool = False) -> Optional[str]:
+        """Fetch a single page with error handling, throttling and conditional-GET caching
+        
+        With only_if_modified=True an unchanged page returns None so callers
+        can skip parsing and LLM processing for it.
+        """
         try:
-            robots_url = urljoin(self.base_url, '/robots.txt')
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            rp.read()
+            cached = await self.http_cache.get(url)
+            if cached and self.http_cache.is_fresh(cached):
+                self.http_cache.record('fresh_hits')
+                self.logger.info(f"Cache hit (fresh): {url}")
+                return None if only_if_modified else cached['body']
             
-            user_agent = 'LooklyyCrawler'
-            return rp.can_fetch(user_agent, self.base_url)
+            # Respect rate limiting
+            request_url = self.replay.request_url(url)
+            async with self.throttle(request_url):
+                headers = self.http_cache.conditional_headers(cached)
+                async with self.session.get(request_url, headers=headers) as response:
+                    if response.status == 304 and cached:
+                        self.http_cache.record('revalidated')
+                        await self.http_cache.touch(url, cached)
+                        self.logger.info(f"Not modified: {url}")
+                        return None if only_if_modified else cached['body']
+                    elif response.status == 200:
+                        content = await response.text()
+                        self.http_cache.record('misses')
+                        await self.http_cache.store(url, content, response.headers)
+                        await self.replay.record(url, 'http', content)
+                        self.logger.info(f"Successfully fetched: {url}")
+                        return content
+                    else:
+                        self.logger.warning(f"Failed to fetch {url}: Status {response.status}")
+                        return None
+                    
         except Exception as e:
-            self.logger.warning(f"Could not check robots.txt: {e}")
-            return True  # Assume allowed if can't check
+            self.logger.error(f"Error fetching {url}: {e}")
+            return None
     
-    async def fetch_page(self, url: str) -> Optional[str]:
-        """Fetch a single page with error handling and throttling"""
+    async def fetch_image(self, url: str) -> Optional[bytes]:
+        """Download an image's bytes (bounded by IMAGE_REQUIREMENTS['max_file_size'])"""
+        max_size = self.config.IMAGE_REQUIREMENTS['max_file_size']
         try:
-            # Respect rate limiting
-            await asyncio.sleep(self.delay)
-            
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    self.logger.info(f"Successfully fetched: {url}")
-                    return content
-                else:
-                    self.logger.warning(f"Failed to fetch {url}: Status {response.status}")
-                    return None
+            request_url = self.replay.request_url(url, 'image')
+            async with self.throttle(request_url):
+                async with self.session.get(request_url) as response:
+                    if response.status != 200 or (response.content_length or 0) > max_size:
+                        self.logger.warning(f"Skipping image {url}: Status {response.status}")
+                        return None
+                    data = await response.content.read(max_size + 1)
+                    if len(data) > max_size:
+                        return None
+                    await self.replay.record(url, 'image', data)
+                    return data
                     
         except Exception as e:
-            self.logger.error(f"Error fetching {url}: {e}")
+            self.logger.error(f"Error fetching image {url}: {e}")
             return None
     
     def parse_html(self, html: str, url: str) -> BeautifulSoup:
-        """Parse HTML content"""
-        return BeautifulSoup(html, 'lxml')
+        """Parse HTML content with the site's parser backend
+        
+        Non-default backends return nodes exposing the same select/select_one/
+        get/get_text methods the site crawlers use on BeautifulSoup.
+        """
+        return self.parser_backend.parse(html)
     
     def extract_high_quality_images(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract high-quality fashion images from page"""
-        images = []
-        
-        # Look for common fashion image patterns
-        image_selectors = [
-            'img[src*="fashion"]',
-            'img[src*="runway"]',
-            'img[src*="style"]',
-            'img[alt*="fashion"]',
-            'img[alt*="style"]',
-            '.hero-image img',
-            '.featured-image img',
-            '.gallery img',
-            'article img',
-            '.content img'
+        # One walk over the document; each <img> is normalized and quality-checked once
+        return self.image_engine.extract_urls(soup, base_url, accept=self.is_magazine_quality_image)
+    
+    def extract_structured_metadata(self, soup: BeautifulSoup) -> ArticleMetadata:
+        """Read JSON-LD and OpenGraph metadata from the parsed document's <head> only"""
+        metadata = ArticleMetadata()
+        head = soup.select_one('head')
+        if head is None:
+            return metadata
+        
+        # JSON-LD first: it carries typed, machine-readable fields
+        for script in head.select('script[type="application/ld+json"]'):
+            try:
+                article = self.find_ld_article(json.loads(script.get_text()))
+            except ValueError:
+                continue
+            if article:
+                metadata.title = self.ld_text(article.get('headline') or article.get('name'))
+                metadata.description = self.ld_text(article.get('description'))
+                metadata.image_url = self.ld_url(article.get('image'))
+                metadata.author = self.ld_name(article.get('author'))
+                metadata.published_date = self.parse_date(self.ld_text(article.get('datePublished')))
+                break
+        
+        # OpenGraph / article:* / plain meta tags fill whatever JSON-LD left out
+        meta = {}
+        for tag in head.select('meta[property], meta[name]'):
+            key = tag.get('property') or tag.get('name')
+            if key and key not in meta and tag.get('content'):
+                meta[key] = tag.get('content').strip()
+        
+        metadata.title = metadata.title or meta.get('og:title') or meta.get('twitter:title')
+        metadata.description = (
+            metadata.description or meta.get('og:description') or meta.get('description')
+        )
+        metadata.image_url = metadata.image_url or meta.get('og:image') or meta.get('twitter:image')
+        metadata.image_width = meta.get('og:image:width')
+        metadata.image_height = meta.get('og:image:height')
+        if not metadata.author:
+            author = meta.get('author') or meta.get('article:author')
+            metadata.author = author if author and not author.startswith('http') else None
+        if not metadata.published_date:
+            metadata.published_date = self.parse_date(meta.get('article:published_time'))
+        
+        if metadata.image_url and metadata.image_url.startswith('//'):
+            metadata.image_url = 'https:' + metadata.image_url
+        return metadata
+    
+    def find_ld_article(self, data: Any) -> Optional[Dict[str, Any]]:
+        """Find the article object in a JSON-LD payload (lists and @graph included)"""
+        if isinstance(data, list):
+            for item in data:
+                found = self.find_ld_article(item)
+                if found:
+                    return found
+        elif isinstance(data, dict):
+            ld_type = data.get('@type')
+            ld_types = ld_type if isinstance(ld_type, list) else [ld_type]
+            if any(t in ARTICLE_LD_TYPES for t in ld_types):
+                return data
+            if '@graph' in data:
+                return self.find_ld_article(data['@graph'])
+        return None
+    
+    def ld_text(self, value: Any) -> Optional[str]:
+        """First string in a JSON-LD value"""
+        if isinstance(value, list):
+            value = value[0] if value else None
+        return value.strip() if isinstance(value, str) and value.strip() else None
+    
+    def ld_url(self, value: Any) -> Optional[str]:
+        """URL from a JSON-LD image (string, ImageObject or list of either)"""
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('url') or value.get('contentUrl')
+        return self.ld_text(value)
+    
+    def ld_name(self, value: Any) -> Optional[str]:
+        """Name(s) from a JSON-LD author (string, Person or list)"""
+        values = value if isinstance(value, list) else [value]
+        names = [
+            self.ld_text(v.get('name') if isinstance(v, dict) else v) for v in values
         ]
+        names = [name for name in names if name]
+        return ', '.join(names) if names else None
+    
+    def structured_image(self, metadata: ArticleMetadata) -> Optional[str]:
+        """Hero image from structured metadata, if it passes the magazine-quality check"""
+        if metadata.image_url and self.is_magazine_quality_image(metadata.image_url, metadata):
+            return metadata.image_url
+        return None
+    
+    def parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
+        """Parse various date formats (ISO 8601 first, then common display formats)"""
+        if not date_str:
+            return None
         
-        for selector in image_selectors:
-            for img in soup.select(selector):
-                img_url = img.get('src') or img.get('data-src')
-                if img_url:
-                    # Convert relative URLs to absolute
-                    if img_url.startswith('//'):
-                        img_url = 'https:' + img_url
-                    elif img_url.startswith('/'):
-                        img_url = urljoin(base_url, img_url)
-                    
-                    # Filter for magazine-quality images
-                    if self.is_magazine_quality_image(img_url, img):
-                        images.append(img_url)
+        date_str = date_str.strip()
+        try:
+            parsed = datetime.fromisoformat(date_str)
+            # Naive local time, matching datetime.now() used in scoring
+            return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+        except ValueError:
+            pass
+        
+        # Common date formats
+        date_formats = [
+            '%Y-%m-%dT%H:%M:%S',
+            '%Y-%m-%d %H:%M:%S',
+            '%Y-%m-%d',
+            '%B %d, %Y',
+            '%b %d, %Y',
+            '%m/%d/%Y'
+        ]
+        
+        for fmt in date_formats:
+            try:
+                return datetime.strptime(date_str[:len(fmt)], fmt)
+            except ValueError:
+                continue
+        
+        self.logger.debug(f"Could not parse date '{date_str}'")
+        return None
+    
+    def is_fashion_content(self, url: str) -> bool:
+        """Check if URL contains fashion-related content"""
+        fashion_keywords = [
+            '/fashion/', '/style/', '/runway/', '/trends/', 
+            '/celebrity-style/', '/street-style/', '/beauty/',
+            'fashion-week', 'designer', 'outfit', 'look'
+        ]
+        return any(keyword in url.lower() for keyword in fashion_keywords)
+    
+    def categorize_content(self, url: str, title: str, description: str,
+                           matches: Optional[Dict[str, List[str]]] = None) -> str:
+        """Categorize content based on URL and text analysis"""
+        if matches is None:
+            matches = self.keywords.scan_content(title, description)
+        return self.keywords.categorize(url, matches)
+    
+    def extract_tags(self, soup: BeautifulSoup, title: str, description: str,
+                     matches: Optional[Dict[str, List[str]]] = None) -> List[str]:
+        """Extract relevant tags from content"""
+        tags = []
+        
+        # Look for explicit tags
+        tag_selectors = ['.tags a', '.categories a', '.keywords', '[rel="tag"]']
+        for selector in tag_selectors:
+            for tag_elem in soup.select(selector):
+                tag_text = tag_elem.get_text(strip=True).lower()
+                if tag_text and len(tag_text) < 30:  # Reasonable tag length
+                    tags.append(tag_text)
         
-        return list(set(images))  # Remove duplicates
+        # Extract implicit tags from content
+        if matches is None:
+            matches = self.keywords.scan_content(title, description)
+        tags.extend(self.keywords.tags(matches))
+        
+        return list(set(tags))[:10]  # Limit to 10 most relevant tags
     
     def is_magazine_quality_image(self, img_url: str, img_tag) -> bool:
         """Determine if image meets magazine quality standards"""
@@ -183,45 +432,134 @@ class BaseFashionCrawler(ABC):
         pass
     
     @abstractmethod
-    async def parse_article(self, soup: BeautifulSoup, url: str) -> Optional[CrawledContent]:
-        """Parse individual article - implement per site"""
+    async def parse_article(self, soup: BeautifulSoup, url: str,
+                            metadata: Optional[ArticleMetadata] = None) -> Optional[CrawledContent]:
+        """Parse individual article - implement per site, preferring structured metadata fields"""
         pass
     
     async def crawl_section(self, section_path: str) -> List[CrawledContent]:
         """Crawl a specific section (trends, runway, etc.)"""
+        return [content async for content in self.crawl_section_stream(section_path)]
+    
+    async def crawl_section_stream(self, section_path: str) -> AsyncIterator[CrawledContent]:
+        """Yield a section's articles as they are fetched and parsed"""
         if not await self.check_robots_txt():
             self.logger.error(f"Crawling not allowed by robots.txt for {self.base_url}")
-            return []
+            return
         
         section_url = urljoin(self.base_url, section_path)
         self.logger.info(f"Starting crawl of {section_url}")
         
-        # Get section page
-        html = await self.fetch_page(section_url)
-        if not html:
-            return []
+        # Articles are fetched while later listing pages are still being read;
+        # throttle() keeps each host polite and the queue bounds parsed articles in memory
+        # Articles enter the frontier only once saved (see mark_processed)
+        crawled_count = 0
+        async for content in stage(
+            self.iter_article_links(section_url),
+            self.crawl_article,
+            concurrency=self.ethical_rules['max_concurrent_requests'],
+            queue_size=self.pipeline_config['queue_size']
+        ):
+            crawled_count += 1
+            yield content
         
-        soup = self.parse_html(html, section_url)
+        self.logger.info(f"Successfully crawled {crawled_count} articles")
+    
+    async def fetch_listing_links(self, url: str) -> Optional[List[str]]:
+        """Fetch one listing page and extract its article links"""
+        html = await self.fetch_page(url)
+        if not html:
+            return None
         
-        # Extract article links
-        article_links = await self.extract_article_links(soup, self.base_url)
-        self.logger.info(f"Found {len(article_links)} articles to crawl")
+        return await self.parse_fetched_listing(html, url)
+    
+    async def parse_fetched_listing(self, html: str, url: str) -> List[str]:
+        """Extract listing links, in the parse executor when one is configured"""
+        started = time.perf_counter()
+        try:
+            if self.parse_executor:
+                return await self.parse_executor.extract_article_links(self, html, url)
+            return await self.extract_listing_links(html, url)
+        finally:
+            self.record_parse_time(started)
+    
+    async def extract_listing_links(self, html: str, url: str) -> List[str]:
+        """Parse raw listing HTML and extract its article links"""
+        soup = self.parse_html(html, url)
+        return await self.extract_article_links(soup, self.base_url)
+    
+    def listing_page_url(self, section_url: str, page: int) -> str:
+        """URL of a deeper listing page (page numbers start at 1)"""
+        if page == 1:
+            return section_url
+        param = self.site_config.get('pagination_param', 'page')
+        separator = '&' if '?' in section_url else '?'
+        return f"{section_url}{separator}{param}={page}"
+    
+    async def collect_article_links(self, section_url: str) -> List[str]:
+        """All links iter_article_links would yield for a section"""
+        return [link async for link in self.iter_article_links(section_url)]
+    
+    async def iter_article_links(self, section_url: str) -> AsyncIterator[str]:
+        """Walk listing pages until crawl_depth new links are found or known articles appear"""
+        selected = set()
+        for page in range(1, self.max_listing_pages + 1):
+            page_links = await self.fetch_listing_links(self.listing_page_url(section_url, page))
+            if page_links is None:
+                break
+            
+            new_links = [link for link in self.frontier.select(page_links) if link not in selected]
+            for link in new_links[:self.crawl_depth - len(selected)]:  # Respect crawl depth
+                selected.add(link)
+                yield link
+            
+            # Stop once we've reached already-crawled territory or have enough work
+            reached_known = any(self.frontier.is_known(link) for link in page_links)
+            if reached_known or not new_links or len(selected) >= self.crawl_depth:
+                break
+    
+    async def crawl_article(self, link: str) -> Optional[CrawledContent]:
+        """Fetch and parse a single article"""
+        if not await self.check_robots_txt(link):
+            self.logger.info(f"Skipping {link}: disallowed by robots.txt")
+            return None
         
-        # Crawl individual articles
-        crawled_content = []
-        for link in article_links[:self.crawl_depth]:  # Respect crawl depth
-            try:
-                article_html = await self.fetch_page(link)
-                if article_html:
-                    article_soup = self.parse_html(article_html, link)
-                    content = await self.parse_article(article_soup, link)
-                    if content:
-                        content.trend_score = self.calculate_trend_score(content.__dict__)
-                        crawled_content.append(content)
-                        
-            except Exception as e:
-                self.logger.error(f"Error crawling article {link}: {e}")
-                continue
+        try:
+            # Only articles saved on an earlier crawl may be skipped as unchanged
+            article_html = await self.fetch_page(link, only_if_modified=self.frontier.is_known(link))
+            if article_html:
+                return await self.parse_fetched_article(article_html, link)
+                    
+        except Exception as e:
+            self.logger.error(f"Error crawling article {link}: {e}")
         
-        self.logger.info(f"Successfully crawled {len(crawled_content)} articles")
-        return crawled_content
+        return None
+    
+    def mark_processed(self, url: str):
+        """Record an article as done once it is saved; failed articles are retried next crawl"""
+        self.frontier.mark_crawled(url)
+    
+    async def parse_fetched_article(self, html: str, url: str) -> Optional[CrawledContent]:
+        """Parse a fetched article, in the parse executor when one is configured"""
+        started = time.perf_counter()
+        try:
+            if self.parse_executor:
+                return await self.parse_executor.parse_article(self, html, url)
+            return await self.parse_article_html(html, url)
+        finally:
+            self.record_parse_time(started)
+    
+    def record_parse_time(self, started: float):
+        """Add one parsed page to the parse timing stats"""
+        self.parse_stats['pages'] += 1
+        self.parse_stats['seconds'] += time.perf_counter() - started
+    
+    async def parse_article_html(self, html: str, url: str) -> Optional[CrawledContent]:
+        """Parse raw article HTML and score the result"""
+        # One parse: structured metadata comes from the same document's <head>
+        soup = self.parse_html(html, url)
+        metadata = self.extract_structured_metadata(soup)
+        content = await self.parse_article(soup, url, metadata)
+        if content:
+            content.trend_score = self.calculate_trend_score(content.__dict__)
+        return content
@@ -0,0 +1,78 @@
+# Shared Headless Browser Pool for JS-Rendered Sites
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+from playwright.async_api import async_playwright
+
+class BrowserPool:
+    """One long-lived Chromium process with a bounded pool of reusable pages"""
+
+    # Resource types the HTML parse never looks at
+    BLOCKED_RESOURCE_TYPES = ('image', 'font', 'media')
+
+    def __init__(self, size: int, user_agent: str,
+                 blocked_resource_types: Tuple[str, ...] = BLOCKED_RESOURCE_TYPES):
+        self.size = size
+        self.user_agent = user_agent
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.playwright = None
+        self.browser = None
+        self.contexts = []
+        self.pages: Optional[asyncio.Queue] = None
+        self.start_lock: Optional[asyncio.Lock] = None
+        self.logger = logging.getLogger("crawler.browser_pool")
+
+    async def block_unused_resources(self, route):
+        """Abort requests for images, fonts and media"""
+        if route.request.resource_type in self.blocked_resource_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def start(self):
+        """Launch the browser and open the pooled contexts (idempotent)"""
+        if self.start_lock is None:
+            self.start_lock = asyncio.Lock()
+
+        async with self.start_lock:
+            if self.browser:
+                return
+
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            self.pages = asyncio.Queue()
+
+            for _ in range(self.size):
+                context = await self.browser.new_context(user_agent=self.user_agent)
+                await context.route('**/*', self.block_unused_resources)
+                self.contexts.append(context)
+                self.pages.put_nowait(await context.new_page())
+
+            self.logger.info(f"Browser pool started with {self.size} pages")
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a page from the pool, waiting if all are in use"""
+        await self.start()
+        page = await self.pages.get()
+        try:
+            yield page
+        finally:
+            self.pages.put_nowait(page)
+
+    async def close(self):
+        """Close every context, the browser and the Playwright driver"""
+        for context in self.contexts:
+            await context.close()
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+
+        self.playwright = None
+        self.browser = None
+        self.contexts = []
+        self.pages = None
+        self.start_lock = None
@@ -2,15 +2,20 @@
 
 import asyncio
 import logging
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import time
 
 from .harpers_bazaar_crawler import HarpersBazaarCrawler
 from .elle_crawler import ElleCrawler
 from .vogue_crawler import VogueCrawler
+from .parse_executor import ParseExecutor
+from .pipeline import stage, batched, flatten
+from .duplicate_claims import DuplicateClaims
 from ..processors.content_processor import FashionContentProcessor
+from ..processors.near_duplicates import MinHasher, NearDuplicateIndex
+from ..processors.image_hash import HammingIndex, dhash, hash_bits, hash_hex_width, hash_to_hex
 from ..database.db_manager import db_manager
+from ..models.trend_model import TrendingFilters, TrendingLook
 from ..config import get_config
 
 class FashionCrawlerManager:
@@ -29,6 +34,19 @@ class FashionCrawlerManager:
             'elle': ElleCrawler(self.config.FASHION_SITES['elle']),
             'vogue': VogueCrawler(self.config.FASHION_SITES['vogue'])
         }
+        
+        # Shared across sites, since the magazines syndicate each other's stories
+        self.duplicate_index = None
+        self.min_hasher = None
+        self.image_index = None
+        self.claims = DuplicateClaims()  # unsaved looks of the running crawl
+        
+        # Optionally parse in worker processes so network I/O stays concurrent
+        self.parse_executor = None
+        if self.config.PARSE_CONFIG['use_process_pool']:
+            self.parse_executor = ParseExecutor(self.config.PARSE_CONFIG['max_workers'])
+            for crawler in self.crawlers.values():
+                crawler.parse_executor = self.parse_executor
     
     async def crawl_all_sites(self, sections: List[str] = None) -> Dict[str, Any]:
         """Crawl all configured fashion sites"""
@@ -40,35 +58,60 @@ class FashionCrawlerManager:
             'total_looks_crawled': 0,
             'new_looks_added': 0,
             'updated_looks': 0,
+            'near_duplicates': 0,
+            'duplicate_images': 0,
             'failed_crawls': 0,
             'sites_crawled': [],
             'crawl_duration': 0,
+            'http_cache_hit_rate': {},
+            'llm_cache': {},
             'errors': []
         }
         
         self.logger.info(f"Starting crawl of {len(self.crawlers)} sites")
-        
-        # Crawl each site
-        for site_name, crawler in self.crawlers.items():
-            try:
-                site_results = await self.crawl_site(site_name, crawler, sections)
-                
+        try:
+            await self.train_local_model()
+            await self.load_duplicate_index()
+            await self.load_image_index()
+            
+            # Crawl all sites in parallel; each crawler paces its own host
+            site_names = list(self.crawlers.keys())
+            site_results_list = await asyncio.gather(
+                *(self.crawl_site(site_name, self.crawlers[site_name], sections) for site_name in site_names),
+                return_exceptions=True
+            )
+            
+            for site_name, site_results in zip(site_names, site_results_list):
+                if isinstance(site_results, Exception):
+                    error_msg = f"Failed to crawl {site_name}: {site_results}"
+                    self.logger.error(error_msg)
+                    crawl_results['failed_crawls'] += 1
+                    crawl_results['errors'].append(error_msg)
+                    continue
+            
                 # Aggregate results
                 crawl_results['total_looks_crawled'] += site_results['looks_found']
                 crawl_results['new_looks_added'] += site_results['new_looks']
                 crawl_results['updated_looks'] += site_results['updated_looks']
+                crawl_results['near_duplicates'] += site_results['near_duplicates']
+                crawl_results['duplicate_images'] += site_results['duplicate_images']
                 crawl_results['sites_crawled'].append(site_name)
-                
-            except Exception as e:
-                error_msg = f"Failed to crawl {site_name}: {e}"
-                self.logger.error(error_msg)
-                crawl_results['failed_crawls'] += 1
-                crawl_results['errors'].append(error_msg)
-        
-        crawl_results['crawl_duration'] = time.time() - start_time
-        
-        # Update trend scores after crawling
-        await db_manager.update_trend_scores()
+                crawl_results['http_cache_hit_rate'][site_name] = site_results['http_cache_hit_rate']
+            
+            crawl_results['crawl_duration'] = time.time() - start_time
+            
+            # Persist LLM results so unchanged articles skip the LLM next time
+            await self.content_processor.llm_cache.save()
+            crawl_results['llm_cache'] = {
+                **self.content_processor.llm_cache.stats,
+                'hit_rate': round(self.content_processor.llm_cache.hit_rate(), 3)
+            }
+            crawl_results['local_model'] = dict(self.content_processor.local_model.stats)
+            
+            # Update trend scores after crawling
+            await db_manager.update_trend_scores()
+        finally:
+            await self.shutdown_parse_executor()
         
         self.logger.info(f"Crawl completed in {crawl_results['crawl_duration']:.2f}s")
         return crawl_results
@@ -79,39 +122,233 @@ class FashionCrawlerManager:
             'looks_found': 0,
             'new_looks': 0,
             'updated_looks': 0,
+            'near_duplicates': 0,
+            'duplicate_images': 0,
             'sections_crawled': []
         }
         
         async with crawler:
-            for section in sections:
+            # Articles already stored in the database count as crawled
+            crawler.frontier.seed(await db_manager.get_crawled_urls(site_name))
+            
+            queue_size = self.config.PIPELINE_CONFIG['queue_size']
+            batch_size = max(1, self.config.LLM_CONFIG['batch_size'])
+            processor = self.content_processor
+            
+            async def clean(batch):
+                cleaned = processor.clean_batch([content for content, _ in batch])
+                return [{**item, **annotations} for item, (_, annotations) in zip(cleaned, batch)]
+            
+            async def enhance(batch):
                 try:
-                    section_path = crawler.site_config.get(section)
-                    if not section_path:
-                        continue
-                    
-                    self.logger.info(f"Crawling {site_name} - {section}")
-                    
-                    # Crawl section
-                    crawled_content = await crawler.crawl_section(section_path)
-                    
-                    # Process and save content
-                    for content in crawled_content:
-                        processed_content = await self.content_processor.process_content(content)
-                        
-                        # Save to database
-                        look_id = await db_manager.save_trending_look(processed_content)
-                        if look_id:
-                            site_results['new_looks'] += 1
-                        
-                        site_results['looks_found'] += 1
-                    
-                    site_results['sections_crawled'].append(section)
-                    
+                    enhanced = await processor.enhance_batch_with_llm(batch)
                 except Exception as e:
-                    self.logger.error(f"Error crawling {site_name} {section}: {e}")
+                    self.logger.error(f"Error enhancing batch: {e}")
+                    enhanced = batch
+                return [processor.finalize_content(item) for item in enhanced]
+            
+            async def save(batch):
+                # One upsert statement per batch, reporting inserts and updates separately
+                saved_ids = await db_manager.save_trending_looks_bulk(batch)
+                site_results['new_looks'] += len(saved_ids['inserted'])
+                site_results['updated_looks'] += len(saved_ids['updated'])
+                site_results['looks_found'] += len(batch)
+                # Only saved articles count as crawled; the rest are retried next time
+                for source_url in saved_ids['urls']:
+                    crawler.mark_processed(source_url)
+                await self.settle_claims(batch, saved_ids['urls'])
+            
+            # fetch/parse -> drop duplicates -> clean -> enhance -> save, each stage running
+            # concurrently with its own worker limit and a bounded queue to the next
+            articles = self.iter_site_articles(site_name, crawler, sections, site_results)
+            unique = stage(
+                articles, lambda content: self.check_near_duplicate(crawler, content, site_results),
+                queue_size=queue_size
+            )
+            distinct = stage(
+                unique, lambda item: self.check_duplicate_image(crawler, item, site_results),
+                concurrency=self.config.ETHICAL_RULES['max_concurrent_requests'], queue_size=queue_size
+            )
+            cleaned = stage(batched(distinct, batch_size), clean, queue_size=queue_size)
+            enhanced = stage(
+                cleaned, enhance,
+                concurrency=self.config.LLM_CONFIG['max_in_flight'], queue_size=queue_size
+            )
+            saved = stage(
+                batched(flatten(enhanced), self.config.PIPELINE_CONFIG['save_batch_size']), save,
+                concurrency=self.config.PIPELINE_CONFIG['save_concurrency'], queue_size=queue_size
+            )
+            
+            try:
+                async for _ in saved:
+                    pass
+            except Exception as e:
+                self.logger.error(f"Error in {site_name} crawl pipeline: {e}")
+            finally:
+                # Items lost to a failed stage never reach the save
+                for source_url in self.claims.claimed_by(crawler):
+                    self.release_claim(source_url)
+                await crawler.frontier.save()
         
+        site_results['http_cache_hit_rate'] = round(crawler.http_cache.hit_rate(), 3)
+        self.logger.info(
+            f"{site_name} HTTP cache hit rate: {site_results['http_cache_hit_rate']:.1%} "
+            f"({crawler.http_cache.stats})"
+        )
         return site_results
     
+    async def train_local_model(self):
+        """Refresh the local pre-screen classifier from stored looks"""
+        if not self.config.LOCAL_MODEL_CONFIG['enabled']:
+            return
+        rows = await db_manager.get_training_looks(self.config.LOCAL_MODEL_CONFIG['training_rows'])
+        await asyncio.to_thread(self.content_processor.train_local_model, rows)
+    
+    async def load_duplicate_index(self):
+        """Build the near-duplicate index from signatures stored with existing looks"""
+        dedup_config = self.config.DEDUP_CONFIG
+        if not dedup_config['enabled']:
+            return
+        self.min_hasher = MinHasher(dedup_config['num_perm'], dedup_config['shingle_size'])
+        self.duplicate_index = NearDuplicateIndex(
+            dedup_config['threshold'], dedup_config['num_perm'], dedup_config['bands']
+        )
+        for source_url, signature in await db_manager.get_content_signatures():
+            self.duplicate_index.add(signature, source_url)
+        self.claims.signatures = NearDuplicateIndex(
+            dedup_config['threshold'], dedup_config['num_perm'], dedup_config['bands']
+        )
+        self.logger.info(f"Loaded {len(self.duplicate_index)} content signatures")
+    
+    async def load_image_index(self):
+        """Build the perceptual-hash index from primary images of existing looks"""
+        if not self.config.IMAGE_DEDUP_CONFIG['enabled']:
+            return
+        image_config = self.config.IMAGE_DEDUP_CONFIG
+        width = hash_hex_width(image_config['hash_size'])
+        if width > TrendingLook.image_phash.type.length:
+            raise ValueError(
+                f"IMAGE_DEDUP_CONFIG hash_size {image_config['hash_size']} gives {width}-digit hashes, "
+                f"wider than the image_phash column"
+            )
+        self.image_index = HammingIndex(image_config['max_distance'], hash_bits(image_config['hash_size']))
+        self.claims.images = HammingIndex(image_config['max_distance'], hash_bits(image_config['hash_size']))
+        for source_url, image_phash in await db_manager.get_image_hashes():
+            if len(image_phash) == width:  # hashes from another hash_size aren't comparable
+                self.image_index.add(int(image_phash, 16), source_url)
+        self.logger.info(f"Loaded {len(self.image_index)} image hashes")
+    
+    async def iter_site_articles(self, site_name: str, crawler, sections: List[str],
+                                 site_results: Dict[str, Any]) -> AsyncIterator[Any]:
+        """Stream the articles of every requested section in turn"""
+        for section in sections:
+            section_path = crawler.site_config.get(section)
+            if not section_path:
+                continue
+            
+            self.logger.info(f"Crawling {site_name} - {section}")
+            try:
+                async for content in crawler.crawl_section_stream(section_path):
+                    yield content
+                site_results['sections_crawled'].append(section)
+                
+            except Exception as e:
+                self.logger.error(f"Error crawling {site_name} {section}: {e}")
+    
+    async def check_near_duplicate(self, crawler, content,
+                                   site_results: Dict[str, Any]) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """(content, annotations) for new articles, None for near-duplicates of stored or claimed looks"""
+        if self.duplicate_index is None:
+            return content, {}
+        
+        text = self.content_processor.clean_text(f"{content.title} {content.description}")
+        signature = self.min_hasher.signature(text)
+        if signature is None:
+            return content, {}
+        
+        original_url = self.duplicate_index.find(signature, content.source_url)
+        if original_url:
+            site_results['near_duplicates'] += 1
+            self.logger.info(f"Near-duplicate of {original_url}: {content.source_url}")
+            await self.drop_duplicate(crawler, content, original_url, self.config.DEDUP_CONFIG['action'])
+            return None
+        
+        # A copy of a look from this crawl that isn't saved yet waits for it
+        claimed_url = self.claims.find_signature(signature, content.source_url)
+        if claimed_url:
+            site_results['near_duplicates'] += 1
+            self.logger.info(f"Near-duplicate of {claimed_url} (not saved yet): {content.source_url}")
+            self.claims.wait(claimed_url, (crawler, content, self.config.DEDUP_CONFIG['action']))
+            return None
+        
+        self.claims.claim_signature(signature, content.source_url, crawler)
+        return content, {'content_minhash': signature}
+    
+    async def check_duplicate_image(self, crawler, item: Tuple[Any, Dict[str, Any]],
+                                    site_results: Dict[str, Any]) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """Pass the item on unless its primary image is a stored or claimed photo"""
+        content, annotations = item
+        if self.image_index is None:
+            return item
+        
+        image_config = self.config.IMAGE_DEDUP_CONFIG
+        data = await crawler.fetch_image(content.primary_image_url)
+        image_hash = await asyncio.to_thread(dhash, data, image_config['hash_size']) if data else None
+        if image_hash is None:
+            return item
+        
+        match = self.image_index.find(image_hash, exclude=content.source_url)
+        if match:
+            original_url, distance = match
+            site_results['duplicate_images'] += 1
+            self.logger.info(f"Image of {content.source_url} duplicates {original_url} ({distance} bits)")
+            self.release_claim(content.source_url)
+            await self.drop_duplicate(crawler, content, original_url, image_config['action'])
+            return None
+        
+        # Same photo as a look from this crawl that isn't saved yet: wait for it
+        claim = self.claims.find_image(image_hash, content.source_url)
+        if claim:
+            claimed_url, distance = claim
+            site_results['duplicate_images'] += 1
+            self.logger.info(
+                f"Image of {content.source_url} duplicates {claimed_url} ({distance} bits, not saved yet)"
+            )
+            self.release_claim(content.source_url)
+            self.claims.wait(claimed_url, (crawler, content, image_config['action']))
+            return None
+        
+        self.claims.claim_image(image_hash, content.source_url, crawler)
+        return content, {**annotations, 'image_phash': hash_to_hex(image_hash, image_config['hash_size'])}
+    
+    async def settle_claims(self, looks: List[Dict[str, Any]], saved_urls: List[str]):
+        """Index saved looks so later copies match them, resolve the copies that waited on them, and release the rest"""
+        saved = set(saved_urls)
+        for look in looks:
+            source_url = look['source_url']
+            if source_url not in saved:
+                self.release_claim(source_url)
+                continue
+            if self.duplicate_index is not None and look.get('content_minhash'):
+                self.duplicate_index.add(look['content_minhash'], source_url)
+            if self.image_index is not None and look.get('image_phash'):
+                self.image_index.add(int(look['image_phash'], 16), source_url)
+            for crawler, content, action in self.claims.settle(source_url):
+                await self.drop_duplicate(crawler, content, source_url, action)
+    
+    def release_claim(self, source_url: str):
+        """Give up the claims of a look that won't be saved; copies waiting on it are retried next crawl"""
+        waiting = self.claims.settle(source_url)
+        if waiting:
+            self.logger.info(f"{source_url} was not saved; {len(waiting)} copies of it are retried next crawl")
+    
+    async def drop_duplicate(self, crawler, content, original_url: str, action: str):
+        """Skip or merge a duplicate article, marking it processed unless the merge failed"""
+        if action == 'merge':
+            if await db_manager.merge_duplicate_look(original_url, content.__dict__) is None:
+                return  # retried next crawl
+        crawler.mark_processed(content.source_url)
+    
     async def crawl_single_site(self, site_name: str, sections: List[str] = None) -> Dict[str, Any]:
         """Crawl a single fashion site"""
         if site_name not in self.crawlers:
@@ -121,7 +358,20 @@ class FashionCrawlerManager:
             sections = ['trends_path', 'runway_path']
         
         crawler = self.crawlers[site_name]
-        return await self.crawl_site(site_name, crawler, sections)
+        try:
+            await self.train_local_model()
+            await self.load_duplicate_index()
+            await self.load_image_index()
+            site_results = await self.crawl_site(site_name, crawler, sections)
+            await self.content_processor.llm_cache.save()
+        finally:
+            await self.shutdown_parse_executor()
+        return site_results
+    
+    async def shutdown_parse_executor(self):
+        """Stop the parse worker processes after a crawl; the next crawl starts a fresh pool"""
+        if self.parse_executor:
+            await asyncio.to_thread(self.parse_executor.shutdown)
     
     async def update_featured_looks(self):
         """Update which looks should be featured on home page"""
@@ -152,37 +402,3 @@ class FashionCrawlerManager:
 
 # Global crawler manager instance
 crawler_manager = FashionCrawlerManager()
-
-# API Routes that use the crawler manager
-@app.post("/admin/crawl")
-async def trigger_manual_crawl(
-    sites: List[str] = Query(['harpers_bazaar']),
-    sections: List[str] = Query(['trends_path'])
-):
-    """Manually trigger crawl (admin endpoint)"""
-    try:
-        if len(sites) == 1:
-            results = await crawler_manager.crawl_single_site(sites[0], sections)
-        else:
-            results = await crawler_manager.crawl_all_sites(sections)
-        
-        return {
-            "status": "success",
-            "results": results,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Manual crawl failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.post("/admin/update-featured")
-async def update_featured_endpoint():
-    """Update featured looks for home page"""
-    try:
-        await crawler_manager.update_featured_looks()
-        return {"status": "success", "message": "Featured looks updated"}
-        
-    except Exception as e:
-        logger.error(f"Failed to update featured looks: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,71 @@
+# In-Crawl Duplicate Claims
+#
+# A look only enters the stored near-duplicate and image indexes once it has
+# been saved, so they never point at a look that doesn't exist. Until then
+# the look holds claims: its MinHash signature and image hash sit in pending
+# indexes built like the stored ones (same LSH bands, same Hamming radius),
+# checked alongside them, so a copy syndicated to another site in the same
+# crawl still finds it. Copies of a claimed look wait on the claim: they are
+# resolved against the look once it's saved, or left to the next crawl if
+# the look is dropped or its save fails.
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..processors.image_hash import HammingIndex
+from ..processors.near_duplicates import NearDuplicateIndex
+
+class DuplicateClaims:
+    """Looks of the running crawl that passed the duplicate checks but aren't saved yet"""
+
+    def __init__(self, signatures: Optional[NearDuplicateIndex] = None,
+                 images: Optional[HammingIndex] = None):
+        self.signatures = signatures  # pending MinHash claims
+        self.images = images  # pending image hash claims
+        self.owners: Dict[str, Any] = {}  # claimed source_url -> crawler that holds the claim
+        self.waiting: Dict[str, List[Any]] = {}  # claimed source_url -> copies to resolve once settled
+
+    def find_signature(self, signature: Sequence[int], source_url: str) -> Optional[str]:
+        """Claimed look this text is a near-duplicate of, if any"""
+        if self.signatures is None:
+            return None
+        return self.signatures.find(signature, source_url)
+
+    def claim_signature(self, signature: Sequence[int], source_url: str, owner: Any):
+        """Hold a look's signature until the look is saved or given up"""
+        if self.signatures is None:
+            return
+        self.signatures.add(signature, source_url)
+        self.owners[source_url] = owner
+
+    def find_image(self, image_hash: int, source_url: str) -> Optional[Tuple[str, int]]:
+        """(claimed look, distance) whose primary image this one duplicates, if any"""
+        if self.images is None:
+            return None
+        return self.images.find(image_hash, exclude=source_url)
+
+    def claim_image(self, image_hash: int, source_url: str, owner: Any):
+        """Hold a look's image hash until the look is saved or given up"""
+        if self.images is None:
+            return
+        self.images.add(image_hash, source_url)
+        self.owners[source_url] = owner
+
+    def wait(self, claimed_url: str, copy: Any):
+        """Park a copy of a claimed look until the claim settles"""
+        self.waiting.setdefault(claimed_url, []).append(copy)
+
+    def settle(self, source_url: str) -> List[Any]:
+        """Remove a look's claims (saved, dropped or failed) and return the copies that waited on it"""
+        if self.signatures is not None:
+            self.signatures.remove(source_url)
+        if self.images is not None:
+            self.images.remove(source_url)
+        self.owners.pop(source_url, None)
+        return self.waiting.pop(source_url, [])
+
+    def claimed_by(self, owner: Any) -> List[str]:
+        """Source URLs still claimed by one crawler"""
+        return [source_url for source_url, claim_owner in self.owners.items() if claim_owner is owner]
+
+    def __len__(self) -> int:
+        return len(self.owners)
@@ -1,158 +1,241 @@
 # Elle Magazine Crawler (JS-heavy site)
 
-from typing import List, Optional
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
 import asyncio
-from .base_crawler import BaseFashionCrawler, CrawledContent
+import json
+import os
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from .base_crawler import BaseFashionCrawler, CrawledContent, ArticleMetadata
+from .selector_engine import SelectorEngine
+from .browser_pool import BrowserPool
 
 class ElleCrawler(BaseFashionCrawler):
     """Specialized crawler for Elle magazine (handles JS-heavy content)"""
     
+    # Elements that show a rendered page is ready to parse
+    LISTING_READY_SELECTOR = '.card-media a, .story-item a, .article-link, .listicle-slide a'
+    ARTICLE_READY_SELECTOR = 'h1.content-hed, .article-header h1, .story-hed, h1'
+    LAZY_IMAGE_SELECTOR = '.content-lede-image img[src], .hero-image img[src], .article-hero img[src]'
+    
+    # Elle-specific selectors
+    ARTICLE_LINK_SELECTORS = [
+        '.card-media a',
+        '.story-item a',
+        '.article-link',
+        'a[href*="/fashion/"]',
+        'a[href*="/style/"]',
+        'a[href*="/trends/"]',
+        '.listicle-slide a',
+        '.gallery-item a'
+    ]
+    link_engine = SelectorEngine(ARTICLE_LINK_SELECTORS)
+    
     def __init__(self, site_config):
         super().__init__(site_config)
         self.site_name = 'elle'
-        self.use_playwright = True  # Elle uses lazy loading
+        self.use_playwright = True  # Fallback for lazy-loaded pages; static fetch is tried first
+        self.browser_pool = BrowserPool(
+            site_config.get('browser_pool_size', self.ethical_rules['max_concurrent_requests']),
+            self.ethical_rules['user_agent']
+        )
+        
+        # URL pattern -> 'static' or 'js', learned from earlier fetches
+        self.render_strategy: Dict[str, str] = {}
+        self.render_strategy_path = os.path.join(
+            self.config.CACHE_CONFIG['render_strategy_dir'], 'elle.json'
+        )
+    
+    async def __aenter__(self):
+        """Load learned render strategies along with the HTTP session"""
+        await super().__aenter__()
+        await asyncio.to_thread(self.load_render_strategy)
+        return self
     
-    async def fetch_page_with_js(self, url: str) -> Optional[str]:
-        """Fetch page using Playwright for JS-rendered content"""
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Shut down the shared browser along with the HTTP session"""
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
-                # Set user agent
-                await page.set_extra_http_headers({
-                    'User-Agent': 'LooklyyCrawler/1.0 (+https://looklyy.com/about)'
-                })
-                
-                # Navigate and wait for content
-                await page.goto(url, wait_until='networkidle')
-                
-                # Scroll to load lazy-loaded images
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(2)
-                
-                content = await page.content()
-                await browser.close()
-                
-                self.logger.info(f"Successfully fetched JS content: {url}")
-                return content
+            await asyncio.to_thread(self.save_render_strategy)
+        except OSError as e:
+            self.logger.warning(f"Could not save render strategies: {e}")
+        await self.browser_pool.close()
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+    
+    def load_render_strategy(self):
+        """Read learned per-pattern render strategies (blocking)"""
+        try:
+            with open(self.render_strategy_path, 'r', encoding='utf-8') as f:
+                self.render_strategy.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+    
+    def save_render_strategy(self):
+        """Write learned per-pattern render strategies (blocking)"""
+        os.makedirs(os.path.dirname(self.render_strategy_path), exist_ok=True)
+        with open(self.render_strategy_path, 'w', encoding='utf-8') as f:
+            json.dump(self.render_strategy, f)
+    
+    def url_pattern(self, url: str, kind: str) -> str:
+        """Group URLs by page kind and leading path sections, e.g. 'article:/fashion/trends'"""
+        segments = [
+            segment for segment in urlparse(url).path.split('/')
+            if segment and not re.search(r'\d', segment)
+        ]
+        return f"{kind}:/" + '/'.join(segments[:2])
+    
+    def record_render_strategy(self, pattern: str, strategy: str):
+        """Remember which fetch path produced usable content for a pattern"""
+        if self.render_strategy.get(pattern) != strategy:
+            self.logger.info(f"Using {strategy} fetch for {pattern}")
+            self.render_strategy[pattern] = strategy
+    
+    async def fetch_page_with_js(self, url: str, wait_for: Optional[str] = None) -> Optional[str]:
+        """Fetch page using a pooled Playwright page for JS-rendered content"""
+        if self.replay.replaying:
+            return await self.fetch_replayed_js(url)
+        
+        try:
+            async with self.throttle(url):
+                async with self.browser_pool.page() as page:
+                    # Navigate and wait for the content we actually parse
+                    await page.goto(url, wait_until='domcontentloaded')
+                    await self.wait_for_selector(page, wait_for or self.ARTICLE_READY_SELECTOR)
+                    
+                    # Scroll to trigger lazy-loaded image URLs
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await self.wait_for_selector(page, self.LAZY_IMAGE_SELECTOR, timeout=2000)
+                    
+                    content = await page.content()
+            
+            self.logger.info(f"Successfully fetched JS content: {url}")
+            await self.replay.record(url, 'js', content)
+            return content
                 
         except Exception as e:
             self.logger.error(f"Playwright error for {url}: {e}")
             return None
     
+    async def fetch_replayed_js(self, url: str) -> Optional[str]:
+        """Rendered HTML recorded by an earlier crawl, served by the archive server"""
+        try:
+            request_url = self.replay.request_url(url, 'js')
+            async with self.throttle(request_url):
+                async with self.session.get(request_url) as response:
+                    if response.status == 200:
+                        return await response.text()
+                    self.logger.warning(f"No recorded JS content for {url}")
+                    return None
+                    
+        except Exception as e:
+            self.logger.error(f"Error replaying JS content for {url}: {e}")
+            return None
+    
+    async def wait_for_selector(self, page, selector: str, timeout: int = 10000):
+        """Wait for a selector, carrying on with whatever rendered if it never appears"""
+        try:
+            await page.wait_for_selector(selector, state='attached', timeout=timeout)
+        except Exception:
+            self.logger.debug(f"Timed out waiting for '{selector}' on {page.url}")
+    
     async def extract_article_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract article links from Elle listing pages"""
-        links = []
-        
-        # Elle-specific selectors
-        article_selectors = [
-            '.card-media a',
-            '.story-item a',
-            '.article-link',
-            'a[href*="/fashion/"]',
-            'a[href*="/style/"]',
-            'a[href*="/trends/"]',
-            '.listicle-slide a',
-            '.gallery-item a'
-        ]
-        
-        for selector in article_selectors:
-            for link_elem in soup.select(selector):
-                href = link_elem.get('href')
-                if href and self.is_fashion_content(href):
-                    if href.startswith('/'):
-                        full_url = base_url + href
-                    else:
-                        full_url = href
-                    links.append(full_url)
-        
-        return list(set(links))
+        return self.link_engine.extract_urls(
+            soup, base_url, accept=lambda url, _: self.is_fashion_content(url)
+        )
     
-    async def parse_article(self, soup: BeautifulSoup, url: str) -> Optional[CrawledContent]:
+    async def parse_article(self, soup: BeautifulSoup, url: str,
+                            metadata: Optional[ArticleMetadata] = None) -> Optional[CrawledContent]:
         """Parse individual Elle article"""
         try:
-            # Title extraction (Elle-specific)
-            title_selectors = [
-                'h1.content-hed',
-                '.article-header h1',
-                '.story-hed',
-                'h1'
-            ]
+            # Structured <head> metadata first; selectors only fill missing fields
+            metadata = metadata or ArticleMetadata()
             
-            title = ""
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    break
+            # Title extraction (Elle-specific)
+            title = metadata.title or ""
+            if not title:
+                title_selectors = [
+                    'h1.content-hed',
+                    '.article-header h1',
+                    '.story-hed',
+                    'h1'
+                ]
+                
+                for selector in title_selectors:
+                    title_elem = soup.select_one(selector)
+                    if title_elem:
+                        title = title_elem.get_text(strip=True)
+                        break
             
             if not title:
                 return None
             
             # Description extraction
-            desc_selectors = [
-                '.content-dek',
-                '.article-dek',
-                '.story-dek',
-                '.lead-paragraph p',
-                '.article-body p:first-child'
-            ]
-            
-            description = ""
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    description = desc_elem.get_text(strip=True)
-                    break
+            description = metadata.description or ""
+            if not description:
+                desc_selectors = [
+                    '.content-dek',
+                    '.article-dek',
+                    '.story-dek',
+                    '.lead-paragraph p',
+                    '.article-body p:first-child'
+                ]
+                
+                for selector in desc_selectors:
+                    desc_elem = soup.select_one(selector)
+                    if desc_elem:
+                        description = desc_elem.get_text(strip=True)
+                        break
             
             # Primary image extraction (Elle uses specific classes)
-            image_selectors = [
-                '.content-lede-image img',
-                '.hero-image img',
-                '.article-hero img',
-                '.story-image img',
-                'img[data-src*="elle"]'
-            ]
-            
-            primary_image = None
-            for selector in image_selectors:
-                img_elem = soup.select_one(selector)
-                if img_elem:
-                    img_src = img_elem.get('data-src') or img_elem.get('src')
-                    if img_src and self.is_magazine_quality_image(img_src, img_elem):
-                        if img_src.startswith('//'):
-                            primary_image = 'https:' + img_src
-                        elif img_src.startswith('/'):
-                            primary_image = self.base_url + img_src
-                        else:
-                            primary_image = img_src
-                        break
+            primary_image = self.structured_image(metadata)
+            if not primary_image:
+                image_selectors = [
+                    '.content-lede-image img',
+                    '.hero-image img',
+                    '.article-hero img',
+                    '.story-image img',
+                    'img[data-src*="elle"]'
+                ]
+                
+                for selector in image_selectors:
+                    img_elem = soup.select_one(selector)
+                    if img_elem:
+                        img_src = img_elem.get('data-src') or img_elem.get('src')
+                        if img_src and self.is_magazine_quality_image(img_src, img_elem):
+                            if img_src.startswith('//'):
+                                primary_image = 'https:' + img_src
+                            elif img_src.startswith('/'):
+                                primary_image = self.base_url + img_src
+                            else:
+                                primary_image = img_src
+                            break
             
             if not primary_image:
                 return None
             
             # Extract author
-            author_selectors = ['.byline-name', '.author-name', '.story-byline']
-            author = None
-            for selector in author_selectors:
-                author_elem = soup.select_one(selector)
-                if author_elem:
-                    author = author_elem.get_text(strip=True)
-                    break
+            author = metadata.author
+            if not author:
+                author_selectors = ['.byline-name', '.author-name', '.story-byline']
+                for selector in author_selectors:
+                    author_elem = soup.select_one(selector)
+                    if author_elem:
+                        author = author_elem.get_text(strip=True)
+                        break
             
             # Extract publish date
-            date_elem = soup.select_one('time[datetime], .publish-date, .story-date')
-            published_date = None
-            if date_elem:
-                date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-                published_date = self.parse_date(date_str)
+            published_date = metadata.published_date
+            if not published_date:
+                date_elem = soup.select_one('time[datetime], .publish-date, .story-date')
+                if date_elem:
+                    date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
+                    published_date = self.parse_date(date_str)
             
             # Category and tags
-            category = self.categorize_content(url, title, description)
-            tags = self.extract_tags(soup, title, description)
+            matches = self.keywords.scan_content(title, description)
+            category = self.categorize_content(url, title, description, matches)
+            tags = self.extract_tags(soup, title, description, matches)
             
             # Additional images
             additional_images = self.extract_high_quality_images(soup, self.base_url)
@@ -175,40 +258,55 @@ class ElleCrawler(BaseFashionCrawler):
             self.logger.error(f"Error parsing Elle article {url}: {e}")
             return None
     
-    async def crawl_section(self, section_path: str) -> List[CrawledContent]:
-        """Override to use Playwright for JS-heavy Elle content"""
-        if not await self.check_robots_txt():
-            self.logger.error(f"Crawling not allowed by robots.txt for {self.base_url}")
-            return []
+    async def fetch_listing_links(self, url: str) -> Optional[List[str]]:
+        """Try the plain HTTP listing first and fall back to Playwright when no links are found"""
+        pattern = self.url_pattern(url, 'listing')
         
-        section_url = self.base_url + section_path
-        self.logger.info(f"Starting JS-aware crawl of {section_url}")
+        if self.render_strategy.get(pattern) != 'js':
+            links = await super().fetch_listing_links(url)
+            if links:
+                self.record_render_strategy(pattern, 'static')
+                return links
+            self.logger.info(f"No links in static listing {url}, rendering with JS")
         
-        # Use Playwright for section page
-        html = await self.fetch_page_with_js(section_url)
+        html = await self.fetch_page_with_js(url, wait_for=self.LISTING_READY_SELECTOR)
         if not html:
-            return []
-        
-        soup = self.parse_html(html, section_url)
-        article_links = await self.extract_article_links(soup, self.base_url)
+            return None
         
-        self.logger.info(f"Found {len(article_links)} Elle articles")
+        links = await self.parse_fetched_listing(html, url)
+        if links:
+            self.record_render_strategy(pattern, 'js')
+        return links
+    
+    async def crawl_article(self, link: str) -> Optional[CrawledContent]:
+        """Fetch an Elle article statically, rendering with Playwright only when needed"""
+        if not await self.check_robots_txt(link):
+            self.logger.info(f"Skipping {link}: disallowed by robots.txt")
+            return None
         
-        # Crawl individual articles
-        crawled_content = []
-        for link in article_links[:self.crawl_depth]:
-            try:
-                # Use Playwright for article pages too (lazy loading)
-                article_html = await self.fetch_page_with_js(link)
-                if article_html:
-                    article_soup = self.parse_html(article_html, link)
-                    content = await self.parse_article(article_soup, link)
-                    if content:
-                        content.trend_score = self.calculate_trend_score(content.__dict__)
-                        crawled_content.append(content)
-                        
-            except Exception as e:
-                self.logger.error(f"Error crawling Elle article {link}: {e}")
-                continue
+        pattern = self.url_pattern(link, 'article')
+        try:
+            if self.render_strategy.get(pattern) != 'js':
+                # Only articles saved on an earlier crawl may be skipped as unchanged
+                article_html = await self.fetch_page(link, only_if_modified=self.frontier.is_known(link))
+                if not article_html:
+                    return None  # Fetch failed or unchanged since the last crawl
+                
+                content = await self.parse_fetched_article(article_html, link)
+                if content:
+                    self.record_render_strategy(pattern, 'static')
+                    return content
+                self.logger.info(f"No usable static content for {link}, rendering with JS")
+            
+            # Use Playwright for lazy-loaded article pages
+            article_html = await self.fetch_page_with_js(link)
+            if article_html:
+                content = await self.parse_fetched_article(article_html, link)
+                if content:
+                    self.record_render_strategy(pattern, 'js')
+                    return content
+                    
+        except Exception as e:
+            self.logger.error(f"Error crawling Elle article {link}: {e}")
         
-        return crawled_content
+        return None
@@ -0,0 +1,91 @@
+# Persistent Crawl Frontier (seen article URLs + last-crawled timestamps)
+
+import asyncio
+import json
+import os
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+CRAWL_MODES = ('new_only', 'refresh_stale', 'all')
+
+class CrawlFrontier:
+    """Tracks which article URLs a crawler has already processed"""
+
+    def __init__(self, path: str, mode: str = 'new_only', refresh_after_hours: float = 24.0,
+                 retention_days: Optional[float] = None):
+        if mode not in CRAWL_MODES:
+            raise ValueError(f"Unknown crawl mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.refresh_after_hours = refresh_after_hours
+        self.retention_days = retention_days
+        self.seen: Dict[str, float] = {}  # url -> last crawled (unix time)
+        self.loaded = False
+        self.logger = logging.getLogger("crawler.frontier")
+
+    def load(self):
+        """Load the seen-URL set from disk (blocking, once per process)"""
+        if self.loaded:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.seen.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load crawl frontier {self.path}: {e}")
+        self.loaded = True
+
+    def write(self):
+        """Atomically write the seen-URL set to disk (blocking)"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.seen, f)
+        os.replace(tmp_path, self.path)
+
+    async def save(self):
+        """Persist the frontier without blocking the event loop"""
+        self.prune()
+        try:
+            await asyncio.to_thread(self.write)
+        except OSError as e:
+            self.logger.warning(f"Could not save crawl frontier {self.path}: {e}")
+
+    def seed(self, crawled_urls: Dict[str, datetime]):
+        """Add URLs already stored elsewhere (e.g. TrendingLook.source_url)"""
+        for url, crawled_at in crawled_urls.items():
+            if url not in self.seen:
+                self.seen[url] = crawled_at.timestamp() if crawled_at else time.time()
+
+    def is_known(self, url: str) -> bool:
+        """Whether a URL has been crawled before"""
+        return url in self.seen
+
+    def should_crawl(self, url: str) -> bool:
+        """Decide whether an article needs fetching under the current mode"""
+        last_crawled = self.seen.get(url)
+        if last_crawled is None or self.mode == 'all':
+            return True
+        if self.mode == 'refresh_stale':
+            return time.time() - last_crawled > self.refresh_after_hours * 3600
+        return False
+
+    def select(self, urls: Iterable[str], limit: Optional[int] = None) -> List[str]:
+        """Filter URLs down to the ones worth fetching, preserving order"""
+        selected = [url for url in urls if self.should_crawl(url)]
+        return selected[:limit] if limit is not None else selected
+
+    def mark_crawled(self, url: str):
+        """Record that a URL was fully processed (saved or deliberately dropped) just now"""
+        self.seen[url] = time.time()
+    
+    def prune(self):
+        """Forget URLs last crawled longer ago than retention_days"""
+        if not self.retention_days:
+            return
+        cutoff = time.time() - self.retention_days * 86400
+        self.seen = {url: crawled for url, crawled in self.seen.items() if crawled >= cutoff}
@@ -0,0 +1,122 @@
+# Persistent Conditional-GET Cache for Crawled Pages
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import logging
+from typing import Dict, Optional, Any
+
+class HttpCache:
+    """On-disk page cache storing ETag / Last-Modified validators per URL"""
+
+    def __init__(self, cache_dir: str, ttl: float):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.logger = logging.getLogger("crawler.http_cache")
+        self.reset_stats()
+
+    def path_for(self, url: str) -> str:
+        """Cache file path for a URL"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def read_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """Read a cache file (blocking)"""
+        try:
+            with open(self.path_for(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if entry.get('url') == url else None
+        except (OSError, ValueError):
+            return None
+
+    def write_entry(self, url: str, entry: Dict[str, Any]):
+        """Atomically write a cache file (blocking)"""
+        path = self.path_for(url)
+        tmp_path = path + '.tmp'
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    async def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Load the cached entry for a URL, if any"""
+        return await asyncio.to_thread(self.read_entry, url)
+
+    async def store(self, url: str, body: str, headers) -> Dict[str, Any]:
+        """Save a fresh 200 response with its validators"""
+        entry = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'body': body,
+            'stored_at': time.time()
+        }
+        try:
+            await asyncio.to_thread(self.write_entry, url, entry)
+        except OSError as e:
+            self.logger.warning(f"Could not cache {url}: {e}")
+        return entry
+
+    async def touch(self, url: str, entry: Dict[str, Any]):
+        """Restart the freshness window after a 304"""
+        entry['stored_at'] = time.time()
+        try:
+            await asyncio.to_thread(self.write_entry, url, entry)
+        except OSError as e:
+            self.logger.warning(f"Could not refresh cache entry for {url}: {e}")
+
+    def prune(self, max_age: float) -> int:
+        """Delete cache files not written or revalidated for max_age seconds (blocking)"""
+        removed = 0
+        cutoff = time.time() - max_age
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:  # store() and touch() rewrite the file
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            self.logger.info(f"Evicted {removed} stale cache entries from {self.cache_dir}")
+        return removed
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Whether an entry is younger than the cache duration"""
+        return time.time() - entry.get('stored_at', 0) < self.ttl
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from an entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def reset_stats(self):
+        """Start hit-rate counters for a new crawl"""
+        self.stats = {
+            'requests': 0,
+            'fresh_hits': 0,     # served from disk without a request
+            'revalidated': 0,    # 304 Not Modified
+            'misses': 0          # full download
+        }
+
+    def record(self, outcome: str):
+        """Count a lookup outcome for hit-rate reporting"""
+        self.stats['requests'] += 1
+        self.stats[outcome] += 1
+
+    def hit_rate(self) -> float:
+        """Share of requests answered without downloading the page again"""
+        if not self.stats['requests']:
+            return 0.0
+        return (self.stats['fresh_hits'] + self.stats['revalidated']) / self.stats['requests']
@@ -0,0 +1,72 @@
+# Process Pool for CPU-Bound HTML Parsing
+
+import asyncio
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+# Per-process state, populated lazily inside each worker
+_worker_crawlers: Dict[Tuple[str, str], Any] = {}
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_worker_crawler(crawler_class: Type, site_config: Dict[str, Any]):
+    """Build (once per worker process) a crawler used only for parsing"""
+    key = (crawler_class.__qualname__, site_config['base_url'])
+    crawler = _worker_crawlers.get(key)
+    if crawler is None:
+        crawler = _worker_crawlers[key] = crawler_class(site_config)
+    return crawler
+
+def _run(coro):
+    """Drive a parse coroutine on the worker's private event loop"""
+    global _worker_loop
+    if _worker_loop is None:
+        _worker_loop = asyncio.new_event_loop()
+    return _worker_loop.run_until_complete(coro)
+
+def parse_article_worker(crawler_class: Type, site_config: Dict[str, Any], html: str, url: str):
+    """Parse raw article HTML into a picklable CrawledContent"""
+    crawler = _get_worker_crawler(crawler_class, site_config)
+    return _run(crawler.parse_article_html(html, url))
+
+def extract_links_worker(crawler_class: Type, site_config: Dict[str, Any], html: str, url: str) -> List[str]:
+    """Extract article links from raw listing HTML"""
+    crawler = _get_worker_crawler(crawler_class, site_config)
+    return _run(crawler.extract_listing_links(html, url))
+
+class ParseExecutor:
+    """Runs BeautifulSoup/lxml parsing in worker processes so fetching stays concurrent"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.logger = logging.getLogger("crawler.parse_executor")
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self.logger.info(f"Parse executor started with {self.max_workers} workers")
+        return self.executor
+
+    async def submit(self, func, crawler, html: str, url: str):
+        """Run a worker function for a crawler's site without blocking the loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.start(), func, type(crawler), crawler.site_config, html, url
+        )
+
+    async def parse_article(self, crawler, html: str, url: str):
+        """Parse an article in a worker process"""
+        return await self.submit(parse_article_worker, crawler, html, url)
+
+    async def extract_article_links(self, crawler, html: str, url: str) -> List[str]:
+        """Extract listing links in a worker process"""
+        return await self.submit(extract_links_worker, crawler, html, url)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
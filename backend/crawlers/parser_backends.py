@@ -0,0 +1,135 @@
+# Pluggable HTML Parser Backends
+#
+# Site crawlers only use select(), select_one(), get() and get_text(strip=...)
+# on parsed documents. BeautifulSoup provides these natively; the faster
+# backends wrap their trees in small adapters exposing the same methods.
+
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+
+class BeautifulSoupBackend:
+    """Default backend: full BeautifulSoup tree built with lxml"""
+
+    name = 'beautifulsoup'
+
+    def parse(self, html: str):
+        """Build a BeautifulSoup document"""
+        return BeautifulSoup(html, 'lxml')
+
+class LxmlNode:
+    """BeautifulSoup-compatible view of an lxml.html element"""
+
+    __slots__ = ('element', 'selectors')
+
+    def __init__(self, element, selectors: Dict[str, object]):
+        self.element = element
+        self.selectors = selectors  # compiled CSSSelector cache shared per backend
+
+    def compiled(self, css: str):
+        """Compile a CSS selector once per backend"""
+        selector = self.selectors.get(css)
+        if selector is None:
+            from lxml.cssselect import CSSSelector
+            selector = self.selectors[css] = CSSSelector(css)
+        return selector
+
+    def select(self, css: str) -> List['LxmlNode']:
+        return [LxmlNode(el, self.selectors) for el in self.compiled(css)(self.element)]
+
+    def select_one(self, css: str) -> Optional['LxmlNode']:
+        matches = self.compiled(css)(self.element)
+        return LxmlNode(matches[0], self.selectors) if matches else None
+
+    def get(self, attr: str, default=None):
+        return self.element.get(attr, default)
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        texts = self.element.itertext()
+        if strip:
+            texts = (text.strip() for text in texts)
+            texts = (text for text in texts if text)
+        return separator.join(texts)
+
+class LxmlBackend:
+    """Raw lxml.html tree with cached cssselect selectors"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html  # imported here so a missing lxml fails when the backend is chosen
+        self.document_fromstring = lxml.html.document_fromstring
+        self.selectors: Dict[str, object] = {}
+
+    def parse(self, html: str) -> LxmlNode:
+        """Build an lxml document wrapped for the crawler interface"""
+        return LxmlNode(self.document_fromstring(html), self.selectors)
+
+class SelectolaxNode:
+    """BeautifulSoup-compatible view of a selectolax node"""
+
+    __slots__ = ('node', 'order')
+
+    def __init__(self, node, order: Optional[Dict[int, int]] = None):
+        self.node = node
+        self.order = order if order is not None else {}  # node mem_id -> document position, shared per document
+
+    def document_order(self) -> Dict[int, int]:
+        """Position of every element in the document, indexed on first use"""
+        if not self.order:
+            parser = getattr(self.node, 'parser', None) or self.node
+            root = parser.root
+            if root is not None:
+                for position, node in enumerate(root.traverse()):
+                    self.order[node.mem_id] = position
+        return self.order
+
+    def select(self, css: str) -> List['SelectolaxNode']:
+        matches = self.node.css(css)
+        if ',' in css and len(matches) > 1:
+            # Modest returns a selector group's matches grouped per selector;
+            # bs4 and lxml return each element once, in document order
+            order = self.document_order()
+            unique = {node.mem_id: node for node in matches}
+            matches = sorted(unique.values(), key=lambda node: order.get(node.mem_id, 0))
+        return [SelectolaxNode(node, self.order) for node in matches]
+
+    def select_one(self, css: str) -> Optional['SelectolaxNode']:
+        if ',' in css:
+            matches = self.select(css)
+            return matches[0] if matches else None
+        node = self.node.css_first(css)
+        return SelectolaxNode(node, self.order) if node is not None else None
+
+    def get(self, attr: str, default=None):
+        attributes = getattr(self.node, 'attributes', None) or {}
+        value = attributes.get(attr)
+        return value if value is not None else default
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        return self.node.text(deep=True, separator=separator, strip=strip)
+
+class SelectolaxBackend:
+    """selectolax (Modest engine) tree - fastest, lowest allocation"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.parser import HTMLParser
+        self.parser_class = HTMLParser
+
+    def parse(self, html: str) -> SelectolaxNode:
+        """Build a selectolax document wrapped for the crawler interface"""
+        return SelectolaxNode(self.parser_class(html))
+
+PARSER_BACKENDS = {
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+def get_parser_backend(name: str = 'beautifulsoup'):
+    """Instantiate a parser backend by name (as set in FASHION_SITES[...]['parser'])"""
+    try:
+        return PARSER_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown parser backend: {name}") from None
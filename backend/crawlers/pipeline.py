@@ -0,0 +1,95 @@
+# Streaming Pipeline Stages Joined by Bounded Queues
+#
+# Each stage pulls items from an async iterable, runs a worker on up to
+# `concurrency` of them at once and hands results to the next stage through
+# a bounded queue. When a downstream stage falls behind, the queue fills,
+# workers block on put(), the stage stops pulling from its source and the
+# backpressure travels upstream - so memory stays bounded by queue sizes
+# rather than by how many articles a crawl finds.
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, List, Optional
+
+DONE = object()
+
+class StageError:
+    """Carries a worker or source exception to the consuming side of a stage"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+async def iterate(items: Iterable[Any]) -> AsyncIterator[Any]:
+    """Feed a plain iterable into a pipeline"""
+    for item in items:
+        yield item
+
+async def stage(source: AsyncIterable[Any], worker: Callable[[Any], Awaitable[Optional[Any]]],
+                concurrency: int = 1, queue_size: Optional[int] = None) -> AsyncIterator[Any]:
+    """Run worker over source items with bounded concurrency, yielding non-None results as they finish"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or concurrency)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(item):
+        try:
+            result = await worker(item)
+            if result is not None:
+                await queue.put(result)
+        except Exception as e:
+            await queue.put(StageError(e))
+        finally:
+            slots.release()
+
+    async def feed():
+        tasks = set()
+        try:
+            async for item in source:
+                await slots.acquire()
+                task = asyncio.ensure_future(run(item))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            await queue.put(DONE)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        except Exception as e:
+            for task in tasks:
+                task.cancel()
+            await queue.put(StageError(e))
+        finally:
+            close = getattr(source, 'aclose', None)
+            if close:
+                await close()
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while True:
+            result = await queue.get()
+            if result is DONE:
+                break
+            if isinstance(result, StageError):
+                raise result.error
+            yield result
+    finally:
+        # Stop upstream work when the consumer finishes early or fails
+        feeder.cancel()
+        await asyncio.gather(feeder, return_exceptions=True)
+
+async def batched(source: AsyncIterable[Any], size: int) -> AsyncIterator[List[Any]]:
+    """Group items into lists of up to `size`, flushing the remainder at the end"""
+    batch = []
+    async for item in source:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def flatten(source: AsyncIterable[List[Any]]) -> AsyncIterator[Any]:
+    """Undo batched()"""
+    async for batch in source:
+        for item in batch:
+            yield item
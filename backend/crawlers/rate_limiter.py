@@ -0,0 +1,53 @@
+# Per-Host Rate Limiting for Fashion Crawlers
+
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """Token bucket that paces requests to a single host"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        """Add tokens earned since the last update"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until enough tokens are available, then consume them"""
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self.lock:
+            self.refill()
+            if self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self.refill()
+            self.tokens -= amount
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so each site is paced independently"""
+
+    def __init__(self, delay: float, burst: float = 1.0):
+        self.rate = 1.0 / delay if delay > 0 else float('inf')
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str):
+        """Wait for the politeness budget of the URL's host"""
+        if self.rate == float('inf'):
+            return
+
+        host = urlparse(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+
+        await bucket.acquire()
@@ -0,0 +1,145 @@
+# Record / Replay Layer for Offline Crawls
+#
+# In 'record' mode every page, rendered page and image the crawlers fetch is
+# also written to a local archive. In 'replay' mode the crawlers send their
+# requests to ArchiveServer, a local aiohttp stand-in for the magazines that
+# serves the archived responses, so whole crawls run offline and repeatably
+# through the normal HTTP path (session, caches, parsing, pipeline).
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+import logging
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlencode
+from aiohttp import web
+
+REPLAY_MODES = ('off', 'record', 'replay')
+ARCHIVE_KINDS = ('http', 'js', 'image')
+
+class ResponseArchive:
+    """One JSON file per (kind, url) holding the recorded response body"""
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        self.logger = logging.getLogger("crawler.replay")
+
+    def path_for(self, kind: str, url: str) -> str:
+        key = hashlib.sha256(f"{kind}:{url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.archive_dir, kind, f"{key}.json")
+
+    def read(self, kind: str, url: str) -> Optional[Dict[str, Any]]:
+        """Recorded entry for a URL (blocking)"""
+        try:
+            with open(self.path_for(kind, url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry if entry.get('url') == url else None
+        except (OSError, ValueError):
+            return None
+
+    def body_of(self, entry: Dict[str, Any]) -> Union[str, bytes]:
+        """Decoded body of an entry (images are stored base64-encoded)"""
+        if entry.get('encoding') == 'base64':
+            return base64.b64decode(entry['body'])
+        return entry['body']
+
+    def write(self, kind: str, url: str, body: Union[str, bytes]):
+        """Atomically record a response body (blocking)"""
+        binary = isinstance(body, bytes)
+        entry = {
+            'url': url,
+            'kind': kind,
+            'encoding': 'base64' if binary else 'text',
+            'body': base64.b64encode(body).decode('ascii') if binary else body,
+            'recorded_at': time.time()
+        }
+        path = self.path_for(kind, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    async def record(self, kind: str, url: str, body: Union[str, bytes]):
+        """Record a response without failing the crawl on disk errors"""
+        try:
+            await asyncio.to_thread(self.write, kind, url, body)
+        except OSError as e:
+            self.logger.warning(f"Could not record {url}: {e}")
+
+class CrawlReplay:
+    """Per-crawler switch between live, recording and replaying fetches"""
+
+    def __init__(self, mode: str, archive: ResponseArchive, server_url: str):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.mode = mode
+        self.archive = archive
+        self.server_url = server_url.rstrip('/')
+
+    @classmethod
+    def from_config(cls, replay_config: Dict[str, Any]) -> 'CrawlReplay':
+        server_url = f"http://{replay_config['server_host']}:{replay_config['server_port']}"
+        return cls(replay_config['mode'], ResponseArchive(replay_config['archive_dir']), server_url)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def request_url(self, url: str, kind: str = 'http') -> str:
+        """URL to actually request: the archive server when replaying, else the original"""
+        if not self.replaying:
+            return url
+        return f"{self.server_url}/replay?{urlencode({'kind': kind, 'url': url})}"
+
+    async def record(self, url: str, kind: str, body: Union[str, bytes]):
+        """Archive a live response when recording"""
+        if self.recording:
+            await self.archive.record(kind, url, body)
+
+class ArchiveServer:
+    """Local aiohttp stand-in for the magazine sites, serving archived responses"""
+
+    def __init__(self, archive: ResponseArchive, host: str = '127.0.0.1', port: int = 8765):
+        self.archive = archive
+        self.host = host
+        self.port = port
+        self.runner = None
+        self.stats = {kind: 0 for kind in ARCHIVE_KINDS}
+        self.stats['missing'] = 0
+        self.logger = logging.getLogger("crawler.replay")
+
+    async def handle(self, request):
+        kind = request.query.get('kind', 'http')
+        url = request.query.get('url', '')
+        entry = await asyncio.to_thread(self.archive.read, kind, url) if kind in ARCHIVE_KINDS else None
+        if entry is None:
+            self.stats['missing'] += 1
+            self.logger.debug(f"Not in archive: {kind} {url}")
+            return web.Response(status=404)
+
+        self.stats[kind] += 1
+        body = self.archive.body_of(entry)
+        if isinstance(body, bytes):
+            return web.Response(body=body, content_type='application/octet-stream')
+        return web.Response(text=body, content_type='text/html')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/replay', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.logger.info(f"Serving archive {self.archive.archive_dir} on http://{self.host}:{self.port}")
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
@@ -0,0 +1,72 @@
+# Async robots.txt Fetching with Per-Host Cache
+
+import asyncio
+import time
+import logging
+from typing import Dict, Optional, Tuple
+from urllib.robotparser import RobotFileParser
+from urllib.parse import urlparse
+
+class RobotsTxtCache:
+    """Fetches robots.txt once per host and reuses it until the TTL expires"""
+
+    def __init__(self, ttl: float, user_agent: str):
+        self.ttl = ttl
+        self.user_agent = user_agent  # RobotFileParser matches on the product token before '/'
+        self.entries: Dict[str, Tuple[Optional[RobotFileParser], float]] = {}
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.logger = logging.getLogger("crawler.robots")
+
+    async def can_fetch(self, session, url: str) -> bool:
+        """Check a URL against its host's cached robots.txt rules"""
+        parser = await self.get_parser(session, url)
+        if parser is None:
+            return True  # Assume allowed if can't check
+        return parser.can_fetch(self.user_agent, url)
+
+    async def get_parser(self, session, url: str) -> Optional[RobotFileParser]:
+        """Return the parsed robots.txt for the URL's host, fetching it if stale"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        entry = self.entries.get(origin)
+        if entry and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+
+        # Concurrent callers for the same host share a single download
+        task = self.pending.get(origin)
+        if task is None:
+            task = asyncio.ensure_future(self.fetch(session, origin))
+            self.pending[origin] = task
+            task.add_done_callback(lambda _: self.pending.pop(origin, None))
+
+        return await task
+
+    async def fetch(self, session, origin: str) -> Optional[RobotFileParser]:
+        """Download and parse robots.txt using the crawler's aiohttp session"""
+        robots_url = origin + '/robots.txt'
+        parser = RobotFileParser(robots_url)
+
+        try:
+            async with session.get(robots_url) as response:
+                # Same status handling as RobotFileParser.read()
+                if response.status in (401, 403):
+                    parser.disallow_all = True
+                elif 400 <= response.status < 500:
+                    parser.allow_all = True
+                elif response.status >= 500:
+                    self.logger.warning(f"robots.txt unavailable for {origin}: Status {response.status}")
+                    parser = None
+                else:
+                    text = await response.text()
+                    parser.parse(text.splitlines())
+
+        except Exception as e:
+            self.logger.warning(f"Could not check robots.txt for {origin}: {e}")
+            parser = None
+
+        # Failures are cached too (as None: allowed) so a failing host isn't re-asked per article
+        if parser is not None:
+            parser.modified()
+        self.entries[origin] = (parser, time.monotonic())
+        return parser
@@ -0,0 +1,49 @@
+# Single-Pass CSS Selector Engine for Link and Image Extraction
+
+from typing import Callable, List, Optional, Sequence
+from urllib.parse import urljoin
+
+def normalize_url(url: str, base_url: str) -> Optional[str]:
+    """Resolve protocol-relative and root-relative URLs; drop non-HTTP ones"""
+    url = url.strip()
+    if url.startswith('//'):
+        return 'https:' + url
+    if url.startswith('/'):
+        return urljoin(base_url, url)
+    if url.startswith(('http://', 'https://')):
+        return url
+    return None
+
+class SelectorEngine:
+    """Joins a site's selector list into one selector group matched in a single document walk"""
+
+    def __init__(self, selectors: Sequence[str], attributes: Sequence[str] = ('href',)):
+        self.selectors = list(selectors)
+        self.attributes = tuple(attributes)  # first non-empty attribute wins
+        # Every parser backend compiles and caches the group on first use
+        self.selector = ', '.join(self.selectors)
+
+    def select(self, soup) -> List:
+        """Elements matching any selector, in document order, each at most once"""
+        return soup.select(self.selector)
+
+    def extract_urls(self, soup, base_url: str,
+                     accept: Optional[Callable[[str, object], bool]] = None) -> List[str]:
+        """Collect unique absolute URLs from matching elements, normalizing each element once"""
+        urls = []
+        seen = set()
+
+        for element in self.select(soup):
+            raw_url = next((element.get(attr) for attr in self.attributes if element.get(attr)), None)
+            if not raw_url:
+                continue
+
+            url = normalize_url(raw_url, base_url)
+            if not url or url in seen:
+                continue
+
+            if accept is None or accept(url, element):
+                seen.add(url)
+                urls.append(url)
+
+        return urls
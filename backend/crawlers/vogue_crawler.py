@@ -2,11 +2,25 @@
 
 from typing import List, Optional
 from bs4 import BeautifulSoup
-from .base_crawler import BaseFashionCrawler, CrawledContent
+from .base_crawler import BaseFashionCrawler, CrawledContent, ArticleMetadata
+from .selector_engine import SelectorEngine
 
 class VogueCrawler(BaseFashionCrawler):
     """Specialized crawler for Vogue magazine"""
     
+    # Vogue-specific selectors
+    ARTICLE_LINK_SELECTORS = [
+        '.summary-item__hed-link',
+        '.card__link',
+        '.river-item a',
+        'a[href*="/article/"]',
+        'a[href*="/fashion/"]',
+        'a[href*="/runway/"]',
+        '.gallery-slide a',
+        '.story-item a'
+    ]
+    link_engine = SelectorEngine(ARTICLE_LINK_SELECTORS)
+    
     def __init__(self, site_config):
         super().__init__(site_config)
         self.site_name = 'vogue'
@@ -14,115 +28,103 @@ class VogueCrawler(BaseFashionCrawler):
     
     async def extract_article_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract article links from Vogue listing pages"""
-        links = []
-        
-        # Vogue-specific selectors
-        article_selectors = [
-            '.summary-item__hed-link',
-            '.card__link',
-            '.river-item a',
-            'a[href*="/article/"]',
-            'a[href*="/fashion/"]',
-            'a[href*="/runway/"]',
-            '.gallery-slide a',
-            '.story-item a'
-        ]
-        
-        for selector in article_selectors:
-            for link_elem in soup.select(selector):
-                href = link_elem.get('href')
-                if href and self.is_fashion_content(href):
-                    if href.startswith('/'):
-                        full_url = base_url + href
-                    else:
-                        full_url = href
-                    links.append(full_url)
-        
-        return list(set(links))
+        return self.link_engine.extract_urls(
+            soup, base_url, accept=lambda url, _: self.is_fashion_content(url)
+        )
     
-    async def parse_article(self, soup: BeautifulSoup, url: str) -> Optional[CrawledContent]:
+    async def parse_article(self, soup: BeautifulSoup, url: str,
+                            metadata: Optional[ArticleMetadata] = None) -> Optional[CrawledContent]:
         """Parse individual Vogue article"""
         try:
-            # Vogue title extraction
-            title_selectors = [
-                'h1[data-testid="ContentHeaderHed"]',
-                '.content-header__hed',
-                '.article__header h1',
-                'h1.hed'
-            ]
+            # Structured <head> metadata first; selectors only fill missing fields
+            metadata = metadata or ArticleMetadata()
             
-            title = ""
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    break
+            # Vogue title extraction
+            title = metadata.title or ""
+            if not title:
+                title_selectors = [
+                    'h1[data-testid="ContentHeaderHed"]',
+                    '.content-header__hed',
+                    '.article__header h1',
+                    'h1.hed'
+                ]
+                
+                for selector in title_selectors:
+                    title_elem = soup.select_one(selector)
+                    if title_elem:
+                        title = title_elem.get_text(strip=True)
+                        break
             
             # Vogue description
-            desc_selectors = [
-                '[data-testid="ContentHeaderDek"]',
-                '.content-header__dek',
-                '.article__dek',
-                '.dek'
-            ]
-            
-            description = ""
-            for selector in desc_selectors:
-                desc_elem = soup.select_one(selector)
-                if desc_elem:
-                    description = desc_elem.get_text(strip=True)
-                    break
+            description = metadata.description or ""
+            if not description:
+                desc_selectors = [
+                    '[data-testid="ContentHeaderDek"]',
+                    '.content-header__dek',
+                    '.article__dek',
+                    '.dek'
+                ]
+                
+                for selector in desc_selectors:
+                    desc_elem = soup.select_one(selector)
+                    if desc_elem:
+                        description = desc_elem.get_text(strip=True)
+                        break
             
             # Vogue image extraction
-            image_selectors = [
-                '.lede-image img',
-                '.content-header-image img',
-                '.hero-image img',
-                'img[data-src*="vogue"]',
-                '.article-hero img'
-            ]
-            
-            primary_image = None
-            for selector in image_selectors:
-                img_elem = soup.select_one(selector)
-                if img_elem:
-                    img_src = img_elem.get('data-src') or img_elem.get('src')
-                    if img_src and self.is_magazine_quality_image(img_src, img_elem):
-                        if img_src.startswith('//'):
-                            primary_image = 'https:' + img_src
-                        elif img_src.startswith('/'):
-                            primary_image = self.base_url + img_src
-                        else:
-                            primary_image = img_src
-                        break
+            primary_image = self.structured_image(metadata)
+            if not primary_image:
+                image_selectors = [
+                    '.lede-image img',
+                    '.content-header-image img',
+                    '.hero-image img',
+                    'img[data-src*="vogue"]',
+                    '.article-hero img'
+                ]
+                
+                for selector in image_selectors:
+                    img_elem = soup.select_one(selector)
+                    if img_elem:
+                        img_src = img_elem.get('data-src') or img_elem.get('src')
+                        if img_src and self.is_magazine_quality_image(img_src, img_elem):
+                            if img_src.startswith('//'):
+                                primary_image = 'https:' + img_src
+                            elif img_src.startswith('/'):
+                                primary_image = self.base_url + img_src
+                            else:
+                                primary_image = img_src
+                            break
             
             if not primary_image or not title:
                 return None
             
             # Vogue author extraction
-            author_selectors = [
-                '[data-testid="ContentHeaderByline"] a',
-                '.byline__name',
-                '.content-header__byline'
-            ]
-            
-            author = None
-            for selector in author_selectors:
-                author_elem = soup.select_one(selector)
-                if author_elem:
-                    author = author_elem.get_text(strip=True)
-                    break
+            author = metadata.author
+            if not author:
+                author_selectors = [
+                    '[data-testid="ContentHeaderByline"] a',
+                    '.byline__name',
+                    '.content-header__byline'
+                ]
+                
+                for selector in author_selectors:
+                    author_elem = soup.select_one(selector)
+                    if author_elem:
+                        author = author_elem.get_text(strip=True)
+                        break
             
             # Date extraction
-            date_elem = soup.select_one('time[datetime], [data-testid="ContentHeaderPublishDate"]')
-            published_date = None
-            if date_elem:
-                date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
-                published_date = self.parse_date(date_str)
+            published_date = metadata.published_date
+            if not published_date:
+                date_elem = soup.select_one('time[datetime], [data-testid="ContentHeaderPublishDate"]')
+                if date_elem:
+                    date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
+                    published_date = self.parse_date(date_str)
             
             # Category and tags
-            category = self.categorize_content(url, title, description)
-            tags = self.extract_tags(soup, title, description)
+            matches = self.keywords.scan_content(title, description)
+            category = self.categorize_content(url, title, description, matches)
+            tags = self.extract_tags(soup, title, description, matches)
             
             # Additional images
             additional_images = self.extract_high_quality_images(soup, self.base_url)
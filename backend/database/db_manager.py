@@ -1,17 +1,87 @@
 # Database Manager for Looklyy Trending Content
 
 import asyncio
-from sqlalchemy import create_engine, desc, and_, or_
+import base64
+import json
+import os
+from sqlalchemy import create_engine, text, desc, and_, or_, select, tuple_, update, case, func, literal_column, JSON
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from contextlib import asynccontextmanager
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import logging
 from datetime import datetime, timedelta
 
 from ..models.trend_model import Base, TrendingLook, TrendingFilters
 from ..config import get_config
 
+# Processed-content keys that map onto differently named columns
+LOOK_COLUMN_ALIASES = {
+    'author': 'source_author',
+    'enhanced_summary': 'summary',
+    'final_trend_score': 'trend_score',
+    'enhanced_by': 'label_source'
+}
+LOOK_COLUMNS = {column.name for column in TrendingLook.__table__.columns}
+UPSERT_IMMUTABLE_COLUMNS = {'id', 'source_url', 'crawled_at'}
+MAX_BIND_PARAMS = 32767  # PostgreSQL wire-protocol limit per statement
+# SQL for TrendingLook's client-side defaults, which COPY bypasses: filled in
+# by the staging INSERT ... SELECT for columns the rows leave out
+COPY_COLUMN_DEFAULTS = {
+    'image_quality_score': '0.0',
+    'additional_images': "'[]'::json",
+    'tags': "'[]'::jsonb",
+    'trend_score': '0.0',
+    'engagement_score': '0.0',
+    'crawled_at': 'now()',
+    'updated_at': 'now()',
+    'is_active': 'true',
+    'is_featured': 'false'
+}
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+FEED_SORT_COLUMNS = ('trend_score', 'crawled_at', 'engagement_score')
+SEARCH_SORT = 'relevance'
+SEARCH_LANGUAGE = 'english'  # text search config the search_vector trigger uses (migrations/0003)
+
+def migration_statements(sql: str) -> List[str]:
+    """Split a migration file on ';', keeping $$-quoted function bodies whole and dropping comments"""
+    # Comments go first: a ';' inside one must not end a statement
+    sql = '\n'.join(line for line in sql.splitlines() if not line.strip().startswith('--'))
+    statements = []
+    pending = ''
+    for part in sql.split(';'):
+        pending += part
+        if pending.count('$$') % 2:
+            pending += ';'  # inside a function body
+            continue
+        if pending.strip():
+            statements.append(pending.strip())
+        pending = ''
+    return statements
+
+def encode_cursor(sort_by: str, value: Any, look_id: int) -> str:
+    """Opaque token for the keyset position just after (value, id) in a sort_by ordering"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({'s': sort_by, 'v': value, 'id': look_id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    """(value, id) from a cursor, ValueError if it is malformed or from another ordering"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if payload['s'] != sort_by:
+            raise ValueError(f"cursor is for sort_by={payload['s']}")
+        value = payload['v']
+        if sort_by == 'crawled_at':
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, (int, float)):
+            raise ValueError("non-numeric cursor value")
+        return value, int(payload['id'])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
 class TrendingLookDatabase:
     """Database manager for trending fashion looks"""
     
@@ -41,6 +111,31 @@ class TrendingLookDatabase:
         """Create database tables"""
         Base.metadata.create_all(bind=self.engine)
         self.logger.info("Database tables created successfully")
+        self.run_migrations()
+    
+    def run_migrations(self):
+        """Apply pending SQL files from database/migrations in version order"""
+        # Autocommit: CREATE INDEX CONCURRENTLY can't run inside a transaction
+        with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.execute(text(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                "version VARCHAR(100) PRIMARY KEY, applied_at TIMESTAMP DEFAULT now())"
+            ))
+            applied = set(connection.execute(text("SELECT version FROM schema_migrations")).scalars())
+            
+            for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+                version, extension = os.path.splitext(filename)
+                if extension != '.sql' or version in applied:
+                    continue
+                
+                with open(os.path.join(MIGRATIONS_DIR, filename), 'r', encoding='utf-8') as f:
+                    sql = f.read()
+                # Statements are idempotent (IF NOT EXISTS), so a failed run can simply be retried
+                for statement in migration_statements(sql):
+                    connection.execute(text(statement))
+                
+                connection.execute(text("INSERT INTO schema_migrations (version) VALUES (:version)"), {'version': version})
+                self.logger.info(f"Applied migration {version}")
     
     @asynccontextmanager
     async def get_async_session(self):
@@ -55,6 +150,15 @@ class TrendingLookDatabase:
             finally:
                 await session.close()
     
+    def look_row(self, look_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for a processed look, dropping keys that aren't columns"""
+        row = {}
+        for key, value in look_data.items():
+            column = LOOK_COLUMN_ALIASES.get(key, key)
+            if column in LOOK_COLUMNS and column != 'id' and (column not in row or key == column):
+                row[column] = value
+        return row
+    
     async def save_trending_look(self, look_data: Dict[str, Any]) -> Optional[int]:
         """Save a trending look to database"""
         try:
@@ -77,7 +181,7 @@ class TrendingLookDatabase:
                     return existing_look.id
                 else:
                     # Create new look
-                    new_look = TrendingLook(**look_data)
+                    new_look = TrendingLook(**self.look_row(look_data))
                     session.add(new_look)
                     await session.flush()
                     
@@ -90,99 +194,440 @@ class TrendingLookDatabase:
             self.logger.error(f"Error saving trending look: {e}")
             return None
     
+    async def save_trending_looks_bulk(self, looks: List[Dict[str, Any]],
+                                       use_copy: Optional[bool] = None) -> Dict[str, List[int]]:
+        """Upsert many looks on source_url in one round trip per chunk
+        
+        Returns {'inserted': [...ids], 'updated': [...ids], 'urls': [...saved source_urls]}. Large backfills
+        (or use_copy=True) COPY into a staging table and upsert from there.
+        """
+        result = {'inserted': [], 'updated': [], 'urls': []}
+        
+        # ON CONFLICT can't touch one row twice per statement: keep the last copy of each URL
+        rows_by_url = {}
+        for look_data in looks:
+            row = self.look_row(look_data)
+            if row.get('source_url'):
+                rows_by_url[row['source_url']] = row
+        if not rows_by_url:
+            return result
+        
+        if use_copy is None:
+            use_copy = len(rows_by_url) >= self.config.DATABASE_CONFIG['bulk_copy_threshold']
+        
+        # Multi-row VALUES need the same columns in every row, so group by column set
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in rows_by_url.values():
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        
+        try:
+            async with self.get_async_session() as session:
+                for columns, rows in groups.items():
+                    returned = await self.upsert_rows(session, list(columns), rows, use_copy)
+                    for look_id, inserted, source_url in returned:
+                        result['inserted' if inserted else 'updated'].append(look_id)
+                        result['urls'].append(source_url)
+            
+            self.logger.info(
+                f"Bulk saved {len(result['urls'])} of {len(rows_by_url)} looks: "
+                f"{len(result['inserted'])} new, {len(result['updated'])} updated"
+            )
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Error bulk saving trending looks: {e}")
+            return {'inserted': [], 'updated': [], 'urls': []}
+    
+    async def upsert_rows(self, session, columns: List[str], rows: List[Dict[str, Any]],
+                          use_copy: bool) -> List[tuple]:
+        """Upsert rows in a savepoint; on failure halve them and retry, so only the bad rows are lost"""
+        try:
+            async with session.begin_nested():
+                if use_copy:
+                    return await self.copy_upsert(session, columns, rows)
+                return await self.values_upsert(session, columns, rows)
+        except Exception as e:
+            if len(rows) == 1:
+                self.logger.error(f"Error saving look {rows[0].get('source_url')}: {e}")
+                return []
+        
+        middle = len(rows) // 2
+        return (
+            await self.upsert_rows(session, columns, rows[:middle], use_copy)
+            + await self.upsert_rows(session, columns, rows[middle:], use_copy)
+        )
+    
+    def upsert_assignments(self, columns: List[str], excluded) -> Dict[str, Any]:
+        """SET clause for ON CONFLICT DO UPDATE: refresh everything but identity columns"""
+        assignments = {
+            column: excluded[column] for column in columns
+            if column not in UPSERT_IMMUTABLE_COLUMNS
+        }
+        assignments['updated_at'] = func.now()
+        return assignments
+    
+    async def values_upsert(self, session, columns: List[str], rows: List[Dict[str, Any]]) -> List[tuple]:
+        """INSERT ... VALUES (...), (...) ON CONFLICT (source_url) DO UPDATE, chunked under the bind limit"""
+        returned = []
+        chunk_size = max(1, MAX_BIND_PARAMS // len(columns))
+        for start in range(0, len(rows), chunk_size):
+            statement = pg_insert(TrendingLook).values(rows[start:start + chunk_size])
+            statement = statement.on_conflict_do_update(
+                index_elements=[TrendingLook.source_url],
+                set_=self.upsert_assignments(columns, statement.excluded)
+            ).returning(TrendingLook.id, literal_column('(xmax = 0)'), TrendingLook.source_url)
+            # xmax is 0 only for rows this statement inserted
+            returned.extend((await session.execute(statement)).all())
+        return returned
+    
+    async def copy_upsert(self, session, columns: List[str], rows: List[Dict[str, Any]]) -> List[tuple]:
+        """COPY rows into a temporary staging table, then upsert them with one INSERT ... SELECT"""
+        connection = await session.connection()
+        raw_connection = (await connection.get_raw_connection()).driver_connection
+        table = TrendingLook.__table__
+        json_columns = {column.name for column in table.columns if isinstance(column.type, JSON)}
+        
+        column_list = ', '.join(columns)
+        
+        # Unconstrained staging copy of just these columns, gone at commit
+        await raw_connection.execute("DROP TABLE IF EXISTS trending_looks_staging")
+        await raw_connection.execute(
+            f"CREATE TEMP TABLE trending_looks_staging ON COMMIT DROP AS "
+            f"SELECT {column_list} FROM {table.name} WITH NO DATA"
+        )
+        await raw_connection.copy_records_to_table(
+            'trending_looks_staging',
+            columns=columns,
+            records=[
+                tuple(json.dumps(row[column]) if column in json_columns else row[column] for column in columns)
+                for row in rows
+            ]
+        )
+        
+        # New rows get the model defaults the VALUES path would have applied
+        defaults = {column: sql for column, sql in COPY_COLUMN_DEFAULTS.items() if column not in columns}
+        insert_list = ', '.join([*columns, *defaults])
+        select_list = ', '.join([*columns, *defaults.values()])
+        
+        updates = ', '.join(
+            [f"{column} = EXCLUDED.{column}" for column in columns if column not in UPSERT_IMMUTABLE_COLUMNS]
+            + ["updated_at = now()"]
+        )
+        records = await raw_connection.fetch(
+            f"INSERT INTO {table.name} ({insert_list}) "
+            f"SELECT {select_list} FROM trending_looks_staging "
+            f"ON CONFLICT (source_url) DO UPDATE SET {updates} "
+            f"RETURNING id, (xmax = 0) AS inserted, source_url"
+        )
+        return [(record['id'], record['inserted'], record['source_url']) for record in records]
+    
+    def trending_looks_query(self, filters: TrendingFilters):
+        """SELECT (look, effective trend score) for a feed request
+        
+        Ordered by (sort column, id) so a cursor from the previous page can
+        seek straight to the next one; raises ValueError for a bad cursor.
+        """
+        trend_score = self.effective_trend_score()
+        query = select(TrendingLook, trend_score).where(TrendingLook.is_active == True)
+        
+        # Apply filters
+        if filters.category:
+            query = query.where(TrendingLook.category == filters.category)
+        
+        if filters.season:
+            query = query.where(TrendingLook.season == filters.season)
+        
+        if filters.source_site:
+            query = query.where(TrendingLook.source_site == filters.source_site)
+        
+        if filters.tags:
+            # Check if any of the tags match
+            tag_conditions = [TrendingLook.tags.contains([tag]) for tag in filters.tags]
+            query = query.where(or_(*tag_conditions))
+        
+        if filters.min_trend_score:
+            query = query.where(trend_score >= filters.min_trend_score)
+            if self.config.TREND_DECAY_CONFIG['mode'] == 'lazy':
+                # Decay only lowers scores, so the stored score bounds the index range
+                query = query.where(TrendingLook.trend_score >= filters.min_trend_score)
+        
+        # Apply sorting; id breaks ties so every row has a unique position
+        sort_by = filters.sort_by if filters.sort_by in FEED_SORT_COLUMNS else 'trend_score'
+        if sort_by == 'crawled_at':
+            order_col = TrendingLook.crawled_at
+        elif sort_by == 'engagement_score':
+            order_col = TrendingLook.engagement_score
+        else:
+            order_col = trend_score
+        descending = filters.sort_order == 'desc'
+        
+        if descending:
+            query = query.order_by(desc(order_col), desc(TrendingLook.id))
+        else:
+            query = query.order_by(order_col, TrendingLook.id)
+        
+        # Apply pagination: seek past the cursor row (an index range scan) rather than OFFSET
+        if filters.cursor:
+            value, look_id = decode_cursor(filters.cursor, sort_by)
+            position = tuple_(order_col, TrendingLook.id)
+            query = query.where(position < tuple_(value, look_id) if descending else position > tuple_(value, look_id))
+        elif filters.offset:
+            query = query.offset(filters.offset)
+        return query.limit(filters.limit)
+    
+    def next_cursor(self, filters: TrendingFilters, looks: List[TrendingLook]) -> Optional[str]:
+        """Cursor for the page after `looks`, or None if this was the last page"""
+        if not looks or len(looks) < filters.limit:
+            return None
+        sort_by = filters.sort_by if filters.sort_by in FEED_SORT_COLUMNS + (SEARCH_SORT,) else 'trend_score'
+        last = looks[-1]
+        return encode_cursor(sort_by, getattr(last, sort_by), last.id)
+    
     async def get_trending_looks(self, filters: TrendingFilters) -> List[TrendingLook]:
-        """Get trending looks with filters"""
+        """Get trending looks with filters (ValueError for an invalid cursor)"""
+        query = self.trending_looks_query(filters)
         try:
             async with self.get_async_session() as session:
-                query = session.query(TrendingLook).filter(TrendingLook.is_active == True)
-                
-                # Apply filters
-                if filters.category:
-                    query = query.filter(TrendingLook.category == filters.category)
-                
-                if filters.season:
-                    query = query.filter(TrendingLook.season == filters.season)
-                
-                if filters.tags:
-                    # Check if any of the tags match
-                    tag_conditions = [TrendingLook.tags.contains([tag]) for tag in filters.tags]
-                    query = query.filter(or_(*tag_conditions))
-                
-                if filters.min_trend_score:
-                    query = query.filter(TrendingLook.trend_score >= filters.min_trend_score)
-                
-                # Apply sorting
-                if filters.sort_by == 'trend_score':
-                    order_col = TrendingLook.trend_score
-                elif filters.sort_by == 'crawled_at':
-                    order_col = TrendingLook.crawled_at
-                elif filters.sort_by == 'engagement_score':
-                    order_col = TrendingLook.engagement_score
-                else:
-                    order_col = TrendingLook.trend_score
-                
-                if filters.sort_order == 'desc':
-                    query = query.order_by(desc(order_col))
-                else:
-                    query = query.order_by(order_col)
-                
-                # Apply pagination
-                query = query.offset(filters.offset).limit(filters.limit)
-                
                 results = await session.execute(query)
-                return results.scalars().all()
+                return self.with_trend_scores(session, results.all())
                 
         except Exception as e:
             self.logger.error(f"Error getting trending looks: {e}")
             return []
     
+    def search_looks_query(self, text_query: str, filters: TrendingFilters):
+        """SELECT (look, effective trend score, relevance) for a full-text search, best match first
+        
+        One GIN-indexed match on search_vector, ranked by ts_rank_cd over the
+        weighted vector, keyset-paginated on (relevance, id).
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_LANGUAGE, text_query)
+        relevance = func.ts_rank_cd(TrendingLook.search_vector, ts_query)
+        trend_score = self.effective_trend_score()
+        
+        query = select(TrendingLook, trend_score, relevance).where(and_(
+            TrendingLook.is_active == True,
+            TrendingLook.search_vector.bool_op('@@')(ts_query)
+        ))
+        
+        if filters.category:
+            query = query.where(TrendingLook.category == filters.category)
+        
+        if filters.cursor:
+            value, look_id = decode_cursor(filters.cursor, SEARCH_SORT)
+            query = query.where(tuple_(relevance, TrendingLook.id) < tuple_(value, look_id))
+        
+        return query.order_by(desc(relevance), desc(TrendingLook.id)).limit(filters.limit)
+    
+    async def search_trending_looks(self, text_query: str, filters: TrendingFilters) -> List[TrendingLook]:
+        """Full-text search over active looks (ValueError for an invalid cursor)"""
+        query = self.search_looks_query(text_query, filters)
+        try:
+            async with self.get_async_session() as session:
+                results = await session.execute(query)
+                rows = results.all()
+                looks = self.with_trend_scores(session, [(look, trend_score) for look, trend_score, _ in rows])
+                for look, (_, _, relevance) in zip(looks, rows):
+                    look.relevance = relevance  # read by next_cursor
+                return looks
+                
+        except Exception as e:
+            self.logger.error(f"Error searching trending looks: {e}")
+            return []
+    
+    def featured_looks_query(self, limit: int = 25):
+        """SELECT (look, effective trend score) for the home page sliders"""
+        trend_score = self.effective_trend_score()
+        conditions = [TrendingLook.is_active == True, TrendingLook.is_featured == True]
+        if self.config.TREND_DECAY_CONFIG['mode'] == 'lazy':
+            # Demotion happens at read time when no job rewrites is_featured;
+            # decay only lowers scores, so the stored score bounds the index range
+            featured_min_score = self.config.TREND_DECAY_CONFIG['featured_min_score']
+            conditions.append(trend_score >= featured_min_score)
+            conditions.append(TrendingLook.trend_score >= featured_min_score)
+        
+        return (
+            select(TrendingLook, trend_score)
+            .where(and_(*conditions))
+            .order_by(desc(trend_score))
+            .limit(limit)
+        )
+    
     async def get_featured_looks(self, limit: int = 25) -> List[TrendingLook]:
         """Get featured looks for home page sliders"""
         try:
             async with self.get_async_session() as session:
-                query = (
-                    session.query(TrendingLook)
-                    .filter(and_(
-                        TrendingLook.is_active == True,
-                        TrendingLook.is_featured == True
-                    ))
-                    .order_by(desc(TrendingLook.trend_score))
-                    .limit(limit)
-                )
-                
-                results = await session.execute(query)
-                return results.scalars().all()
+                results = await session.execute(self.featured_looks_query(limit))
+                return self.with_trend_scores(session, results.all())
                 
         except Exception as e:
             self.logger.error(f"Error getting featured looks: {e}")
             return []
     
+    def with_trend_scores(self, session, rows) -> List[TrendingLook]:
+        """Detach loaded looks and give them their effective (possibly decayed) trend score"""
+        session.expunge_all()  # so the display score is never flushed back
+        looks = []
+        for look, trend_score in rows:
+            look.trend_score = trend_score
+            looks.append(look)
+        return looks
+    
+    def age_factor(self):
+        """SQL expression for a look's age decay factor (2% per whole day, floored at 0.1)"""
+        decay = self.config.TREND_DECAY_CONFIG
+        days_old = func.floor(func.extract('epoch', func.localtimestamp() - TrendingLook.crawled_at) / 86400)
+        return func.greatest(decay['min_factor'], 1.0 - days_old * decay['daily_rate'])
+    
+    def effective_trend_score(self):
+        """Trend score as shown to readers: stored as-is, or decayed on read in lazy mode"""
+        if self.config.TREND_DECAY_CONFIG['mode'] == 'lazy':
+            return TrendingLook.trend_score * self.age_factor()
+        return TrendingLook.trend_score
+    
     async def update_trend_scores(self):
         """Recalculate trend scores based on age and engagement"""
+        decay = self.config.TREND_DECAY_CONFIG
+        if decay['mode'] == 'lazy':
+            self.logger.info("Trend scores decay at read time; nothing to update")
+            return
+        
+        # One server-side UPDATE: decay the score and demote weak featured looks together
+        decayed = TrendingLook.trend_score * self.age_factor()
+        statement = update(TrendingLook).values(
+            trend_score=decayed,
+            is_featured=case((decayed < decay['featured_min_score'], False), else_=TrendingLook.is_featured)
+        )
+        
+        try:
+            if not decay['batch_size']:
+                async with self.get_async_session() as session:
+                    result = await session.execute(
+                        statement.where(TrendingLook.is_active == True),
+                        execution_options={'synchronize_session': False}
+                    )
+                updated = result.rowcount
+            else:
+                # Keyset batches by id keep each transaction short on huge tables
+                updated = 0
+                last_id = 0
+                while True:
+                    batch_ids = (
+                        select(TrendingLook.id)
+                        .where(and_(TrendingLook.is_active == True, TrendingLook.id > last_id))
+                        .order_by(TrendingLook.id)
+                        .limit(decay['batch_size'])
+                    )
+                    async with self.get_async_session() as session:
+                        result = await session.execute(
+                            statement.where(TrendingLook.id.in_(batch_ids)).returning(TrendingLook.id),
+                            execution_options={'synchronize_session': False}
+                        )
+                        ids = result.scalars().all()
+                    if not ids:
+                        break
+                    updated += len(ids)
+                    last_id = max(ids)
+            
+            self.logger.info(f"Updated trend scores for {updated} looks")
+                
+        except Exception as e:
+            self.logger.error(f"Error updating trend scores: {e}")
+    
+    async def get_crawled_urls(self, source_site: str) -> Dict[str, datetime]:
+        """Get already-stored source URLs for a site with their last crawl time"""
         try:
             async with self.get_async_session() as session:
-                # Get all active looks
-                looks = await session.execute(
-                    select(TrendingLook).where(TrendingLook.is_active == True)
+                rows = await session.execute(
+                    select(TrendingLook.source_url, TrendingLook.updated_at, TrendingLook.crawled_at)
+                    .where(TrendingLook.source_site == source_site)
                 )
+                return {url: updated_at or crawled_at for url, updated_at, crawled_at in rows}
                 
-                for look in looks.scalars():
-                    # Age decay factor
-                    days_old = (datetime.now() - look.crawled_at).days
-                    age_factor = max(0.1, 1.0 - (days_old * 0.02))  # 2% decay per day
-                    
-                    # Update trend score
-                    look.trend_score = look.trend_score * age_factor
-                    
-                    # Mark as not featured if score too low
-                    if look.trend_score < 0.3:
-                        look.is_featured = False
+        except Exception as e:
+            self.logger.error(f"Error getting crawled URLs: {e}")
+            return {}
+    
+    async def get_content_signatures(self) -> List[Tuple[str, List[int]]]:
+        """Get (source_url, content_minhash) for every look with a stored signature"""
+        try:
+            async with self.get_async_session() as session:
+                rows = await session.execute(
+                    select(TrendingLook.source_url, TrendingLook.content_minhash)
+                    .where(TrendingLook.content_minhash.isnot(None))
+                )
+                return [(url, signature) for url, signature in rows]
+                
+        except Exception as e:
+            self.logger.error(f"Error getting content signatures: {e}")
+            return []
+    
+    async def get_image_hashes(self) -> List[Tuple[str, str]]:
+        """Get (source_url, image_phash) for every look with a hashed primary image"""
+        try:
+            async with self.get_async_session() as session:
+                rows = await session.execute(
+                    select(TrendingLook.source_url, TrendingLook.image_phash)
+                    .where(TrendingLook.image_phash.isnot(None))
+                )
+                return [(url, image_phash) for url, image_phash in rows]
+                
+        except Exception as e:
+            self.logger.error(f"Error getting image hashes: {e}")
+            return []
+    
+    async def merge_duplicate_look(self, source_url: str, duplicate: Dict[str, Any]) -> Optional[int]:
+        """Fold a near-duplicate article's tags and images into the stored look"""
+        try:
+            async with self.get_async_session() as session:
+                result = await session.execute(
+                    select(TrendingLook).where(TrendingLook.source_url == source_url)
+                )
+                look = result.scalar_one_or_none()
+                if not look:
+                    return None
+                
+                tags = list(look.tags or [])
+                tags += [tag for tag in duplicate.get('tags') or [] if tag not in tags]
+                images = list(look.additional_images or [])
+                images += [
+                    image for image in [duplicate.get('primary_image_url')] + (duplicate.get('additional_images') or [])
+                    if image and image != look.primary_image_url and image not in images
+                ]
+                look.tags = tags
+                look.additional_images = images
+                look.updated_at = datetime.now()
                 
                 await session.commit()
-                self.logger.info("Updated trend scores for all looks")
+                self.logger.info(f"Merged near-duplicate {duplicate.get('source_url')} into look {look.id}")
+                return look.id
                 
         except Exception as e:
-            self.logger.error(f"Error updating trend scores: {e}")
+            self.logger.error(f"Error merging near-duplicate look: {e}")
+            return None
+    
+    async def get_training_looks(self, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Get recent looks labelled by the LLM for training the local classifier"""
+        try:
+            async with self.get_async_session() as session:
+                rows = await session.execute(
+                    select(
+                        TrendingLook.title, TrendingLook.description, TrendingLook.tags,
+                        TrendingLook.style_category, TrendingLook.season, TrendingLook.trend_strength
+                    )
+                    .where(and_(
+                        TrendingLook.label_source == 'llm',  # not the local model's own or fallback labels
+                        TrendingLook.style_category.isnot(None),
+                        TrendingLook.season.isnot(None)
+                    ))
+                    .order_by(desc(TrendingLook.crawled_at))
+                    .limit(limit)
+                )
+                return [dict(row._mapping) for row in rows]
+                
+        except Exception as e:
+            self.logger.error(f"Error getting training looks: {e}")
+            return []
     
     async def get_crawler_stats(self) -> Dict[str, Any]:
         """Get crawler statistics"""
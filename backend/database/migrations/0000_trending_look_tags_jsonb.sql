@@ -0,0 +1,18 @@
+-- tags filters use JSON containment (@>), which needs jsonb for GIN (0001).
+--
+-- Changing the column type rewrites the whole table under an ACCESS EXCLUSIVE
+-- lock: every read and crawler write on trending_looks waits until it's done.
+-- It is kept apart from the CONCURRENTLY index builds so it can be run (or
+-- this version recorded in schema_migrations after running it by hand) in a
+-- maintenance window. Tables created from the current model already have a
+-- jsonb column, and then nothing is rewritten.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'trending_looks' AND column_name = 'tags' AND data_type = 'json'
+    ) THEN
+        ALTER TABLE trending_looks ALTER COLUMN tags TYPE jsonb USING tags::jsonb;
+    END IF;
+END
+$$;
@@ -0,0 +1,32 @@
+-- Indexes for the trending feed query shapes (get_trending_looks, featured, by-source)
+-- Every feed query filters is_active = true, so the indexes are partial on it.
+-- Built CONCURRENTLY so a live table keeps serving reads and crawler writes
+-- (the tags column is converted to jsonb beforehand, by 0000).
+
+-- Default feed order and min_trend_score filter; id breaks ties for stable paging
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_active_trend_score
+    ON trending_looks (trend_score DESC, id DESC) WHERE is_active;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_active_crawled_at
+    ON trending_looks (crawled_at DESC, id DESC) WHERE is_active;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_active_engagement_score
+    ON trending_looks (engagement_score DESC, id DESC) WHERE is_active;
+
+-- Category / season / source pages, ordered by trend score
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_category_trend_score
+    ON trending_looks (category, trend_score DESC, id DESC) WHERE is_active;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_season_trend_score
+    ON trending_looks (season, trend_score DESC, id DESC) WHERE is_active;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_source_trend_score
+    ON trending_looks (source_site, trend_score DESC, id DESC) WHERE is_active;
+
+-- Home page sliders
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_featured_trend_score
+    ON trending_looks (trend_score DESC) WHERE is_active AND is_featured;
+
+-- tags @> '["tag"]'; jsonb_path_ops is smaller and faster for containment-only lookups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_tags
+    ON trending_looks USING gin (tags jsonb_path_ops) WHERE is_active;
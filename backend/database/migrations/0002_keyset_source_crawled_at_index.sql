@@ -0,0 +1,3 @@
+-- Keyset pages of /trends/by-source/{source_site}?sort_by=crawled_at
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_source_crawled_at
+    ON trending_looks (source_site, crawled_at DESC, id DESC) WHERE is_active;
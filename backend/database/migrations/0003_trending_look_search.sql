@@ -0,0 +1,29 @@
+-- Full-text search for /trends/search
+-- search_vector weights: title and tags A, summary B, description C.
+-- Maintained by a trigger rather than a generated column: generated columns are
+-- recomputed on every UPDATE, and the hourly trend-score decay updates every row.
+
+ALTER TABLE trending_looks ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION trending_looks_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+        setweight(jsonb_to_tsvector('english', coalesce(NEW.tags, '[]'::jsonb), '["string"]'), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trending_looks_search_vector_update ON trending_looks;
+
+CREATE TRIGGER trending_looks_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, tags, summary, description ON trending_looks
+    FOR EACH ROW EXECUTE FUNCTION trending_looks_search_vector();
+
+-- Backfill existing rows (fires the trigger)
+UPDATE trending_looks SET title = title WHERE search_vector IS NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trending_looks_search_vector
+    ON trending_looks USING gin (search_vector) WHERE is_active;
@@ -0,0 +1,6 @@
+-- Columns added to TrendingLook after trending_looks was first created:
+-- create_all only creates missing tables, so existing databases get them here.
+-- Nullable without defaults, so each ADD COLUMN is a catalog-only change.
+ALTER TABLE trending_looks ADD COLUMN IF NOT EXISTS style_category VARCHAR(50);
+ALTER TABLE trending_looks ADD COLUMN IF NOT EXISTS content_minhash JSON;
+ALTER TABLE trending_looks ADD COLUMN IF NOT EXISTS image_phash VARCHAR(16);
@@ -0,0 +1,5 @@
+-- The LLM's trend_strength, kept apart from the composite (and decayed)
+-- trend_score so the local classifier learns the label the LLM gave.
+-- Looks saved before this column existed stay NULL and are not used as
+-- trend-strength examples.
+ALTER TABLE trending_looks ADD COLUMN IF NOT EXISTS trend_strength DOUBLE PRECISION;
@@ -0,0 +1,6 @@
+-- Where a look's style_category/season/trend_strength came from: 'llm',
+-- 'local' (the pre-screen classifier) or 'fallback' (placeholders for a
+-- malformed reply). The local classifier trains on 'llm' rows only, so it
+-- never learns from its own predictions. Looks saved before this column
+-- existed stay NULL and are not used for training.
+ALTER TABLE trending_looks ADD COLUMN IF NOT EXISTS label_source VARCHAR(20);
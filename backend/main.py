@@ -65,8 +65,9 @@ def schedule_crawls():
     # Schedule quick trends crawl every 4 hours
     schedule.every(4).hours.do(lambda: asyncio.run(run_quick_crawl()))
     
-    # Schedule trend score updates every hour
-    schedule.every().hour.do(lambda: asyncio.run(db_manager.update_trend_scores()))
+    # Schedule trend score updates every hour (lazy decay is applied at read time instead)
+    if config.TREND_DECAY_CONFIG['mode'] == 'stored':
+        schedule.every().hour.do(lambda: asyncio.run(db_manager.update_trend_scores()))
     
     logger.info("Crawl schedules configured")
 
@@ -1,7 +1,9 @@
 # Looklyy Trending Content Database Models
 
 from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float, Boolean
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 from typing import Optional, List, Dict
@@ -32,18 +34,24 @@ class TrendingLook(Base):
     image_width = Column(Integer)
     image_height = Column(Integer)
     image_quality_score = Column(Float, default=0.0)
+    image_phash = Column(String(16))  # dHash of the primary image, hex
     
     # Additional Images (JSON array of URLs)
     additional_images = Column(JSON, default=list)
     
     # Categorization
     category = Column(String(50), nullable=False)  # 'runway_fashion', 'celebrity_style', etc.
-    tags = Column(JSON, default=list)  # ['fall2025', 'minimalist', 'sustainable']
+    tags = Column(JSONB, default=list)  # ['fall2025', 'minimalist', 'sustainable']
     season = Column(String(20))  # 'fall2025', 'spring2025', etc.
+    style_category = Column(String(50))  # LLM style category: 'minimalist', 'bohemian', etc.
+    content_minhash = Column(JSON)  # MinHash signature of cleaned text for near-duplicate detection
+    search_vector = deferred(Column(TSVECTOR))  # weighted title/tags/summary/description, kept by a DB trigger
     
     # Trend Metrics
     trend_score = Column(Float, default=0.0)  # Algorithm-calculated trending score
     engagement_score = Column(Float, default=0.0)  # Social engagement if available
+    trend_strength = Column(Float)  # LLM trend strength (0-1) as returned, the local classifier's training label
+    label_source = Column(String(20))  # who labelled style/season/strength: 'llm', 'local' or 'fallback'
     
     # Timestamps
     published_date = Column(DateTime)
@@ -101,8 +109,10 @@ class TrendingFilters(BaseModel):
     category: Optional[str] = None
     season: Optional[str] = None
     tags: Optional[List[str]] = None
+    source_site: Optional[str] = None
     min_trend_score: Optional[float] = 0.0
     limit: Optional[int] = 50
     offset: Optional[int] = 0
-    sort_by: Optional[str] = 'trend_score'  # 'trend_score', 'crawled_at', 'engagement_score'
+    cursor: Optional[str] = None  # opaque keyset cursor from the previous page; replaces offset
+    sort_by: Optional[str] = 'trend_score'  # 'trend_score', 'crawled_at', 'engagement_score' ('relevance' for search)
     sort_order: Optional[str] = 'desc'  # 'asc', 'desc'
@@ -1,19 +1,58 @@
 # Content Processing Layer with LLM Integration
 
+import asyncio
 import openai
 import json
 import re
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
-from ..models.trend_model import CrawledContent
+from ..crawlers.base_crawler import CrawledContent
+from ..config import get_config
+from .llm_cache import LLMResultCache
+from .llm_limiter import LLMRateLimiter, estimate_tokens, with_backoff
+from .keyword_engine import get_keyword_engine
+from .local_classifier import LocalTrendClassifier, LocalChatCompletion
+from .text_cleaner import clean_text, clean_many
+
+SYSTEM_PROMPT = "You are a fashion expert and trend analyst. Analyze fashion content and provide structured insights."
+
+ENHANCEMENT_FIELDS = (
+    'enhanced_summary', 'trend_keywords', 'style_category',
+    'season_relevance', 'target_audience', 'trend_strength'
+)
 
 class FashionContentProcessor:
     """Process and enhance crawled fashion content using LLM"""
     
-    def __init__(self, openai_api_key: str):
+    def __init__(self, openai_api_key: str, llm_client: Any = None):
         self.logger = logging.getLogger("content_processor")
         openai.api_key = openai_api_key
+        config = get_config()
+        self.llm_config = config.LLM_CONFIG
+        self.local_model_config = config.LOCAL_MODEL_CONFIG
+        self.ethical_rules = config.ETHICAL_RULES
+        self.rate_limiter = None
+        self.rate_limiter_loop = None
+        self.keywords = get_keyword_engine()
+        self.local_model = LocalTrendClassifier(
+            min_training_rows=self.local_model_config['min_training_rows'],
+            min_confidence=self.local_model_config['min_confidence'],
+            duplicate_similarity=self.local_model_config['duplicate_similarity']
+        )
+        
+        # Anything with an async acreate(...) works, e.g. LocalChatCompletion for offline runs
+        if llm_client is None:
+            llm_client = (
+                LocalChatCompletion(self.local_model)
+                if self.llm_config['client'] == 'local' else openai.ChatCompletion
+            )
+        self.llm_client = llm_client
+        self.llm_cache = LLMResultCache(
+            self.llm_config['cache_path'],
+            max_entries=self.llm_config['cache_max_entries'],
+            ttl=self.llm_config['cache_ttl']
+        )
         
     async def process_content(self, crawled_content: CrawledContent) -> Dict[str, Any]:
         """Process and enhance crawled content"""
@@ -24,28 +63,58 @@ class FashionContentProcessor:
             # Generate LLM enhancements
             enhanced_content = await self.enhance_with_llm(cleaned_content)
             
-            # Extract fashion insights
-            fashion_insights = self.extract_fashion_insights(enhanced_content)
-            
-            # Calculate final trend score
-            final_score = self.calculate_enhanced_trend_score(enhanced_content, fashion_insights)
-            
-            return {
-                **enhanced_content,
-                'fashion_insights': fashion_insights,
-                'final_trend_score': final_score,
-                'processed_at': datetime.now().isoformat()
-            }
+            return self.finalize_content(enhanced_content)
             
         except Exception as e:
             self.logger.error(f"Error processing content: {e}")
             return crawled_content.__dict__
     
-    def clean_content(self, content: CrawledContent) -> Dict[str, Any]:
-        """Clean and normalize raw content"""
+    async def process_batch(self, crawled_contents: List[CrawledContent]) -> List[Dict[str, Any]]:
+        """Process several crawled items, sharing LLM requests between them"""
+        try:
+            cleaned_contents = self.clean_batch(crawled_contents)
+            enhanced_contents = await self.enhance_batch_with_llm(cleaned_contents)
+            return [self.finalize_content(enhanced) for enhanced in enhanced_contents]
+            
+        except Exception as e:
+            self.logger.error(f"Error processing batch: {e}")
+            return [await self.process_content(content) for content in crawled_contents]
+    
+    def clean_batch(self, crawled_contents: List[CrawledContent]) -> List[Dict[str, Any]]:
+        """Clean several items, running the text cleaner once over all titles and descriptions"""
+        texts = self.clean_many([
+            text for content in crawled_contents
+            for text in (content.title, content.description)
+        ])
+        return [
+            self.clean_content(content, texts[2 * i:2 * i + 2])
+            for i, content in enumerate(crawled_contents)
+        ]
+    
+    def finalize_content(self, enhanced_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Add fashion insights and the final trend score to enhanced content"""
+        # Extract fashion insights
+        fashion_insights = self.extract_fashion_insights(enhanced_content)
+        
+        # Calculate final trend score
+        final_score = self.calculate_enhanced_trend_score(enhanced_content, fashion_insights)
+        
+        return {
+            **enhanced_content,
+            # Stored for local model training; free-form replies would overflow season's String(20)
+            'season': self.keywords.season_label(enhanced_content.get('season_relevance')),
+            'fashion_insights': fashion_insights,
+            'final_trend_score': final_score,
+            'processed_at': datetime.now().isoformat()
+        }
+    
+    def clean_content(self, content: CrawledContent,
+                      cleaned_text: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Clean and normalize raw content (title and description may come pre-cleaned from clean_many)"""
         # Remove ads, navigation, and irrelevant content
-        cleaned_title = self.clean_text(content.title)
-        cleaned_description = self.clean_text(content.description)
+        if cleaned_text is None:
+            cleaned_text = [self.clean_text(content.title), self.clean_text(content.description)]
+        cleaned_title, cleaned_description = cleaned_text
         
         # Normalize tags
         normalized_tags = [self.normalize_tag(tag) for tag in content.tags]
@@ -67,28 +136,11 @@ class FashionContentProcessor:
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text content"""
-        if not text:
-            return ""
-        
-        # Remove unwanted patterns
-        patterns_to_remove = [
-            r'\bAdvertisement\b',
-            r'\bSponsor.*?\b',
-            r'\bRead More\b',
-            r'\bSubscribe\b',
-            r'\bSign Up\b',
-            r'Photo:.*?Getty Images',
-            r'Image:.*?Courtesy',
-        ]
-        
-        cleaned = text
-        for pattern in patterns_to_remove:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
-        
-        # Normalize whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        return cleaned
+        return clean_text(text)
+    
+    def clean_many(self, texts: List[str]) -> List[str]:
+        """Clean a whole batch of texts (see text_cleaner.clean_many)"""
+        return clean_many(texts)
     
     def normalize_tag(self, tag: str) -> str:
         """Normalize tag format"""
@@ -105,22 +157,34 @@ class FashionContentProcessor:
         """Use LLM to enhance and categorize content"""
         try:
             prompt = self.create_enhancement_prompt(content)
+            model = self.llm_config['model']
+            temperature = self.llm_config['temperature']
             
-            response = await openai.ChatCompletion.acreate(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a fashion expert and trend analyst. Analyze fashion content and provide structured insights."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
+            # Unchanged articles produce the same prompt, so reuse the stored answer
+            cache_key = self.llm_cache.key_for(prompt, model, temperature)
+            enhancements = self.llm_cache.get(cache_key)
             
-            llm_response = response.choices[0].message.content
-            enhancements = self.parse_llm_response(llm_response)
+            if enhancements is None:
+                # Confident local predictions skip the LLM entirely
+                local = self.prescreen(content)
+                if local is not None:
+                    return {**content, **local}
+                
+                llm_response = await self.request_completion(prompt, self.llm_config['max_tokens'])
+                enhancements = self.parse_llm_response(llm_response)
+                validated = None
+                if enhancements.get('enhanced_by') != 'fallback':
+                    validated = self.validate_enhancement(enhancements)
+                if validated is not None:
+                    enhancements = validated
+                    self.llm_cache.put(cache_key, enhancements)
+                else:
+                    # Fallback values are used this once; the next crawl asks again
+                    self.logger.warning(f"Malformed LLM reply for '{content.get('title', '')[:60]}', not caching")
+                    enhancements = {**enhancements, 'enhanced_by': 'fallback'}
             
-            # Merge LLM enhancements with original content
-            enhanced = {**content, **enhancements}
+            # Merge LLM enhancements with original content (cached before enhanced_by was recorded: LLM)
+            enhanced = {**content, 'enhanced_by': 'llm', **enhancements}
             
             return enhanced
             
@@ -128,6 +192,155 @@ class FashionContentProcessor:
             self.logger.error(f"LLM enhancement failed: {e}")
             return content  # Return original if LLM fails
     
+    def train_local_model(self, rows: List[Dict[str, Any]]) -> bool:
+        """Fit the pre-screen classifier on stored looks (CPU-bound; run in a thread)"""
+        if not self.local_model_config['enabled']:
+            return False
+        return self.local_model.fit(rows)
+    
+    def prescreen(self, content: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Local enhancement when the classifier is confident, None when the LLM should decide"""
+        if not self.local_model_config['enabled']:
+            return None
+        matches = self.keywords.scan_content(content.get('title', ''), content.get('description', ''))
+        return self.local_model.enhance(content, self.keywords.tags(matches))
+    
+    def get_rate_limiter(self) -> LLMRateLimiter:
+        """LLM limiter bound to the running event loop (each scheduled crawl has its own)"""
+        loop = asyncio.get_running_loop()
+        if self.rate_limiter is None or self.rate_limiter_loop is not loop:
+            self.rate_limiter = LLMRateLimiter(
+                self.llm_config['max_in_flight'],
+                self.llm_config['requests_per_minute'],
+                self.llm_config['tokens_per_minute']
+            )
+            self.rate_limiter_loop = loop
+        return self.rate_limiter
+    
+    async def request_completion(self, prompt: str, max_tokens: int) -> str:
+        """Send one chat-completion request within the rate budgets and return the reply text"""
+        limiter = self.get_rate_limiter()
+        
+        async def call():
+            async with limiter.slot(estimate_tokens(SYSTEM_PROMPT + prompt, max_tokens)):
+                return await self.llm_client.acreate(
+                    model=self.llm_config['model'],
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=self.llm_config['temperature']
+                )
+        
+        # Back off with jitter on 429 / 5xx, outside the in-flight slot
+        response = await with_backoff(
+            call,
+            self.ethical_rules['retry_attempts'],
+            self.ethical_rules['backoff_factor'],
+            self.logger
+        )
+        return response.choices[0].message.content
+    
+    async def enhance_batch_with_llm(self, contents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enhance many items, packing uncached ones into multi-article requests"""
+        model = self.llm_config['model']
+        temperature = self.llm_config['temperature']
+        batch_size = self.llm_config['batch_size']
+        
+        # Cache keys use the single-article prompt so both modes share results
+        results: List[Optional[Dict[str, Any]]] = [None] * len(contents)
+        cache_keys = []
+        pending = []
+        for i, content in enumerate(contents):
+            cache_key = self.llm_cache.key_for(self.create_enhancement_prompt(content), model, temperature)
+            cache_keys.append(cache_key)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                results[i] = {**content, 'enhanced_by': 'llm', **cached}
+                continue
+            cached = self.prescreen(content)
+            if cached is not None:
+                results[i] = {**content, **cached}
+            else:
+                pending.append(i)
+        
+        # Batches run concurrently; request_completion bounds the calls in flight
+        chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+        enhanced_chunks = await asyncio.gather(*(
+            self.enhance_group([contents[i] for i in indices], [cache_keys[i] for i in indices])
+            for indices in chunks
+        ))
+        for indices, enhanced in zip(chunks, enhanced_chunks):
+            for i, item in zip(indices, enhanced):
+                results[i] = item
+        
+        return results
+    
+    async def enhance_group(self, contents: List[Dict[str, Any]], cache_keys: List[str]) -> List[Dict[str, Any]]:
+        """Enhance one batch; only items that fail are split out and retried"""
+        if len(contents) == 1:
+            return [await self.enhance_with_llm(contents[0])]
+        
+        parsed = {}
+        try:
+            prompt = self.create_batch_enhancement_prompt(contents)
+            llm_response = await self.request_completion(
+                prompt, self.llm_config['max_tokens'] * len(contents)
+            )
+            parsed = self.parse_batch_llm_response(llm_response, len(contents))
+        except Exception as e:
+            self.logger.error(f"Batch LLM enhancement failed for {len(contents)} items: {e}")
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(contents)
+        failed = []
+        for i, content in enumerate(contents):
+            if i in parsed:
+                self.llm_cache.put(cache_keys[i], parsed[i])
+                results[i] = {**content, **parsed[i]}
+            else:
+                failed.append(i)
+        
+        if failed:
+            self.logger.info(f"Retrying {len(failed)} of {len(contents)} batch items")
+            # Halve the failed set so one bad item can't sink the rest again
+            middle = (len(failed) + 1) // 2
+            for part in (failed[:middle], failed[middle:]):
+                if not part:
+                    continue
+                retried = await self.enhance_group([contents[i] for i in part], [cache_keys[i] for i in part])
+                for i, item in zip(part, retried):
+                    results[i] = item
+        
+        return results
+    
+    def create_batch_enhancement_prompt(self, contents: List[Dict[str, Any]]) -> str:
+        """Create one prompt covering several articles"""
+        articles = "\n".join(
+            f"""
+        Article {index}:
+        Title: {content['title']}
+        Description: {content['description'][:500]}...
+        Category: {content['category']}
+        Tags: {', '.join(content['tags'])}
+        """
+            for index, content in enumerate(contents)
+        )
+        return f"""
+        Analyze each of these {len(contents)} fashion articles and provide structured insights:
+        {articles}
+        Please respond with a JSON array containing one object per article, each with:
+        0. "index": The article number given above
+        1. "enhanced_summary": A concise 2-3 sentence summary highlighting key fashion trends
+        2. "trend_keywords": 5-8 specific fashion keywords/trends mentioned
+        3. "style_category": Primary style category (minimalist, bohemian, luxury, streetwear, etc.)
+        4. "season_relevance": Current season relevance (fall2025, spring2025, etc.)
+        5. "target_audience": Who this trend appeals to (gen-z, millennials, luxury-shoppers, etc.)
+        6. "trend_strength": Confidence score 0.0-1.0 for how trending this content is
+        
+        Focus on extracting actionable fashion insights for a Pinterest-style fashion discovery app.
+        """
+    
     def create_enhancement_prompt(self, content: Dict[str, Any]) -> str:
         """Create prompt for LLM enhancement"""
         return f"""
@@ -163,6 +376,42 @@ class FashionContentProcessor:
         except json.JSONDecodeError:
             return self.fallback_parse(response)
     
+    def parse_batch_llm_response(self, response: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """Parse a batch JSON array into {article index: enhancements}, keeping only valid items"""
+        json_match = re.search(r'\[.*\]', response, re.DOTALL)
+        if not json_match:
+            return {}
+        try:
+            items = json.loads(json_match.group())
+        except json.JSONDecodeError:
+            return {}
+        
+        parsed = {}
+        for item in items if isinstance(items, list) else []:
+            enhancements = self.validate_enhancement(item)
+            if enhancements is None:
+                continue
+            index = item.get('index')
+            if isinstance(index, int) and 0 <= index < count and index not in parsed:
+                parsed[index] = enhancements
+        return parsed
+    
+    def validate_enhancement(self, item: Any) -> Optional[Dict[str, Any]]:
+        """Check one LLM result has every field with a usable type"""
+        if not isinstance(item, dict) or any(field not in item for field in ENHANCEMENT_FIELDS):
+            return None
+        try:
+            trend_strength = float(item['trend_strength'])
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(item['trend_keywords'], list) or not 0.0 <= trend_strength <= 1.0:
+            return None
+        
+        enhancements = {field: item[field] for field in ENHANCEMENT_FIELDS}
+        enhancements['trend_strength'] = trend_strength
+        enhancements['enhanced_by'] = 'llm'
+        return enhancements
+    
     def fallback_parse(self, response: str) -> Dict[str, Any]:
         """Fallback parsing if JSON parsing fails"""
         return {
@@ -171,99 +420,14 @@ class FashionContentProcessor:
             'style_category': 'general',
             'season_relevance': 'year_round',
             'target_audience': 'general',
-            'trend_strength': 0.5
+            'trend_strength': 0.5,
+            'enhanced_by': 'fallback'  # placeholder labels: saved, never trained on
         }
     
     def extract_fashion_insights(self, content: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract additional fashion-specific insights"""
-        insights = {
-            'color_palette': self.extract_colors(content),
-            'price_range': self.estimate_price_range(content),
-            'style_complexity': self.assess_style_complexity(content),
-            'versatility_score': self.calculate_versatility(content),
-            'seasonality': self.determine_seasonality(content)
-        }
-        
-        return insights
-    
-    def extract_colors(self, content: Dict[str, Any]) -> List[str]:
-        """Extract color mentions from content"""
-        text = (content.get('title', '') + ' ' + content.get('description', '')).lower()
-        
-        colors = [
-            'black', 'white', 'red', 'blue', 'green', 'yellow', 'purple', 'pink',
-            'orange', 'brown', 'gray', 'grey', 'navy', 'burgundy', 'emerald',
-            'coral', 'mint', 'lavender', 'gold', 'silver', 'rose', 'cream',
-            'beige', 'tan', 'olive', 'maroon', 'teal', 'turquoise'
-        ]
-        
-        found_colors = [color for color in colors if color in text]
-        return found_colors[:5]  # Limit to 5 colors
-    
-    def estimate_price_range(self, content: Dict[str, Any]) -> str:
-        """Estimate price range based on content indicators"""
-        text = (content.get('title', '') + ' ' + content.get('description', '')).lower()
-        
-        luxury_indicators = ['designer', 'couture', 'luxury', 'high-end', 'premium']
-        budget_indicators = ['affordable', 'budget', 'under', 'cheap', 'sale']
-        
-        if any(indicator in text for indicator in luxury_indicators):
-            return 'luxury'
-        elif any(indicator in text for indicator in budget_indicators):
-            return 'budget'
-        else:
-            return 'mid_range'
-    
-    def assess_style_complexity(self, content: Dict[str, Any]) -> str:
-        """Assess how complex the styling is"""
-        text = (content.get('title', '') + ' ' + content.get('description', '')).lower()
-        
-        complex_indicators = ['layering', 'statement', 'bold', 'dramatic', 'avant-garde']
-        simple_indicators = ['minimal', 'clean', 'simple', 'basic', 'effortless']
-        
-        if any(indicator in text for indicator in complex_indicators):
-            return 'complex'
-        elif any(indicator in text for indicator in simple_indicators):
-            return 'simple'
-        else:
-            return 'moderate'
-    
-    def calculate_versatility(self, content: Dict[str, Any]) -> float:
-        """Calculate how versatile the look is (0.0-1.0)"""
-        text = (content.get('title', '') + ' ' + content.get('description', '')).lower()
-        
-        versatile_keywords = ['versatile', 'day-to-night', 'office', 'casual', 'dress-up', 'mix-match']
-        specific_keywords = ['formal', 'evening', 'gala', 'red-carpet', 'wedding']
-        
-        versatile_count = sum(1 for keyword in versatile_keywords if keyword in text)
-        specific_count = sum(1 for keyword in specific_keywords if keyword in text)
-        
-        if versatile_count > specific_count:
-            return min(1.0, 0.7 + (versatile_count * 0.1))
-        else:
-            return max(0.3, 0.7 - (specific_count * 0.1))
-    
-    def determine_seasonality(self, content: Dict[str, Any]) -> str:
-        """Determine seasonal relevance"""
-        text = (content.get('title', '') + ' ' + content.get('description', '')).lower()
-        
-        seasonal_keywords = {
-            'fall': ['fall', 'autumn', 'september', 'october', 'november', 'cozy', 'layers'],
-            'winter': ['winter', 'december', 'january', 'february', 'coat', 'warm'],
-            'spring': ['spring', 'march', 'april', 'may', 'fresh', 'light'],
-            'summer': ['summer', 'june', 'july', 'august', 'beach', 'vacation']
-        }
-        
-        season_scores = {}
-        for season, keywords in seasonal_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            if score > 0:
-                season_scores[season] = score
-        
-        if season_scores:
-            return max(season_scores, key=season_scores.get) + '2025'
-        else:
-            return 'year_round'
+        """Extract additional fashion-specific insights from a single keyword scan"""
+        matches = self.keywords.scan_content(content.get('title', ''), content.get('description', ''))
+        return self.keywords.insights(matches)
     
     def calculate_enhanced_trend_score(self, content: Dict[str, Any], insights: Dict[str, Any]) -> float:
         """Calculate final trend score with LLM insights"""
@@ -0,0 +1,99 @@
+# Perceptual Image Hashing and Hamming-Distance Index
+#
+# dHash compares neighbouring pixels of a small grayscale thumbnail, so the
+# same photo re-encoded, resized or served from another CDN hashes to (nearly)
+# the same 64 bits. HammingIndex answers "any stored hash within r bits?" by
+# multi-index hashing: the hash is cut into r + 1 chunks, and by pigeonhole
+# any match within r bits agrees exactly on at least one chunk, so only the
+# entries sharing a chunk bucket are compared. Hashes are stored as
+# fixed-width hex, hash_size**2 bits long (64 bits, 16 digits at the default 8).
+
+import io
+from typing import Dict, List, Optional, Tuple
+
+HASH_BITS = 64
+
+def dhash(image_bytes: bytes, hash_size: int = 8) -> Optional[int]:
+    """Difference hash of an encoded image (hash_size**2 bits), or None if it can't be decoded"""
+    from PIL import Image  # Pillow is only needed where images are actually hashed
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            pixels = list(
+                image.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS).getdata()
+            )
+    except Exception:
+        return None
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+def hash_bits(hash_size: int) -> int:
+    """Bits in a dHash of a hash_size x hash_size grid"""
+    return hash_size * hash_size
+
+def hash_hex_width(hash_size: int) -> int:
+    """Hex digits needed to store such a hash"""
+    return (hash_bits(hash_size) + 3) // 4
+
+def hash_to_hex(value: int, hash_size: int) -> str:
+    """Fixed-width hex form a hash is stored in"""
+    return f"{value:0{hash_hex_width(hash_size)}x}"
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count('1')
+
+class HammingIndex:
+    """Multi-index hash table for radius queries over `bits`-bit perceptual hashes"""
+
+    def __init__(self, max_distance: int = 4, bits: int = HASH_BITS):
+        self.max_distance = max_distance
+        chunks = max_distance + 1
+        width, extra = divmod(bits, chunks)
+        self.chunks: List[Tuple[int, int]] = []  # (shift, mask)
+        shift = 0
+        for i in range(chunks):
+            chunk_width = width + (1 if i < extra else 0)
+            self.chunks.append((shift, (1 << chunk_width) - 1))
+            shift += chunk_width
+        self.tables: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self.chunks]
+        self.keys: Dict[str, int] = {}
+
+    def add(self, value: int, key: str):
+        """Index a hash under a key (an image id or source URL)"""
+        if key in self.keys:
+            return
+        self.keys[key] = value
+        for table, (shift, mask) in zip(self.tables, self.chunks):
+            table.setdefault((value >> shift) & mask, []).append((value, key))
+
+    def remove(self, key: str):
+        """Drop a key from the index"""
+        value = self.keys.pop(key, None)
+        if value is None:
+            return
+        for table, (shift, mask) in zip(self.tables, self.chunks):
+            bucket = table.get((value >> shift) & mask, [])
+            bucket[:] = [entry for entry in bucket if entry[1] != key]
+
+    def find(self, value: int, exclude: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """Closest indexed (key, distance) within max_distance, ignoring `exclude`"""
+        best = None
+        for table, (shift, mask) in zip(self.tables, self.chunks):
+            for candidate, key in table.get((value >> shift) & mask, ()):
+                if key == exclude:
+                    continue
+                distance = hamming_distance(value, candidate)
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+                    if distance == 0:
+                        return best
+        return best
+
+    def __len__(self) -> int:
+        return len(self.keys)
@@ -0,0 +1,193 @@
+# Multi-Pattern Keyword Engine for Fashion Insights
+#
+# Every keyword group used by the insight extractors, tagging and
+# categorization is compiled into one Aho-Corasick automaton, so a text is
+# scanned once no matter how many keywords the vocabulary holds. Matching
+# keeps substring semantics ('tan' matches 'statement'), the same as the
+# `keyword in text` checks it replaces.
+
+import json
+import logging
+import re
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..config import get_config
+
+SEASON_SEPARATOR_RE = re.compile(r'[\s_\-]+')
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over named keyword groups"""
+
+    def __init__(self, groups: Dict[str, Sequence[str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[tuple]] = [[]]  # (group, vocabulary index) per state
+        self.vocabulary: Dict[str, List[str]] = {}
+
+        for group, keywords in groups.items():
+            self.vocabulary[group] = [keyword.lower() for keyword in keywords]
+            for index, keyword in enumerate(self.vocabulary[group]):
+                if keyword:
+                    self.add(keyword, (group, index))
+
+        self.build_failure_links()
+
+    def add(self, keyword: str, output: tuple):
+        """Insert one keyword into the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        self.outputs[state].append(output)
+
+    def build_failure_links(self):
+        """Breadth-first pass linking each state to its longest proper suffix state"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                # Inherit suffix matches so the scan never walks failure chains for output
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """Keywords found in text per group, in vocabulary order, each at most once"""
+        found: Dict[str, set] = {}
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for group, index in outputs[state]:
+                found.setdefault(group, set()).add(index)
+
+        return {
+            group: [self.vocabulary[group][index] for index in sorted(indexes)]
+            for group, indexes in found.items()
+        }
+
+class FashionKeywordEngine:
+    """Fashion insights, tags and categories computed from a single automaton scan"""
+
+    def __init__(self, vocabulary: Dict[str, Any]):
+        self.vocabulary = vocabulary
+        self.categories: Dict[str, Dict[str, List[str]]] = vocabulary['categories']
+        self.default_category = vocabulary['default_category']
+
+        groups: Dict[str, Sequence[str]] = {
+            'colors': vocabulary['colors'],
+            'tags': vocabulary['tags'],
+        }
+        for name in ('price', 'complexity', 'versatility', 'seasons'):
+            for level, keywords in vocabulary[name].items():
+                groups[f'{name}.{level}'] = keywords
+        for category, rule in self.categories.items():
+            for source in ('url', 'text'):
+                groups[f'category.{source}.{category}'] = rule.get(source, [])
+
+        self.automaton = KeywordAutomaton(groups)
+        # Stored seasons: a configured season with an optional year ('fall2025'), or year_round
+        self.season_re = re.compile(
+            r'(?:%s)(?:\d{4})?' % '|'.join(re.escape(season) for season in vocabulary['seasons'])
+        )
+
+    def scan(self, text: str) -> Dict[str, List[str]]:
+        """All keyword matches in text"""
+        return self.automaton.scan(text or '')
+
+    def scan_content(self, title: str, description: str) -> Dict[str, List[str]]:
+        """All keyword matches in an article's title and description"""
+        return self.scan(f"{title or ''} {description or ''}")
+
+    def insights(self, matches: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Color, price, complexity, versatility and season insights from one scan"""
+        return {
+            'color_palette': matches.get('colors', [])[:5],  # Limit to 5 colors
+            'price_range': self.first_level(matches, 'price', 'mid_range'),
+            'style_complexity': self.first_level(matches, 'complexity', 'moderate'),
+            'versatility_score': self.versatility(matches),
+            'seasonality': self.seasonality(matches)
+        }
+
+    def first_level(self, matches: Dict[str, List[str]], name: str, default: str) -> str:
+        """First configured level of a keyword family with any match"""
+        for level in self.vocabulary[name]:
+            if matches.get(f'{name}.{level}'):
+                return level
+        return default
+
+    def versatility(self, matches: Dict[str, List[str]]) -> float:
+        """How versatile the look is (0.0-1.0)"""
+        versatile_count = len(matches.get('versatility.versatile', []))
+        specific_count = len(matches.get('versatility.specific', []))
+
+        if versatile_count > specific_count:
+            return min(1.0, 0.7 + (versatile_count * 0.1))
+        return max(0.3, 0.7 - (specific_count * 0.1))
+
+    def seasonality(self, matches: Dict[str, List[str]]) -> str:
+        """Season with the most keyword matches, earliest configured season on ties"""
+        season_scores = {
+            season: len(matches[f'seasons.{season}'])
+            for season in self.vocabulary['seasons']
+            if matches.get(f'seasons.{season}')
+        }
+        if season_scores:
+            return max(season_scores, key=season_scores.get) + self.vocabulary['season_suffix']
+        return 'year_round'
+
+    def season_label(self, value: Any) -> Optional[str]:
+        """An LLM season_relevance as a stored season ('Fall 2025' -> 'fall2025'), None if it names no known season"""
+        if not isinstance(value, str):
+            return None
+        label = SEASON_SEPARATOR_RE.sub('', value.lower())
+        if label == 'yearround':
+            return 'year_round'
+        return label if self.season_re.fullmatch(label) else None
+
+    def categorize(self, url: str, matches: Dict[str, List[str]]) -> str:
+        """First category whose URL or text keywords match"""
+        url_matches = self.scan(url)
+        for category in self.categories:
+            if url_matches.get(f'category.url.{category}') or matches.get(f'category.text.{category}'):
+                return category
+        return self.default_category
+
+    def tags(self, matches: Dict[str, List[str]]) -> List[str]:
+        """Implicit tags found in the text"""
+        return matches.get('tags', [])
+
+def load_vocabulary(keyword_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Configured vocabulary, with groups optionally overridden from a JSON file"""
+    vocabulary = {key: value for key, value in keyword_config.items() if key != 'vocabulary_path'}
+    path = keyword_config.get('vocabulary_path')
+    if path:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                vocabulary.update(json.load(f))
+        except (OSError, ValueError) as e:
+            logging.getLogger("keyword_engine").warning(f"Could not load keyword vocabulary {path}: {e}")
+    return vocabulary
+
+_keyword_engine: Optional[FashionKeywordEngine] = None
+
+def get_keyword_engine() -> FashionKeywordEngine:
+    """Process-wide engine built once from KEYWORD_CONFIG"""
+    global _keyword_engine
+    if _keyword_engine is None:
+        _keyword_engine = FashionKeywordEngine(load_vocabulary(get_config().KEYWORD_CONFIG))
+    return _keyword_engine
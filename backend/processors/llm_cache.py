@@ -0,0 +1,100 @@
+# Persistent LRU Cache for LLM Enhancement Results
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+class LLMResultCache:
+    """Content-hash keyed cache of parsed LLM enhancements with LRU eviction and TTL"""
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # oldest access first
+        self.loaded = False
+        self.dirty = False
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+        self.logger = logging.getLogger("llm_cache")
+
+    @staticmethod
+    def key_for(prompt: str, model: str, temperature: float) -> str:
+        """Hash of everything that determines the LLM's answer"""
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load(self):
+        """Read cached results from disk (blocking, once per process)"""
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load LLM cache {self.path}: {e}")
+            return
+
+        # Stored oldest-access first, so insertion order restores the LRU order
+        for key, entry in stored.items():
+            self.entries[key] = entry
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result, refreshing its LRU position"""
+        self.load()
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        if time.time() - entry['stored_at'] > self.ttl:
+            del self.entries[key]
+            self.dirty = True
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.dirty = True
+        self.stats['hits'] += 1
+        return entry['result']
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """Store a result, evicting least recently used entries beyond the size bound"""
+        self.load()
+        self.entries[key] = {'result': result, 'stored_at': time.time()}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats['evicted'] += 1
+        self.dirty = True
+
+    def write(self):
+        """Atomically write the cache to disk (blocking)"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, default=str)
+        os.replace(tmp_path, self.path)
+
+    async def save(self):
+        """Persist the cache if anything changed"""
+        if not self.dirty:
+            return
+        try:
+            await asyncio.to_thread(self.write)
+            self.dirty = False
+        except OSError as e:
+            self.logger.warning(f"Could not save LLM cache {self.path}: {e}")
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
@@ -0,0 +1,61 @@
+# Rate-Limit-Aware Concurrency Control for LLM Requests
+
+import asyncio
+import random
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from ..crawlers.rate_limiter import TokenBucket
+
+RETRYABLE_ERRORS = {
+    'RateLimitError', 'APIConnectionError', 'APITimeoutError',
+    'Timeout', 'ServiceUnavailableError', 'TryAgain'
+}
+
+class LLMRateLimiter:
+    """Bounds in-flight LLM calls and paces them against request/token-per-minute budgets"""
+
+    def __init__(self, max_in_flight: int, requests_per_minute: float, tokens_per_minute: float):
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.requests = TokenBucket(requests_per_minute / 60.0, capacity=requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute / 60.0, capacity=tokens_per_minute)
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int):
+        """Hold an in-flight slot once both minute budgets allow the request"""
+        async with self.semaphore:
+            await self.requests.acquire()
+            await self.tokens.acquire(estimated_tokens)
+            yield
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough prompt + completion token count (about 4 characters per token)"""
+    return len(prompt) // 4 + max_tokens
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status carried by an OpenAI client error, if any"""
+    return getattr(error, 'http_status', None) or getattr(error, 'status_code', None)
+
+def is_retryable(error: Exception) -> bool:
+    """Retry on 429 and 5xx responses and on transient connection errors"""
+    status = error_status(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+async def with_backoff(call, retry_attempts: int, backoff_factor: float,
+                       logger: logging.Logger):
+    """Run an async call, retrying retryable errors with jittered exponential backoff"""
+    for attempt in range(retry_attempts + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt >= retry_attempts or not is_retryable(e):
+                raise
+            delay = backoff_factor ** attempt * random.uniform(0.5, 1.5)
+            logger.warning(
+                f"LLM request failed ({error_status(e) or type(e).__name__}), "
+                f"retrying in {delay:.1f}s ({attempt + 1}/{retry_attempts})"
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,110 @@
+# Near-Duplicate Detection with MinHash and LSH Bands
+#
+# Each cleaned article gets a MinHash signature of its word shingles; the
+# share of equal signature slots estimates the Jaccard similarity of two
+# articles. Signatures are split into bands and every band is hashed into a
+# bucket, so a lookup only compares against the few looks sharing a bucket
+# instead of every stored look.
+
+import hashlib
+import random
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+def shingles(text: str, size: int = 2) -> set:
+    """Overlapping word n-grams (the whole text when shorter than one shingle)"""
+    words = WORD_RE.findall((text or '').lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+class MinHasher:
+    """MinHash signatures from a fixed family of universal hash permutations"""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 2, seed: int = 1):
+        self.shingle_size = shingle_size
+        # Seeded so signatures stored with looks stay comparable across runs
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Optional[List[int]]:
+        """MinHash signature of a text, or None when it has no words"""
+        features = shingles(text, self.shingle_size)
+        if not features:
+            return None
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+            for feature in features
+        ]
+        return [
+            min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in hashes)
+            for a, b in self.permutations
+        ]
+
+def estimated_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a) if a else 0.0
+
+class NearDuplicateIndex:
+    """LSH band index over MinHash signatures of stored looks"""
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = num_perm // bands
+        self.buckets: List[Dict[Tuple[int, ...], List[Tuple[List[int], str]]]] = [{} for _ in range(bands)]
+        self.signatures: Dict[str, Sequence[int]] = {}  # source_url -> signature, for remove()
+        self.stats = {'checked': 0, 'candidates': 0, 'duplicates': 0}
+
+    def band_keys(self, signature: Sequence[int]) -> List[Tuple[int, ...]]:
+        return [
+            tuple(signature[start:start + self.rows])
+            for start in range(0, self.num_perm, self.rows)
+        ]
+
+    def add(self, signature: Sequence[int], source_url: str):
+        """Index a look's signature"""
+        if len(signature) != self.num_perm or source_url in self.signatures:
+            return  # stored with a different configuration (not comparable), or already indexed
+        self.signatures[source_url] = signature
+        for buckets, key in zip(self.buckets, self.band_keys(signature)):
+            buckets.setdefault(key, []).append((signature, source_url))
+
+    def remove(self, source_url: str):
+        """Drop a look's signature from the index"""
+        signature = self.signatures.pop(source_url, None)
+        if signature is None:
+            return
+        for buckets, key in zip(self.buckets, self.band_keys(signature)):
+            bucket = buckets.get(key, [])
+            bucket[:] = [entry for entry in bucket if entry[1] != source_url]
+            if not bucket:
+                buckets.pop(key, None)
+
+    def find(self, signature: Sequence[int], source_url: Optional[str] = None) -> Optional[str]:
+        """Source URL of an indexed near-duplicate from another URL, if any"""
+        self.stats['checked'] += 1
+        checked = set()
+        for buckets, key in zip(self.buckets, self.band_keys(signature)):
+            for candidate, candidate_url in buckets.get(key, ()):
+                if candidate_url == source_url or candidate_url in checked:
+                    continue
+                checked.add(candidate_url)
+                self.stats['candidates'] += 1
+                if estimated_similarity(signature, candidate) >= self.threshold:
+                    self.stats['duplicates'] += 1
+                    return candidate_url
+        return None
+
+    def __len__(self) -> int:
+        return len(self.signatures)
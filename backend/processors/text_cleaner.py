@@ -0,0 +1,47 @@
+# Boilerplate Text Cleaner
+#
+# Removes magazine boilerplate (ads, credits, newsletter prompts) from titles
+# and descriptions. The patterns are compiled once per process and applied in
+# the order the original per-call re.sub loop used, so the output is
+# unchanged; clean_many cleans a whole crawl batch with one scan per pattern.
+
+import re
+from typing import List, Optional
+
+# '.' is replaced by [^\x00\n]: like '.', a match stays on one line, and
+# clean_many's record separator bounds every match to one text
+BOILERPLATE_PATTERNS = (
+    r'\bAdvertisement\b',
+    r'\bSponsor[^\x00\n]*?\b',
+    r'\bRead More\b',
+    r'\bSubscribe\b',
+    r'\bSign Up\b',
+    r'Photo:[^\x00\n]*?Getty Images',
+    r'Image:[^\x00\n]*?Courtesy',
+)
+BOILERPLATE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in BOILERPLATE_PATTERNS)
+WHITESPACE_RE = re.compile(r'\s+')
+RECORD_SEPARATOR = '\x00'
+
+def clean_text(text: Optional[str]) -> str:
+    """Strip boilerplate and normalize whitespace"""
+    if not text:
+        return ""
+
+    cleaned = text
+    for pattern in BOILERPLATE_RES:
+        cleaned = pattern.sub('', cleaned)
+    return WHITESPACE_RE.sub(' ', cleaned).strip()
+
+def clean_many(texts: List[Optional[str]]) -> List[str]:
+    """Clean a whole batch of texts with one scan per pattern over the joined batch"""
+    if not texts:
+        return []
+
+    joined = RECORD_SEPARATOR.join(
+        (text or '').replace(RECORD_SEPARATOR, '') for text in texts
+    )
+    for pattern in BOILERPLATE_RES:
+        joined = pattern.sub('', joined)
+    cleaned = WHITESPACE_RE.sub(' ', joined)
+    return [text.strip() for text in cleaned.split(RECORD_SEPARATOR)]
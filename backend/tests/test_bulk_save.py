@@ -0,0 +1,60 @@
+# Bulk Save Tests
+#
+# The COPY path must give new rows the same defaults as the VALUES path,
+# which SQLAlchemy fills from the model's column defaults, and a row the
+# database rejects must not take the rest of its batch down with it.
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+
+from backend.database.db_manager import COPY_COLUMN_DEFAULTS, db_manager
+from backend.models.trend_model import TrendingLook
+
+def test_copy_defaults_cover_model_defaults():
+    defaulted = {
+        column.name for column in TrendingLook.__table__.columns
+        if column.default is not None and not column.primary_key
+    }
+    assert set(COPY_COLUMN_DEFAULTS) == defaulted
+
+class Savepoints:
+    """Session stand-in: begin_nested() is a savepoint that lets errors through"""
+
+    def __init__(self):
+        self.savepoints = 0
+
+    def begin_nested(self):
+        session = self
+
+        class Savepoint:
+            async def __aenter__(self):
+                session.savepoints += 1
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        return Savepoint()
+
+def test_failed_rows_are_isolated(monkeypatch):
+    async def values_upsert(session, columns, rows):
+        if any(row['source_url'].endswith('bad') for row in rows):
+            raise ValueError("value too long for type character varying(200)")
+        return [(index, True, row['source_url']) for index, row in enumerate(rows)]
+
+    monkeypatch.setattr(db_manager, 'values_upsert', values_upsert)
+    rows = [{'source_url': f"https://example.com/{name}"} for name in ['a', 'bad', 'b', 'c', 'd', 'also-bad', 'e']]
+    session = Savepoints()
+
+    returned = asyncio.run(db_manager.upsert_rows(session, ['source_url'], rows, use_copy=False))
+    assert [source_url.rsplit('/', 1)[1] for _, _, source_url in returned] == ['a', 'b', 'c', 'd', 'e']
+    assert session.savepoints < 2 * len(rows)
+
+def test_label_source_is_saved_from_enhanced_by():
+    row = db_manager.look_row({
+        'source_url': 'https://example.com/a', 'style_category': 'minimalist',
+        'enhanced_by': 'local', 'fashion_insights': {}
+    })
+    assert row == {'source_url': 'https://example.com/a', 'style_category': 'minimalist', 'label_source': 'local'}
@@ -0,0 +1,41 @@
+# Text Cleaner Equivalence Tests
+#
+# clean_text and clean_many must give exactly what the original per-call
+# re.sub loop gave; in particular no boilerplate match may run past the end
+# of a line and swallow the paragraphs between a credit and its agency.
+
+import pytest
+
+from backend.benchmark_cleaning import reference_clean_text
+from backend.processors.text_cleaner import clean_many, clean_text
+
+CORPUS = [
+    "",
+    "The Oversized Blazer Is Back Advertisement",
+    "Read More: 10 ways to wear a trench coat. Subscribe to our newsletter! Sign up today.",
+    "Photo: Jane Doe/Getty Images The runway was full of cobalt tailoring.",
+    "Photo: Jane Doe\nCobalt tailoring dominated the Milan runways this season.\nMore from the Getty Images archive.",
+    "Image: Courtesy of the brand\nSatin slip dresses returned in force.",
+    "Image: press office\nKnitwear in every shade of camel.\nAll looks courtesy of the designers.",
+    "Sponsored\nThis season's sneakers are chunkier than ever.",
+    "Sponsor content\n\nLoafers, loafers, loafers.\nPhoto: Getty Images",
+    "Subscribe\tSIGN UP   advertisement\n\n  Tweed is the fabric of the season.  ",
+    "A sponsorship deal put the brand on every billboard.\nREAD MORE",
+]
+
+@pytest.mark.parametrize('text', CORPUS)
+def test_clean_text_matches_original(text):
+    assert clean_text(text) == reference_clean_text(text)
+
+def test_clean_many_matches_original():
+    assert clean_many(CORPUS) == [reference_clean_text(text) for text in CORPUS]
+
+def test_matches_stay_on_one_line():
+    text = "Photo: Jane Doe\nCobalt tailoring dominated the runways.\nMore from the Getty Images archive."
+    assert 'Cobalt tailoring dominated the runways.' in clean_text(text)
+    assert clean_many([text, "Sponsored\nSneakers are chunkier than ever."])[1] == 'Sneakers are chunkier than ever.'
+
+def test_clean_many_keeps_texts_separate():
+    assert clean_many(["Photo: Jane Doe", "for Getty Images", None]) == [
+        "Photo: Jane Doe", "for Getty Images", ""
+    ]
@@ -0,0 +1,131 @@
+# Crawl Benchmark Replay Tests
+#
+# Replays the small recorded archive in fixtures/replay/ (each site's trends
+# listing and the articles it links to, one of them syndicated to two sites)
+# through the crawlers' real HTTP path: archive server, session, HTTP cache,
+# listing walk, parsing. Timed with pytest-benchmark's `benchmark` fixture
+# when it is installed.
+#
+# The full python -m backend.benchmark_crawl run (dedup, LLM stage, saves)
+# also needs a database; it runs only against a scratch one named by
+# BENCHMARK_DB_NAME (on the DB_* server) and is skipped otherwise.
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('aiohttp')
+
+from backend.benchmark_extraction import SITE_CRAWLERS, site_crawler
+from backend.crawlers.frontier import CrawlFrontier
+from backend.crawlers.http_cache import HttpCache
+from backend.crawlers.replay import ArchiveServer, CrawlReplay, ResponseArchive
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'replay')
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STREET_STYLE = "Milan Fashion Week Street Style: The Best Looks"
+
+# Articles recorded per site: the first crawl_depth links of the trends listing
+# ('/fashion/' itself, linked from the navigation, was never recorded)
+RECORDED_ARTICLES = {
+    'harpers_bazaar': {
+        'https://www.harpersbazaar.com/fashion/trends/a65200001/quiet-luxury-fall-2025/':
+            "Quiet Luxury, Fall 2025 Edition",
+        'https://www.harpersbazaar.com/fashion/street-style/a65200002/milan-fashion-week-street-style/':
+            STREET_STYLE,
+    },
+    'elle': {
+        'https://www.elle.com/fashion/trends/a65012345/fall-2025-trend-report/':
+            "The Fall 2025 Trend Report",
+        'https://www.elle.com/fashion/street-style/a65023456/copenhagen-fashion-week-street-style/':
+            STREET_STYLE,
+    },
+    'vogue': {
+        'https://www.vogue.com/article/designer-interview-cobalt-tailoring':
+            "Cobalt Tailoring, Explained by the Designer",
+        'https://www.vogue.com/fashion/trends/burgundy-everything': "Burgundy Everything",
+    },
+}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def replaying_crawler(site: str, server_url: str, scratch_dir: str):
+    """The site's crawler reading from the archive server, with cold caches in scratch_dir"""
+    crawler = site_crawler(site)
+    if crawler is None:
+        return None
+    crawler.replay = CrawlReplay('replay', ResponseArchive(ARCHIVE_DIR), server_url)
+    crawler.http_cache = HttpCache(os.path.join(scratch_dir, 'http', site), crawler.http_cache.ttl)
+    crawler.frontier = CrawlFrontier(os.path.join(scratch_dir, 'frontier', f'{site}.json'), mode='all')
+    return crawler
+
+async def replay_trends(sites, scratch_dir: str):
+    """Crawl every site's trends section from the archive, concurrently like crawl_all_sites"""
+    port = free_port()
+    server = ArchiveServer(ResponseArchive(ARCHIVE_DIR), '127.0.0.1', port)
+    await server.start()
+    try:
+        async def crawl(site):
+            crawler = replaying_crawler(site, f"http://127.0.0.1:{port}", scratch_dir)
+            async with crawler:
+                return await crawler.crawl_section(crawler.site_config['trends_path'])
+
+        crawled = await asyncio.gather(*(crawl(site) for site in sites))
+    finally:
+        await server.stop()
+    return dict(zip(sites, crawled)), server.stats
+
+@pytest.fixture
+def timed(request):
+    """Runs a callable under pytest-benchmark when installed, else once"""
+    try:
+        benchmark = request.getfixturevalue('benchmark')
+    except pytest.FixtureLookupError:
+        return lambda run: run()
+    return lambda run: benchmark.pedantic(run, rounds=5, iterations=1)
+
+def test_replayed_crawl_parses_recorded_articles(timed, tmp_path):
+    sites = [site for site in SITE_CRAWLERS if site_crawler(site) is not None]
+    rounds = iter(range(1000))
+
+    def run():
+        # Fresh caches per round, so every round fetches and parses the same pages
+        return asyncio.run(replay_trends(sites, str(tmp_path / str(next(rounds)))))
+
+    crawled, stats = timed(run)
+
+    for site in sites:
+        titles = {content.source_url: content.title for content in crawled[site]}
+        assert titles == RECORDED_ARTICLES[site], site
+        assert all(content.primary_image_url.startswith('https://') for content in crawled[site])
+    assert stats['http'] == sum(1 + len(RECORDED_ARTICLES[site]) for site in sites)
+
+def test_replay_benchmark_against_scratch_db(tmp_path):
+    scratch_db = os.getenv('BENCHMARK_DB_NAME')
+    if not scratch_db:
+        pytest.skip("set BENCHMARK_DB_NAME to a scratch database to replay the full crawl into it")
+
+    output = tmp_path / 'report.json'
+    env = {**os.environ, 'CRAWLER_REPLAY_PORT': str(free_port())}
+    result = subprocess.run(
+        [sys.executable, '-m', 'backend.benchmark_crawl', '--scratch-db', scratch_db,
+         '--archive-dir', ARCHIVE_DIR, '--output', str(output)],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=600
+    )
+    assert result.returncode == 0, result.stderr[-4000:]
+
+    report = json.loads(output.read_text())
+    assert report['errors'] == []
+    assert report['archive_server']['http'] == sum(1 + len(articles) for articles in RECORDED_ARTICLES.values())
+    # The street style story is recorded on two sites: one copy is saved, the other is its near-duplicate
+    assert report['near_duplicates'] == 1
+    assert report['looks_found'] == sum(len(articles) for articles in RECORDED_ARTICLES.values()) - 1
@@ -0,0 +1,74 @@
+# Duplicate Claims Tests
+#
+# Copies syndicated to several sites in one crawl must find each other before
+# any of them is saved, and a claim given up (dropped look, failed save) must
+# stop matching so its copies get their chance.
+
+from backend.crawlers.duplicate_claims import DuplicateClaims
+from backend.processors.image_hash import HammingIndex
+from backend.processors.near_duplicates import MinHasher, NearDuplicateIndex
+
+ARTICLE = (
+    "Quiet luxury returns for autumn with camel coats, cashmere knits and "
+    "tailored trousers seen across the Milan runways this week"
+)
+
+def claims():
+    return DuplicateClaims(NearDuplicateIndex(threshold=0.6, num_perm=64, bands=16))
+
+def test_claimed_look_matches_copy_from_another_site():
+    hasher = MinHasher(num_perm=64)
+    pending = claims()
+    pending.claim_signature(hasher.signature(ARTICLE), 'https://vogue.com/a', owner='vogue')
+
+    copy = hasher.signature(ARTICLE + " from Elle")
+    assert pending.find_signature(copy, 'https://elle.com/a') == 'https://vogue.com/a'
+    assert pending.find_signature(hasher.signature(ARTICLE), 'https://vogue.com/a') is None
+
+def test_settle_returns_waiting_copies_and_releases_claim():
+    hasher = MinHasher(num_perm=64)
+    signature = hasher.signature(ARTICLE)
+    pending = claims()
+    pending.claim_signature(signature, 'https://vogue.com/a', owner='vogue')
+    pending.wait('https://vogue.com/a', 'elle copy')
+    pending.wait('https://vogue.com/a', 'harpers copy')
+
+    assert pending.claimed_by('vogue') == ['https://vogue.com/a']
+    assert pending.settle('https://vogue.com/a') == ['elle copy', 'harpers copy']
+    assert pending.find_signature(signature, 'https://elle.com/a') is None
+    assert pending.claimed_by('vogue') == []
+    assert len(pending) == 0 and len(pending.signatures) == 0
+
+def test_claimed_image_matches_recompressed_copy():
+    pending = DuplicateClaims(images=HammingIndex(max_distance=4, bits=64))
+    photo = 0x0f0f_3c3c_f0f0_aaaa
+    pending.claim_image(photo, 'https://vogue.com/a', owner='vogue')
+
+    assert pending.find_image(photo ^ 0b101, 'https://elle.com/a') == ('https://vogue.com/a', 2)
+    assert pending.find_image(photo, 'https://vogue.com/a') is None
+    assert pending.claimed_by('vogue') == ['https://vogue.com/a']
+
+    pending.settle('https://vogue.com/a')
+    assert pending.find_image(photo, 'https://elle.com/a') is None
+    assert pending.claimed_by('vogue') == []
+
+def test_no_claims_without_index():
+    pending = DuplicateClaims()
+    pending.claim_signature([1] * 64, 'https://vogue.com/a', owner='vogue')
+    pending.claim_image(1, 'https://vogue.com/a', owner='vogue')
+    assert pending.find_signature([1] * 64, 'https://elle.com/a') is None
+    assert pending.find_image(1, 'https://elle.com/a') is None
+    assert len(pending) == 0
+
+def test_index_remove_leaves_other_looks():
+    hasher = MinHasher(num_perm=64)
+    index = NearDuplicateIndex(threshold=0.6, num_perm=64, bands=16)
+    index.add(hasher.signature(ARTICLE), 'https://vogue.com/a')
+    index.add(hasher.signature(ARTICLE + " again"), 'https://vogue.com/b')
+
+    index.remove('https://vogue.com/a')
+    assert len(index) == 1
+    assert index.find(hasher.signature(ARTICLE), 'https://elle.com/a') == 'https://vogue.com/b'
+    index.remove('https://vogue.com/b')
+    assert index.find(hasher.signature(ARTICLE), 'https://elle.com/a') is None
+    assert not any(index.buckets)
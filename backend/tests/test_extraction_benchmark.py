@@ -0,0 +1,32 @@
+# Extraction Benchmark Tests
+#
+# On each site's saved listing and article pages (fixtures/<site>/), the
+# single-pass SelectorEngine must find exactly the URLs the old per-selector
+# soup.select loops found, each once, and both paths are timed.
+
+import pytest
+
+pytest.importorskip('bs4')
+pytest.importorskip('aiohttp')
+
+from backend.benchmark_extraction import FIXTURES_DIR, SITE_CRAWLERS, extraction_paths, site_crawler, time_runs
+
+@pytest.fixture(params=list(SITE_CRAWLERS))
+def crawler(request):
+    crawler = site_crawler(request.param)
+    if crawler is None:
+        pytest.skip(f"{request.param} crawler dependencies not installed")
+    return crawler
+
+@pytest.mark.parametrize('kind', ['links', 'images'])
+def test_engine_matches_reference_loops(crawler, kind):
+    paths = extraction_paths(crawler, FIXTURES_DIR)[kind]
+    reference, engine = paths['reference'](), paths['engine']()
+
+    assert engine, f"{crawler.site_name} {kind} fixture matched nothing"
+    assert len(engine) == len(set(engine))
+    assert sorted(engine) == sorted(reference)
+
+    timings = {path: time_runs(run, repeats=20) for path, run in paths.items()}
+    print(f"{crawler.site_name} {kind}: {timings}")
+    assert all(timing['min_ms'] > 0 for timing in timings.values())
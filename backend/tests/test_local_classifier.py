@@ -0,0 +1,96 @@
+# Local Classifier Tests
+#
+# The pre-screen model must learn the labels the LLM gave: style category,
+# season and trend_strength (not the composite trend_score, which also
+# carries engagement and recency and decays over time). LocalChatCompletion
+# must answer the processor's prompts the same way on every run.
+
+import asyncio
+import json
+
+from backend.processors.local_classifier import LocalChatCompletion, LocalTrendClassifier
+
+STYLES = {
+    'minimalist': ('clean tailored monochrome ivory blazer', 0.9),
+    'bohemian': ('flowing fringe paisley maxi suede', 0.2),
+    'streetwear': ('oversized hoodie sneakers cargo graphic', 0.6),
+}
+
+def training_rows(per_style=20):
+    rows = []
+    for style, (words, strength) in STYLES.items():
+        for i in range(per_style):
+            rows.append({
+                'title': f"{words.split()[i % 5].title()} {style}",
+                'description': words,
+                'tags': [style],
+                'style_category': style,
+                'season': 'fall2025',
+                'trend_strength': strength,
+                'trend_score': 1.0 - strength,  # composite score pulling the other way
+            })
+    return rows
+
+def trained_classifier():
+    classifier = LocalTrendClassifier(min_training_rows=10, min_confidence=0.5)
+    assert classifier.fit(training_rows())
+    return classifier
+
+def test_learns_llm_trend_strength_not_trend_score():
+    classifier = trained_classifier()
+    for style, (words, strength) in STYLES.items():
+        prediction, confidence = classifier.predict({
+            'title': f"New {style} story", 'description': words, 'tags': [style]
+        })
+        assert prediction['style_category'] == style
+        assert prediction['season_relevance'] == 'fall2025'
+        assert prediction['trend_strength'] == strength
+        assert confidence >= 0.5
+
+def test_near_copy_without_stored_strength_uses_neighbours():
+    rows = training_rows()
+    rows[0] = {**rows[0], 'trend_strength': None}  # saved before trend_strength was stored
+    classifier = LocalTrendClassifier(min_training_rows=10)
+    classifier.fit(rows)
+
+    prediction, confidence = classifier.predict(rows[0])
+    assert confidence == 1.0
+    assert prediction['style_category'] == 'minimalist'
+    assert prediction['trend_strength'] == STYLES['minimalist'][1]
+
+def test_needs_enough_labelled_rows():
+    classifier = LocalTrendClassifier(min_training_rows=100)
+    assert not classifier.fit(training_rows())
+    assert classifier.predict({'title': 'anything'}) == (None, 0.0)
+
+def prompt(articles):
+    return '\n'.join(
+        f"Article {i}:\nTitle: {title}\nDescription: {description}...\nCategory: street_style\nTags: {', '.join(tags)}\n"
+        for i, (title, description, tags) in enumerate(articles)
+    )
+
+def chat(completion, content):
+    response = asyncio.run(completion.acreate(model='local', messages=[{'role': 'user', 'content': content}]))
+    return json.loads(response.choices[0].message.content)
+
+def test_chat_completion_is_deterministic():
+    articles = [
+        ('Minimalist tailoring', STYLES['minimalist'][0], ['minimalist']),
+        ('Bohemian summer', STYLES['bohemian'][0], ['bohemian', 'festival']),
+    ]
+    completion = LocalChatCompletion(trained_classifier())
+    first = chat(completion, prompt(articles))
+    assert first == chat(LocalChatCompletion(trained_classifier()), prompt(articles))
+
+    assert [item['index'] for item in first] == [0, 1]
+    assert [item['style_category'] for item in first] == ['minimalist', 'bohemian']
+    assert [item['trend_strength'] for item in first] == [STYLES['minimalist'][1], STYLES['bohemian'][1]]
+    assert first[1]['trend_keywords'] == ['bohemian', 'festival']
+    assert len(completion.requests) == 1
+
+def test_chat_completion_without_model_gives_neutral_defaults():
+    single = "Title: Untitled\nDescription: nothing to see...\nCategory: street_style\nTags: \n"
+    answer = chat(LocalChatCompletion(), single)
+    assert answer['style_category'] == 'general'
+    assert answer['season_relevance'] == 'year_round'
+    assert answer['trend_strength'] == 0.5
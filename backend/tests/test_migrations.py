@@ -0,0 +1,35 @@
+# Migration File Tests
+#
+# Every migration must split into whole SQL statements: a ';' inside a
+# comment or a $$-quoted function body must not cut one in two.
+
+import glob
+import os
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+
+from backend.database.db_manager import MIGRATIONS_DIR, migration_statements
+
+STATEMENT_STARTS = ('ALTER', 'CREATE', 'DO', 'DROP', 'UPDATE')
+
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(MIGRATIONS_DIR, '*.sql'))))
+def test_migrations_split_into_whole_statements(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        statements = migration_statements(f.read())
+    assert statements
+    for statement in statements:
+        assert statement.startswith(STATEMENT_STARTS), statement
+        assert statement.count('$$') % 2 == 0, statement
+
+def test_semicolons_in_comments_and_function_bodies():
+    sql = (
+        "-- first; with a semicolon\n"
+        "CREATE INDEX a ON t (x);\n"
+        "CREATE FUNCTION f() RETURNS trigger AS $$\nBEGIN\n  NEW.x := 1;\n  RETURN NEW;\nEND\n$$ LANGUAGE plpgsql;\n"
+    )
+    assert migration_statements(sql) == [
+        "CREATE INDEX a ON t (x)",
+        "CREATE FUNCTION f() RETURNS trigger AS $$\nBEGIN\n  NEW.x := 1;\n  RETURN NEW;\nEND\n$$ LANGUAGE plpgsql",
+    ]
@@ -0,0 +1,80 @@
+# Feed Query Plan Tests
+#
+# Runs python -m backend.check_query_plans against a test database in both
+# TREND_DECAY_CONFIG modes: every feed shape must use the index built for it,
+# and the shapes listed in INDEX_ORDERED must read rows in index order. In
+# 'lazy' mode that excludes the feeds sorted by the decayed score, which are
+# checked to find their rows through the filter indexes instead.
+#
+# Needs TEST_DB_NAME naming a disposable database on the DB_* server (tables
+# and migrations are applied to it); skipped otherwise. The plan-reading
+# helpers are checked without a database.
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+
+from backend.check_query_plans import EXPECTED_INDEXES, INDEX_ORDERED, plan_problems, scanned_tables, sorts_rows
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def explain(node_type, index=None, children=()):
+    node = {'Node Type': node_type, 'Relation Name': 'trending_looks'} if index else {'Node Type': node_type}
+    if index:
+        node['Index Name'] = index
+    if children:
+        node['Plans'] = list(children)
+    return node
+
+def test_plan_helpers():
+    ordered = explain('Limit', children=[explain('Index Scan', 'ix_trending_looks_active_trend_score')])
+    sorted_plan = explain('Limit', children=[
+        explain('Sort', children=[explain('Index Scan', 'ix_trending_looks_active_crawled_at')])
+    ])
+
+    assert scanned_tables(ordered) == ['Index Scan trending_looks using ix_trending_looks_active_trend_score']
+    assert not sorts_rows(ordered) and sorts_rows(sorted_plan)
+    assert plan_problems('latest', scanned_tables(ordered), False) == []
+    assert plan_problems('latest', scanned_tables(sorted_plan), True) == [
+        'ix_trending_looks_active_trend_score not used', 'rows sorted instead of read in index order'
+    ]
+    assert plan_problems('latest', scanned_tables(sorted_plan), True, mode='lazy') == []
+    assert plan_problems('newest', scanned_tables(sorted_plan), True, mode='lazy') == [
+        'rows sorted instead of read in index order'
+    ]
+
+def test_every_shape_has_expectations():
+    assert set(EXPECTED_INDEXES['stored']) == set(EXPECTED_INDEXES['lazy'])
+    for mode in INDEX_ORDERED:
+        assert INDEX_ORDERED[mode] <= set(EXPECTED_INDEXES[mode])
+    assert INDEX_ORDERED['lazy'] < INDEX_ORDERED['stored']
+
+@pytest.fixture(scope='module')
+def test_db():
+    name = os.getenv('TEST_DB_NAME')
+    if not name:
+        pytest.skip("set TEST_DB_NAME to a disposable database on the DB_* server to check query plans")
+    pytest.importorskip('asyncpg')
+    return name
+
+@pytest.mark.parametrize('mode', ['stored', 'lazy'])
+def test_feed_queries_use_their_indexes(test_db, mode):
+    result = subprocess.run(
+        [sys.executable, '-m', 'backend.check_query_plans', '--migrate', '--json'],
+        cwd=REPO_ROOT, env={**os.environ, 'DB_NAME': test_db, 'TREND_DECAY_MODE': mode},
+        capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stderr[-4000:]
+
+    plans = json.loads(result.stdout.strip().splitlines()[-1])
+    assert set(plans) == set(EXPECTED_INDEXES[mode])
+    problems = {
+        name: plan_problems(name, plan['scans'], plan['sorted'], mode)
+        for name, plan in plans.items()
+    }
+    assert {name: found for name, found in problems.items() if found} == {}
@@ -0,0 +1,32 @@
+# Season Label Tests
+#
+# season_relevance comes back from the LLM as free text; only known seasons
+# may reach the String(20) season column, or the look's insert fails.
+
+import pytest
+
+pytest.importorskip('sqlalchemy')
+
+from backend.models.trend_model import TrendingLook
+from backend.processors.keyword_engine import get_keyword_engine
+
+@pytest.mark.parametrize('value, label', [
+    ('fall2025', 'fall2025'),
+    ('Fall 2025', 'fall2025'),
+    ('spring-2026', 'spring2026'),
+    ('summer', 'summer'),
+    ('Year Round', 'year_round'),
+    ('year_round', 'year_round'),
+    ('Transitional pieces for late fall into early winter 2025', None),
+    ('autumn2025x', None),
+    ('', None),
+    (None, None),
+    (['fall2025'], None),
+])
+def test_season_label(value, label):
+    assert get_keyword_engine().season_label(value) == label
+
+def test_season_labels_fit_column():
+    engine = get_keyword_engine()
+    longest = max(len(engine.season_label(f"{season} 2025")) for season in engine.vocabulary['seasons'])
+    assert longest <= TrendingLook.season.type.length
@@ -10,6 +10,9 @@ import schedule
 import time
 import logging
 
+from backend.config import get_config
+from backend.processors.image_hash import HammingIndex, dhash, hash_bits, hash_hex_width, hash_to_hex
+
 class LooklyyImageManager:
     def __init__(self):
         self.base_dir = Path("public/images")
@@ -24,6 +27,16 @@ class LooklyyImageManager:
         # Load existing metadata
         self.metadata = self.load_metadata()
         
+        # Perceptual-hash index so the same photo under another URL is stored once
+        self.image_config = get_config().IMAGE_DEDUP_CONFIG
+        self.hash_size = self.image_config['hash_size']
+        self.image_index = HammingIndex(self.image_config['max_distance'], hash_bits(self.hash_size))
+        width = hash_hex_width(self.hash_size)
+        for image_id, info in self.metadata["images"].items():
+            # Hashes from another hash_size aren't comparable
+            if info.get("phash") and info.get("status") == "cached" and len(info["phash"]) == width:
+                self.image_index.add(int(info["phash"], 16), image_id)
+        
         # Fashion image sources (reliable, high-quality)
         self.fashion_sources = [
             "https://images.unsplash.com/photo-1515886657613-9f3515b0c78f?w=400&h=600&fit=crop&q=80",
@@ -62,12 +75,39 @@ class LooklyyImageManager:
         """Generate hash for image URL"""
         return hashlib.md5(url.encode()).hexdigest()
     
+    def perceptual_hash(self, content):
+        """dHash of downloaded image bytes, or None if it can't be computed"""
+        try:
+            return dhash(content, self.hash_size)
+        except ImportError:
+            return None  # Pillow not installed; dedup disabled
+    
     def download_image(self, url, image_id):
         """Download and cache an image"""
         try:
             response = requests.get(url, timeout=10)
             response.raise_for_status()
             
+            # Reuse the cached file if this photo is already stored under another id
+            image_hash = self.perceptual_hash(response.content)
+            if image_hash is not None:
+                match = self.image_index.find(image_hash, exclude=str(image_id))
+                if match:
+                    original_id, distance = match
+                    original = self.metadata["images"][original_id]
+                    if (self.cache_dir / original["filename"]).exists():
+                        self.metadata["images"][str(image_id)] = {
+                            "filename": original["filename"],
+                            "url": url,
+                            "downloaded_at": datetime.now().isoformat(),
+                            "size": 0,
+                            "status": "duplicate",
+                            "duplicate_of": original_id
+                        }
+                        self.logger.info(f"Image {image_id} duplicates {original_id} ({distance} bits)")
+                        return f"/images/cache/{original['filename']}"
+                    self.image_index.remove(original_id)
+            
             # Generate filename
             file_extension = url.split('.')[-1].split('?')[0]
             if file_extension not in ['jpg', 'jpeg', 'png', 'webp']:
@@ -86,8 +126,12 @@ class LooklyyImageManager:
                 "url": url,
                 "downloaded_at": datetime.now().isoformat(),
                 "size": len(response.content),
-                "status": "cached"
+                "status": "cached",
+                "phash": hash_to_hex(image_hash, self.hash_size) if image_hash is not None else None
             }
+            if image_hash is not None:
+                self.image_index.remove(str(image_id))
+                self.image_index.add(image_hash, str(image_id))
             
             self.logger.info(f"Downloaded image {image_id}: {filename}")
             return f"/images/cache/{filename}"
@@ -148,11 +192,15 @@ class LooklyyImageManager:
                 to_remove.append(image_id)
         
         for image_id in to_remove:
-            info = self.metadata["images"][image_id]
+            info = self.metadata["images"].pop(image_id)
+            self.image_index.remove(image_id)
+            
+            # Duplicates share a file; keep it while any remaining entry points at it
+            if any(other["filename"] == info["filename"] for other in self.metadata["images"].values()):
+                continue
             filepath = self.cache_dir / info["filename"]
             if filepath.exists():
                 filepath.unlink()
-            del self.metadata["images"][image_id]
         
         self.save_metadata()
         self.logger.info(f"Cleaned up {len(to_remove)} old images")
@@ -164,6 +212,9 @@ class LooklyyImageManager:
         
         return {
             "total_images": total_images,
+            "duplicate_images": sum(
+                1 for info in self.metadata["images"].values() if info.get("status") == "duplicate"
+            ),
             "total_size_mb": round(total_size / (1024 * 1024), 2),
             "last_update": self.metadata.get("last_update"),
             "cache_dir": str(self.cache_dir)